@@ -0,0 +1,79 @@
+"""Prebuilt Agent Templates Shared Across Runs"""
+
+from crewai import Agent
+import re
+import threading
+import time
+
+from agents.ad_visual_analyst import create_ad_visual_analyst
+from agents.copywriting_expert import create_copywriting_expert
+from agents.brand_consistency_agent import create_brand_consistency_agent
+from agents.quality_rating_synthesizer import create_quality_rating_synthesizer
+from utils.metrics import metrics
+
+
+AGENT_FACTORIES = {
+    "ad_visual_analyst": create_ad_visual_analyst,
+    "copywriting_expert": create_copywriting_expert,
+    "brand_consistency_agent": create_brand_consistency_agent,
+    "quality_rating_synthesizer": create_quality_rating_synthesizer,
+}
+
+# Backstory parts that only make sense inside the crew (tool usage, per-agent task)
+CREW_ONLY_SECTIONS = re.compile(
+    r"TOOL VERWENDUNG:.*?(?=\n\s*\n)|=== YOUR TASK ===.*?(?=\n\s*===|\Z)",
+    re.DOTALL,
+)
+
+_templates: dict[str, Agent] = {}
+_templates_lock = threading.Lock()
+
+
+def _get_template(name: str) -> Agent:
+    with _templates_lock:
+        if name not in _templates:
+            _templates[name] = AGENT_FACTORIES[name]()
+        return _templates[name]
+
+
+def warm_up_agents():
+    """Build all agent templates (and the shared LLM client) ahead of the first run"""
+    started = time.time()
+    for name in AGENT_FACTORIES:
+        _get_template(name)
+    metrics.observe("agents.warm_up_seconds", time.time() - started)
+
+
+def get_agent(name: str) -> Agent:
+    """
+    Fresh per-run copy of a prebuilt agent
+
+    Agent.copy() reuses the template's LLM client and tools but creates a new
+    agent without executor, cache or callback state, so concurrent runs never
+    share mutable agent state.
+    """
+    return _get_template(name).copy()
+
+
+def combined_rubric(names: list[str]) -> str:
+    """
+    Merge the expertise of several agents into one rubric
+
+    Used by fast mode, where a single Gemini call replaces the agents. Role,
+    goal and backstory are taken from the agent templates, without the
+    crew-specific tool and task instructions.
+
+    Args:
+        names: Agent names from AGENT_FACTORIES, in rubric order
+
+    Returns:
+        Rubric text with one section per agent
+    """
+    sections = []
+    for name in names:
+        agent = _get_template(name)
+        backstory = CREW_ONLY_SECTIONS.sub("", agent.backstory)
+        backstory = re.sub(r"\n[ \t]+", "\n", backstory)
+        backstory = re.sub(r"\n{3,}", "\n\n", backstory).strip()
+        sections.append(f"### {agent.role}\nGoal: {agent.goal}\n\n{backstory}")
+    return "\n\n".join(sections)
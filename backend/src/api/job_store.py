@@ -0,0 +1,130 @@
+"""SQLite-backed Store for Asynchronous Analysis Jobs"""
+
+from datetime import datetime
+from typing import Any, Optional
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobStore:
+    """
+    Persistent job registry
+
+    One shared connection guarded by a lock; SQLite's WAL mode keeps
+    readers (status polling) from blocking the writer (progress events).
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def create(self, params: dict) -> str:
+        """Register a new queued job and return its id"""
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), now, now),
+            )
+        return job_id
+
+    def set_status(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        """Update status (and result or error once finished)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = COALESCE(?, result), "
+                "error = COALESCE(?, error), updated_at = ? WHERE id = ?",
+                (status, result, error, datetime.now().isoformat(), job_id),
+            )
+
+    def add_event(self, job_id: str, event_type: str, data: Any = None):
+        """Append a progress event"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO job_events (job_id, seq, type, data, created_at) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ? FROM job_events WHERE job_id = ?",
+                (job_id, event_type, json.dumps(data), datetime.now().isoformat(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the job row as dict, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def events(self, job_id: str, after: int = 0, limit: int = 500) -> list[dict]:
+        """Progress events with seq > after"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, type, data, created_at FROM job_events "
+                "WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, after, limit),
+            ).fetchall()
+        return [{**dict(row), "data": json.loads(row["data"])} for row in rows]
+
+    def delete(self, job_id: str):
+        """Remove a job and its events (for jobs whose id was never handed out)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def fail_unfinished(self, reason: str) -> int:
+        """Mark jobs that were queued/running when the process stopped as failed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+                (FAILED, reason, datetime.now().isoformat(), QUEUED, RUNNING),
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -7,13 +7,13 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 from typing import Optional, AsyncGenerator
 from datetime import datetime
 import sys
 import os
 import json
 import asyncio
-import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from project root .env file
@@ -25,15 +25,80 @@ load_dotenv(env_path)
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from api.job_store import JobStore, QUEUED, RUNNING, SUCCEEDED, FAILED
+from api.single_flight import InFlightRun, SingleFlight, analysis_key
+from api.upload_limit import UploadSizeLimitMiddleware
+from agents.registry import warm_up_agents
 from crew.crew import AdQualityRaterCrew
+from crew.fast_mode import FastAdQualityRater
+from crew.report import AdQualityReport, render_markdown
+from crew.run_pool import QueueFullError, get_crew_pool
+from tools.browser_pool import get_browser_pool
+from utils.artifacts import ArtifactStoreFullError, get_artifact_store
+from utils.events import EventChannel, bind_events, emit
 from utils.logger import logger
+from utils.memory import MemoryProbe
+from utils.metrics import metrics
+from utils.rate_limiter import get_rate_limiter
+
+
+# Events buffered per run before the oldest are dropped
+RUN_EVENT_BUFFER = int(os.getenv("RUN_EVENT_BUFFER", "1000"))
+
+# SSE delivery: idle keep-alive interval and log coalescing window (seconds)
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+SSE_BATCH_WINDOW = float(os.getenv("SSE_BATCH_WINDOW", "0.05"))
+
+# Asynchronous jobs: persisted in SQLite (opened on startup, see lifespan),
+# executed on the shared crew pool
+job_store: Optional[JobStore] = None
+
+# Identical analyses in flight at the same time share one run
+single_flight = SingleFlight()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared resources on startup and release them on shutdown"""
+    global job_store
+    job_store = JobStore(os.getenv("JOB_STORE_PATH", ".cache/jobs.db"))
+    interrupted = job_store.fail_unfinished("Interrupted by server restart")
+    if interrupted:
+        logger.warning("Marked interrupted jobs as failed", count=interrupted)
+
+    try:
+        await asyncio.to_thread(warm_up_agents)
+        logger.info("Agent templates built")
+    except Exception as e:
+        logger.warning("Agent warm-up skipped", error=str(e))
+
+    pool = get_browser_pool()
+    await asyncio.to_thread(pool.start)
+    logger.info("Browser pool warmed up", size=pool.size)
+    yield
+    await asyncio.to_thread(pool.shutdown)
+    job_store.close()
+
 
 app = FastAPI(
     title="Ads Quality Rater API",
     version="1.0.0",
     description="KI-basierte Bewertung von Ad-LP-Kohärenz und Markenkonformität",
+    lifespan=lifespan,
 )
 
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Request bodies of the upload endpoints are capped while they are received
+# (the multipart parser spools large files to a temporary file, so the limit
+# has to apply before parsing); the file itself is then read in chunks
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_REQUEST_BYTES = MAX_FILE_SIZE + 1024 * 1024
+UPLOAD_PATHS = {"/api/v1/analyze/stream", "/api/v1/jobs"}
+
+# Added before CORS so that CORS is the outer layer and 413s carry its headers
+app.add_middleware(UploadSizeLimitMiddleware, paths=UPLOAD_PATHS, max_bytes=MAX_REQUEST_BYTES)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +109,208 @@ app.add_middleware(
 )
 
 
+# mode form field: full crew or a single Gemini call for quick previews
+ANALYSIS_MODES = {
+    "full": AdQualityRaterCrew,
+    "fast": FastAdQualityRater,
+}
+
+
+def _get_rater_class(mode: str):
+    """Analysis class for the requested mode (400 for unknown modes)"""
+    if mode not in ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"mode must be one of: {', '.join(ANALYSIS_MODES)}",
+        )
+    return ANALYSIS_MODES[mode]
+
+
+# Reports are structured; markdown is only rendered when asked for
+REPORT_FORMATS = ("json", "markdown")
+
+
+def _check_report_format(report_format: str):
+    """400 for unknown report formats"""
+    if report_format not in REPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"report_format must be one of: {', '.join(REPORT_FORMATS)}",
+        )
+
+
+async def _read_upload(ad_file: UploadFile) -> bytes:
+    """
+    Read the parsed upload chunk by chunk, 413 once it exceeds MAX_FILE_SIZE
+
+    The request body itself is already capped by UploadSizeLimitMiddleware;
+    this enforces the limit on the file part alone.
+    """
+    chunks: list[bytes] = []
+    size = 0
+    while chunk := await ad_file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_FILE_SIZE:
+            metrics.incr("uploads.rejected_too_large")
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _prepare_analysis_inputs(
+    landing_page_url: str,
+    ad_file: UploadFile,
+    brand_guidelines: Optional[str],
+) -> tuple[str, Optional[dict]]:
+    """
+    Validate the analysis form inputs and keep the upload in the artifact store
+
+    Returns:
+        Tuple of (artifact handle of the ad image, parsed brand guidelines)
+    """
+    # Validate ad_file is provided
+    if not ad_file:
+        raise HTTPException(status_code=400, detail="ad_file (uploaded image) is required")
+
+    # Validate landing_page_url is accessible
+    if not landing_page_url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="landing_page_url must be a valid HTTP/HTTPS URL")
+
+    # Parse brand guidelines if provided
+    parsed_guidelines = None
+    if brand_guidelines:
+        try:
+            parsed_guidelines = json.loads(brand_guidelines)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="brand_guidelines must be valid JSON")
+
+    # Validate it's actually an image (before reading the body)
+    if not ad_file.content_type or not ad_file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail=f"File must be an image, got {ad_file.content_type}")
+
+    # Validate file size (max 10MB) while reading
+    content = await _read_upload(ad_file)
+    metrics.observe("uploads.bytes", len(content))
+
+    # The run gets a handle to the bytes in memory, never a temp file
+    try:
+        handle = get_artifact_store().put(content, mime_type=ad_file.content_type, filename=ad_file.filename)
+    except ArtifactStoreFullError as e:
+        logger.warning("Artifact store full, rejecting upload", error=str(e))
+        raise HTTPException(
+            status_code=503,
+            detail="Too many uploads in progress, please retry later",
+            headers={"Retry-After": "30"},
+        )
+
+    return handle, parsed_guidelines
+
+
+def _release_artifact(handle: str):
+    """Drop an uploaded ad image once its run is done"""
+    get_artifact_store().release(handle)
+
+
+def _upload_size(handle: str) -> int:
+    try:
+        return len(get_artifact_store().get(handle).data)
+    except KeyError:
+        return 0
+
+
+def _ad_image_label(handle: str) -> str:
+    """File name and size of an uploaded ad image, for progress logs"""
+    try:
+        artifact = get_artifact_store().get(handle)
+    except KeyError:
+        return handle
+    return f"{artifact.filename or 'upload'} ({len(artifact.data) / 1024:.0f} KB, in memory)"
+
+
+def _report_memory(probe: MemoryProbe):
+    """Emit and record the memory readings of a finished run"""
+    usage = probe.finish()
+    emit("memory", usage)
+    if usage["peak_growth_mb"] is not None:
+        metrics.observe("request.peak_growth_mb", usage["peak_growth_mb"])
+    if usage["peak_rss_mb"] is not None:
+        metrics.set_gauge("process.peak_rss_mb", usage["peak_rss_mb"])
+        emit("log", (
+            f"🧠 Memory: upload {usage['upload_bytes'] / 1024:.0f} KB, "
+            f"process peak {usage['peak_rss_mb']:.0f} MB (+{usage['peak_growth_mb']:.1f} MB during this run)"
+        ))
+
+
+def _submit_crew_run(fn, events: EventChannel, artifact_handle: str):
+    """
+    Queue a crew run on the bounded pool, reporting queue positions as events
+
+    Raises:
+        HTTPException: 429 with Retry-After when the queue is full
+    """
+    def on_position(position: int):
+        if position > 0:
+            events.emit("queue", {"position": position})
+            events.emit("log", f"⏳ Waiting for a free slot (queue position {position})")
+
+    try:
+        get_crew_pool().submit(fn, on_position=on_position)
+    except QueueFullError as e:
+        _release_artifact(artifact_handle)
+        logger.warning("Crew queue full, rejecting request", retry_after=e.retry_after)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many analyses in progress, please retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def _sse_frame(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _sse_frames(events: EventChannel) -> AsyncGenerator[str, None]:
+    """
+    Turn a run's event channel into SSE frames until it is closed and drained
+
+    The producing thread wakes this coroutine through call_soon_threadsafe, so
+    an idle stream costs no CPU. Log lines arriving within SSE_BATCH_WINDOW
+    are coalesced into a single 'logs' frame; idle streams only get an SSE
+    comment every SSE_HEARTBEAT_INTERVAL seconds to keep proxies from closing
+    the connection.
+    """
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    wakeup.set()  # pick up anything emitted before we subscribed
+    events.add_notifier(lambda: loop.call_soon_threadsafe(wakeup.set))
+
+    while True:
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=SSE_HEARTBEAT_INTERVAL)
+        except asyncio.TimeoutError:
+            yield ": heartbeat\n\n"
+            continue
+
+        # Let events that arrive close together accumulate into one frame
+        await asyncio.sleep(SSE_BATCH_WINDOW)
+        wakeup.clear()
+
+        logs: list = []
+        for event in events.drain():
+            if event["type"] == "log":
+                logs.append(event["data"])
+                continue
+            if logs:
+                yield _sse_frame({"type": "logs", "data": logs})
+                logs = []
+            yield _sse_frame(event)
+        if logs:
+            yield _sse_frame({"type": "logs", "data": logs})
+
+        if events.exhausted:
+            return
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -51,6 +318,8 @@ async def health_check():
         # Check if Gemini API key is set
         gemini_key = os.getenv("GEMINI_API_KEY")
         gemini_status = "healthy" if gemini_key else "unhealthy"
+        if gemini_key and get_rate_limiter().snapshot()["circuit"] != "closed":
+            gemini_status = "degraded"
 
         overall = "healthy" if gemini_status == "healthy" else "degraded"
 
@@ -66,6 +335,12 @@ async def health_check():
         return {"status": "unhealthy", "error": str(e)}
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """In-process metrics (browser pool, caches, ...) and the Gemini limiter state"""
+    return {**metrics.snapshot(), "gemini_limiter": get_rate_limiter().snapshot()}
+
+
 @app.post("/api/v1/analyze/stream")
 async def analyze_ad_stream(
     landing_page_url: str = Form(...),
@@ -73,202 +348,61 @@ async def analyze_ad_stream(
     brand_guidelines: Optional[str] = Form(None),
     target_audience: Optional[str] = Form(None),
     campaign_goal: Optional[str] = Form(None),
+    ad_text: Optional[str] = Form(None),
+    mode: str = Form("full"),
+    report_format: str = Form("json"),
+    force_refresh: bool = Form(False),
 ):
     """
     Streaming endpoint: Start Ad Quality Analysis with real-time logs
 
     Requires an uploaded ad image file (ad_file) and landing page URL
-    Returns Server-Sent Events with logs and final result
+    Optional ad_text (intro, blank line, headline) enables exact ad copy metrics
+    mode=fast replaces the crew with a single Gemini call (quick preview)
+    force_refresh=true runs the crew even if a cached report exists
+    Returns Server-Sent Events with logs and the final report: a 'report'
+    event with the structured report, or a 'result' event with rendered
+    markdown when report_format=markdown
     """
-    # Validate ad_file is provided
-    if not ad_file:
-        raise HTTPException(status_code=400, detail="ad_file (uploaded image) is required")
-
-    # Validate landing_page_url is accessible
-    if not landing_page_url.startswith(("http://", "https://")):
-        raise HTTPException(status_code=400, detail="landing_page_url must be a valid HTTP/HTTPS URL")
-
-    # Parse brand guidelines if provided
-    parsed_guidelines = None
-    if brand_guidelines:
-        try:
-            parsed_guidelines = json.loads(brand_guidelines)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="brand_guidelines must be valid JSON")
-
-    # Validate file size (max 10MB)
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    content = await ad_file.read()
-
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"File too large. Maximum size is 10MB, got {len(content) / (1024*1024):.1f}MB")
-
-    # Validate it's actually an image
-    if not ad_file.content_type or not ad_file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail=f"File must be an image, got {ad_file.content_type}")
+    _get_rater_class(mode)
+    _check_report_format(report_format)
+    artifact_handle, parsed_guidelines = await _prepare_analysis_inputs(
+        landing_page_url, ad_file, brand_guidelines
+    )
 
-    # Save to temporary file
-    file_extension = os.path.splitext(ad_file.filename or "image.jpg")[1] or ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-        temp_file.write(content)
-        temp_file_path = temp_file.name
+    # Each request streams from its own channel, even when it shares the run
+    events = EventChannel(maxlen=RUN_EVENT_BUFFER)
+    flight = _start_analysis(
+        events,
+        mode,
+        artifact_handle,
+        landing_page_url,
+        parsed_guidelines,
+        target_audience,
+        campaign_goal,
+        ad_text,
+        force_refresh,
+    )
 
     async def event_generator() -> AsyncGenerator[str, None]:
         """Generate SSE events with logs and result"""
-        import threading
-        import queue
-        import sys
-        import time
-
-        log_queue = queue.Queue()
-        result_holder = {"result": None, "error": None}
-        crew_running = threading.Event()
-
-        def run_crew():
-            """Run crew in thread and capture ALL output"""
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-
-            try:
-                # Log start BEFORE redirecting output so it definitely appears
-                log_queue.put({"type": "log", "data": "🚀 Starting analysis..."})
-
-                # Capture console output periodically
-                from io import StringIO
-
-                # Create string buffer for output
-                output_buffer = StringIO()
-
-                # Redirect stdout/stderr
-                sys.stdout = output_buffer
-                sys.stderr = output_buffer
-
-                crew_running.set()
-
-                log_queue.put({"type": "log", "data": f"📁 Ad file: {temp_file_path}"})
-                log_queue.put({"type": "log", "data": f"🌐 Landing page: {landing_page_url}"})
-
-                # Create crew and start analysis
-                log_queue.put({"type": "log", "data": "🏗️ Creating crew..."})
-                crew = AdQualityRaterCrew(
-                    ad_url=temp_file_path,
-                    landing_page_url=landing_page_url,
-                    brand_guidelines=parsed_guidelines,
-                    target_audience=target_audience,
-                    campaign_goal=campaign_goal,
-                )
-                log_queue.put({"type": "log", "data": "✅ Crew created successfully"})
-
-                # Start a thread to periodically flush output
-                last_position = [0]  # Use list to make it mutable in closure
-                stop_flushing = threading.Event()
-
-                def flush_output():
-                    while not stop_flushing.is_set():
-                        try:
-                            output_buffer.seek(last_position[0])
-                            new_content = output_buffer.read()
-                            if new_content:
-                                # Split into lines and send each
-                                for line in new_content.splitlines():
-                                    if line.strip():
-                                        log_queue.put({"type": "log", "data": line})
-                                last_position[0] = output_buffer.tell()
-                            time.sleep(0.1)  # Check every 100ms
-                        except:
-                            pass
-
-                flush_thread = threading.Thread(target=flush_output, daemon=True)
-                flush_thread.start()
-
-                # Run the crew (this blocks) - now returns text
-                log_queue.put({"type": "log", "data": "⚙️ Running crew analysis..."})
-                result_text = crew.kickoff()
-
-                # Debug logging
-                print(f"[DEBUG] Crew returned result type: {type(result_text)}", file=old_stderr)
-                print(f"[DEBUG] Result length: {len(str(result_text))} chars", file=old_stderr)
-                print(f"[DEBUG] First 100 chars: {str(result_text)[:100]}", file=old_stderr)
-
-                log_queue.put({"type": "log", "data": f"✅ Analysis complete! Result length: {len(str(result_text))} chars"})
-                result_holder["result"] = str(result_text)
-
-                # Stop flushing thread and get final output
-                stop_flushing.set()
-                flush_thread.join(timeout=1)
-
-                # Get any remaining output
-                output_buffer.seek(last_position[0])
-                remaining = output_buffer.read()
-                if remaining:
-                    for line in remaining.splitlines():
-                        if line.strip():
-                            log_queue.put({"type": "log", "data": line})
-
-                # Restore stdout/stderr
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-
-            except Exception as e:
-                import traceback
-                error_msg = f"Crew execution error: {str(e)}"
-                error_trace = traceback.format_exc()
-
-                # Restore stdout/stderr first so we can log properly
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-
-                # Log the error with full traceback
-                print(f"[ERROR] {error_msg}", file=sys.stderr)
-                print(f"[TRACEBACK] {error_trace}", file=sys.stderr)
-
-                log_queue.put({"type": "log", "data": f"❌ {error_msg}"})
-                log_queue.put({"type": "log", "data": f"Details: {error_trace[:500]}"})
-                result_holder["error"] = error_msg
-            finally:
-                crew_running.clear()
-                log_queue.put({"type": "log", "data": "🏁 Crew execution finished"})
-                # Don't send "done" here - we'll send it after we've sent the result
-                # log_queue.put({"type": "done"})
-
-        # Start crew in background thread
-        crew_thread = threading.Thread(target=run_crew, daemon=True)
-        crew_thread.start()
-
-        # Stream logs as they come
-        while True:
-            try:
-                event = log_queue.get(timeout=0.1)
-
-                # Send the event
-                yield f"data: {json.dumps(event)}\n\n"
-
-            except queue.Empty:
-                # Check if crew is done
-                if not crew_running.is_set() and not crew_thread.is_alive():
-                    # Crew has finished, send final result
-                    if result_holder["result"]:
-                        result_text = result_holder["result"]
-                        yield f"data: {json.dumps({'type': 'result', 'data': result_text})}\n\n"
-                    elif result_holder["error"]:
-                        yield f"data: {json.dumps({'type': 'error', 'data': result_holder['error']})}\n\n"
-                    else:
-                        yield f"data: {json.dumps({'type': 'error', 'data': 'No result received from crew'})}\n\n"
-                    break
-
-                # Send heartbeat
-                yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
-                await asyncio.sleep(0.1)
-
-        crew_thread.join(timeout=1)
-
-        # Cleanup temp file after streaming is complete
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-                logger.info("Cleaned up temp file", path=temp_file_path)
-            except Exception as e:
-                logger.warning("Failed to cleanup temp file", path=temp_file_path, error=str(e))
+        # Stream events as they arrive (no polling); frames are batched
+        async for frame in _sse_frames(events):
+            yield frame
+        if events.dropped:
+            logger.warning("Run event buffer overflowed", dropped=events.dropped)
+
+        # Crew has finished, send final result
+        if flight.result:
+            report = flight.result
+            if report_format == "markdown":
+                yield _sse_frame({"type": "result", "data": render_markdown(report)})
+            else:
+                yield _sse_frame({"type": "report", "data": report.model_dump(mode="json")})
+        elif flight.error:
+            yield _sse_frame({"type": "error", "data": flight.error})
+        else:
+            yield _sse_frame({"type": "error", "data": "No result received from crew"})
 
     return StreamingResponse(
         event_generator(),
@@ -281,6 +415,269 @@ async def analyze_ad_stream(
     )
 
 
+def _run_analysis(
+    flight: InFlightRun,
+    mode: str,
+    artifact_handle: str,
+    landing_page_url: str,
+    parsed_guidelines: Optional[dict],
+    target_audience: Optional[str],
+    campaign_goal: Optional[str],
+    ad_text: Optional[str],
+    force_refresh: bool,
+):
+    """Run an analysis on a pool worker and hand the outcome to every attached request"""
+    report = None
+    error = None
+    with bind_events(flight.source):
+        probe = MemoryProbe(upload_bytes=_upload_size(artifact_handle))
+        try:
+            flight.mark_started()
+            emit("log", "🚀 Starting analysis...")
+            emit("log", f"📁 Ad image: {_ad_image_label(artifact_handle)}")
+            emit("log", f"🌐 Landing page: {landing_page_url}")
+
+            # Create crew and start analysis
+            emit("log", f"🏗️ Creating crew (mode: {mode})...")
+            crew = ANALYSIS_MODES[mode](
+                ad_url=artifact_handle,
+                landing_page_url=landing_page_url,
+                brand_guidelines=parsed_guidelines,
+                target_audience=target_audience,
+                campaign_goal=campaign_goal,
+                ad_text=ad_text,
+                force_refresh=force_refresh,
+            )
+            emit("log", "✅ Crew created successfully")
+
+            # Run the crew (this blocks)
+            emit("log", "⚙️ Running crew analysis...")
+            report = crew.kickoff()
+
+            emit("log", f"✅ Analysis complete! Score: {report.overall_score}")
+
+        except Exception as e:
+            import traceback
+            error = f"Crew execution error: {str(e)}"
+            error_trace = traceback.format_exc()
+
+            logger.error(error, traceback=error_trace)
+
+            emit("log", f"❌ {error}")
+            emit("log", f"Details: {error_trace[:500]}")
+        finally:
+            # The run owns the upload: released even if the client is long gone
+            _release_artifact(artifact_handle)
+            _report_memory(probe)
+            emit("log", "🏁 Crew execution finished")
+            # Later identical requests start a fresh run instead of joining this one
+            single_flight.done(flight)
+            flight.finish(report, error)
+
+
+def _start_analysis(
+    channel: EventChannel,
+    mode: str,
+    artifact_handle: str,
+    landing_page_url: str,
+    parsed_guidelines: Optional[dict],
+    target_audience: Optional[str],
+    campaign_goal: Optional[str],
+    ad_text: Optional[str],
+    force_refresh: bool = False,
+    on_start=None,
+    on_done=None,
+) -> InFlightRun:
+    """
+    Attach channel to an identical analysis in flight, or queue a new one
+
+    Requests match on the ad image bytes, normalized landing page URL, brand
+    guidelines, audience, goal, ad text, mode and force_refresh. A joining
+    request drops its own upload and receives the shared run's events
+    (replayed from the start) and its result.
+
+    Args:
+        channel: Event channel of the request
+        on_start: Called when the run leaves the queue
+        on_done: Called with the finished InFlightRun before channel is closed
+
+    Raises:
+        HTTPException: 429 when a new run does not fit into the crew queue
+    """
+    key = analysis_key(
+        get_artifact_store().get(artifact_handle).data,
+        landing_page_url,
+        parsed_guidelines,
+        target_audience,
+        campaign_goal,
+        ad_text,
+        mode,
+        force_refresh,
+    )
+    flight, is_leader = single_flight.join(key, history_size=RUN_EVENT_BUFFER)
+
+    if not is_leader:
+        _release_artifact(artifact_handle)
+        logger.info("Joined in-flight analysis", key=key[:12], subscribers=flight.subscribers + 1)
+        channel.emit("log", "🔗 Joined an identical analysis already in progress")
+        flight.attach(channel, on_start=on_start, on_done=on_done)
+        return flight
+
+    flight.attach(channel, on_start=on_start, on_done=on_done)
+    try:
+        _submit_crew_run(
+            lambda: _run_analysis(
+                flight,
+                mode,
+                artifact_handle,
+                landing_page_url,
+                parsed_guidelines,
+                target_audience,
+                campaign_goal,
+                ad_text,
+                force_refresh,
+            ),
+            flight.source,
+            artifact_handle,
+        )
+    except HTTPException:
+        single_flight.done(flight)
+        flight.finish(error="Rejected: crew queue full")
+        raise
+    return flight
+
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.post("/api/v1/jobs", status_code=202)
+async def submit_job(
+    landing_page_url: str = Form(...),
+    ad_file: UploadFile = File(...),
+    brand_guidelines: Optional[str] = Form(None),
+    target_audience: Optional[str] = Form(None),
+    campaign_goal: Optional[str] = Form(None),
+    ad_text: Optional[str] = Form(None),
+    mode: str = Form("full"),
+    force_refresh: bool = Form(False),
+):
+    """
+    Submit an analysis job and return immediately
+
+    Takes the same form fields as /api/v1/analyze/stream.
+    Poll the returned URLs for status, progress events and the result.
+    """
+    _get_rater_class(mode)
+    artifact_handle, parsed_guidelines = await _prepare_analysis_inputs(
+        landing_page_url, ad_file, brand_guidelines
+    )
+
+    job_id = job_store.create({
+        "landing_page_url": landing_page_url,
+        "brand_guidelines": parsed_guidelines,
+        "target_audience": target_audience,
+        "campaign_goal": campaign_goal,
+        "ad_text": ad_text,
+        "mode": mode,
+        "force_refresh": force_refresh,
+        "ad_filename": ad_file.filename,
+    })
+
+    # Listener-only channel: every event is written straight to the job store
+    events = EventChannel(maxlen=0)
+    events.add_listener(lambda event: job_store.add_event(job_id, event["type"], event["data"]))
+
+    def on_done(flight: InFlightRun):
+        if flight.result is not None:
+            job_store.set_status(job_id, SUCCEEDED, result=flight.result.model_dump_json())
+        else:
+            job_store.set_status(job_id, FAILED, error=flight.error or "No result received from crew")
+
+    try:
+        _start_analysis(
+            events,
+            mode,
+            artifact_handle,
+            landing_page_url,
+            parsed_guidelines,
+            target_audience,
+            campaign_goal,
+            ad_text,
+            force_refresh,
+            on_start=lambda: job_store.set_status(job_id, RUNNING),
+            on_done=on_done,
+        )
+    except HTTPException:
+        # Rejected by admission control: the client never learns this id
+        job_store.delete(job_id)
+        raise
+    logger.info("Job submitted", job_id=job_id)
+
+    return {
+        "job_id": job_id,
+        "status": QUEUED,
+        "status_url": f"/api/v1/jobs/{job_id}",
+        "events_url": f"/api/v1/jobs/{job_id}/events",
+        "result_url": f"/api/v1/jobs/{job_id}/result",
+    }
+
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Job status"""
+    job = _get_job_or_404(job_id)
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "error": job["error"],
+    }
+
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def get_job_events(job_id: str, after: int = 0):
+    """Progress events after the given sequence number"""
+    _get_job_or_404(job_id)
+    events = job_store.events(job_id, after=after)
+    return {
+        "job_id": job_id,
+        "events": events,
+        "next": events[-1]["seq"] if events else after,
+    }
+
+
+@app.get("/api/v1/jobs/{job_id}/result")
+async def get_job_result(job_id: str, report_format: str = "json"):
+    """
+    Final report of a finished job (409 while it is still queued or running)
+
+    The structured report is returned as 'report'; report_format=markdown
+    renders it into 'result' instead.
+    """
+    _check_report_format(report_format)
+    job = _get_job_or_404(job_id)
+    if job["status"] not in (SUCCEEDED, FAILED):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    response = {
+        "job_id": job_id,
+        "status": job["status"],
+        "error": job["error"],
+    }
+    if job["result"]:
+        report = AdQualityReport.model_validate_json(job["result"])
+        if report_format == "markdown":
+            response["result"] = render_markdown(report)
+        else:
+            response["report"] = report.model_dump(mode="json")
+    return response
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,169 @@
+"""Single-Flight Coalescing of Identical Concurrent Analyses"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import hashlib
+import json
+import threading
+
+from tools.landing_page_cache import normalize_url
+from utils.events import EventChannel
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+def canonical_json(value: Any) -> str:
+    """Stable JSON encoding (sorted keys, no whitespace) for hashing"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def analysis_key(
+    image_bytes: bytes,
+    landing_page_url: str,
+    brand_guidelines: Optional[dict],
+    target_audience: Optional[str],
+    campaign_goal: Optional[str],
+    ad_text: Optional[str],
+    mode: str,
+    force_refresh: bool = False,
+) -> str:
+    """Key shared by requests that would produce the same analysis"""
+    return hashlib.sha256(canonical_json({
+        "image": hashlib.sha256(image_bytes).hexdigest(),
+        "landing_page": normalize_url(landing_page_url),
+        "brand_guidelines": brand_guidelines or {},
+        "target_audience": target_audience or "",
+        "campaign_goal": campaign_goal or "",
+        "ad_text": ad_text or "",
+        "mode": mode,
+        "force_refresh": force_refresh,
+    }).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Subscriber:
+    channel: EventChannel
+    on_start: Optional[Callable[[], None]] = None
+    on_done: Optional[Callable[["InFlightRun"], None]] = None
+
+
+class InFlightRun:
+    """
+    One analysis run shared by every request with the same key
+
+    The run emits into ``source``. Each event is kept in a bounded history
+    and forwarded to all attached channels; a request attaching later gets
+    the history replayed first, so every subscriber sees the whole stream.
+    finish() hands the result to each subscriber's on_done and closes its
+    channel.
+    """
+
+    def __init__(self, key: str, history_size: int = 1000):
+        self.key = key
+        self.source = EventChannel(maxlen=0)
+        self.source.add_listener(self._publish)
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.started = False
+        self.finished = False
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: list[_Subscriber] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _publish(self, event: dict):
+        with self._lock:
+            self._history.append(event)
+            # Forwarded under the lock so a concurrent attach() cannot miss or repeat events
+            for subscriber in self._subscribers:
+                subscriber.channel.emit(event["type"], event["data"])
+
+    def attach(
+        self,
+        channel: EventChannel,
+        on_start: Optional[Callable[[], None]] = None,
+        on_done: Optional[Callable[["InFlightRun"], None]] = None,
+    ):
+        """Replay the events so far into channel and subscribe it to the rest"""
+        subscriber = _Subscriber(channel, on_start, on_done)
+        with self._lock:
+            for event in self._history:
+                channel.emit(event["type"], event["data"])
+            started = self.started
+            finished = self.finished
+            if not finished:
+                self._subscribers.append(subscriber)
+        if started and on_start is not None:
+            on_start()
+        if finished:
+            self._deliver(subscriber)
+
+    def mark_started(self):
+        """Call on_start of every subscriber (the run left the queue)"""
+        with self._lock:
+            self.started = True
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if subscriber.on_start is not None:
+                subscriber.on_start()
+
+    def finish(self, result: Any = None, error: Optional[str] = None):
+        """Publish the outcome to all subscribers and close their channels"""
+        with self._lock:
+            self.result = result
+            self.error = error
+            self.finished = True
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._deliver(subscriber)
+
+    def _deliver(self, subscriber: _Subscriber):
+        try:
+            if subscriber.on_done is not None:
+                subscriber.on_done(self)
+        except Exception as e:
+            logger.error("Single-flight subscriber failed", key=self.key[:12], error=str(e))
+        finally:
+            subscriber.channel.close()
+
+
+class SingleFlight:
+    """
+    Registry of in-flight analyses by key
+
+    The first request for a key becomes the leader and starts the run;
+    identical requests arriving while it is in flight join it instead of
+    spending their own Gemini calls and browser session.
+    """
+
+    def __init__(self):
+        self._runs: dict[str, InFlightRun] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: str, history_size: int = 1000) -> tuple[InFlightRun, bool]:
+        """
+        In-flight run for key, creating it if there is none
+
+        Returns:
+            Tuple of (run, True if the caller is the leader and must start it)
+        """
+        with self._lock:
+            run = self._runs.get(key)
+            if run is not None:
+                metrics.incr("single_flight.coalesced")
+                return run, False
+            run = InFlightRun(key, history_size)
+            self._runs[key] = run
+            metrics.set_gauge("single_flight.in_flight", len(self._runs))
+            return run, True
+
+    def done(self, run: InFlightRun):
+        """Stop routing new requests to run (call before run.finish())"""
+        with self._lock:
+            if self._runs.get(run.key) is run:
+                del self._runs[run.key]
+            metrics.set_gauge("single_flight.in_flight", len(self._runs))
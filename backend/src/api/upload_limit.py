@@ -0,0 +1,58 @@
+"""ASGI Middleware Capping the Request Body Size of Upload Endpoints"""
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from utils.metrics import metrics
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse oversized request bodies on upload paths while they are received
+
+    Requests announcing more than ``max_bytes`` in Content-Length get a 413
+    unread. Bodies without Content-Length (chunked transfer) are counted
+    message by message at the ASGI receive level; once they pass the limit
+    the receive call raises a 413 HTTPException, so the multipart parser
+    stops before spooling the rest to its temporary file.
+
+    Register it before CORSMiddleware so that CORS stays the outer layer
+    and the browser can read the 413.
+    """
+
+    def __init__(self, app, paths: set[str], max_bytes: int):
+        self.app = app
+        self.paths = paths
+        self.max_bytes = max_bytes
+
+    def _too_large(self, size: int) -> str:
+        return (
+            f"File too large. Maximum size is {self.max_bytes / (1024 * 1024):.0f}MB "
+            f"including form data, got {size / (1024 * 1024):.1f}MB"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            metrics.incr("uploads.rejected_too_large")
+            response = JSONResponse(status_code=413, content={"detail": self._too_large(int(length))})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    metrics.incr("uploads.rejected_too_large")
+                    raise HTTPException(status_code=413, detail=self._too_large(received))
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,110 @@
+"""Latency and Cost Benchmark - Full Crew vs. Fast Mode
+
+Usage (from backend/src):
+    python -m crew.benchmark path/to/ad.png https://example.com/landing --runs 3
+
+Runs are cold by default: the report, vision, landing page and LLM caches
+are switched off, so every run does the same work. --warm keeps them to
+measure repeat analyses instead.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+from crew.crew import AdQualityRaterCrew
+from crew.fast_mode import FastAdQualityRater
+from utils.llm_config import estimate_cost
+
+
+MODES = {
+    "full": AdQualityRaterCrew,
+    "fast": FastAdQualityRater,
+}
+
+# Settings that keep every cache from answering a repeated run
+COLD_CACHE_ENV = {
+    "REPORT_CACHE_ENABLED": "false",
+    "VISION_CACHE_TTL": "0",
+    "VISION_CACHE_DIR": "",
+    "LP_CACHE_TTL": "0",
+    "LP_CACHE_MAX_AGE": "0",
+    "LP_CACHE_DIR": "",
+    "LLM_CACHE_MODE": "off",
+}
+
+
+def benchmark_mode(mode: str, runs: int, warm: bool = False, **inputs) -> dict:
+    """
+    Run one mode several times and summarize latency and token cost
+
+    Cold runs (the default) bypass the report cache with force_refresh;
+    the other caches are switched off through COLD_CACHE_ENV in main().
+
+    Returns:
+        Dict with median/min/max seconds, average tokens and cost per run
+    """
+    durations, tokens, costs = [], [], []
+    for _ in range(runs):
+        rater = MODES[mode](**inputs, force_refresh=not warm)
+        started = time.time()
+        rater.kickoff()
+        durations.append(time.time() - started)
+        tokens.append(sum(rater.token_usage.values()))
+        costs.append(estimate_cost(**rater.token_usage))
+
+    return {
+        "mode": mode,
+        "runs": runs,
+        "warm": warm,
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "max_seconds": max(durations),
+        "avg_tokens": statistics.mean(tokens),
+        "avg_cost_usd": statistics.mean(costs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full crew and fast mode")
+    parser.add_argument("ad_file", help="Local ad image")
+    parser.add_argument("landing_page_url")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", default="fast,full", help="Comma-separated modes to run")
+    parser.add_argument("--warm", action="store_true", help="Keep the caches (measure repeat analyses)")
+    args = parser.parse_args()
+
+    load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".env"))
+    if not args.warm:
+        # Before the first run, since the caches read their settings once
+        os.environ.update(COLD_CACHE_ENV)
+
+    results = [
+        benchmark_mode(
+            mode, args.runs, warm=args.warm, ad_url=args.ad_file, landing_page_url=args.landing_page_url
+        )
+        for mode in args.modes.split(",")
+    ]
+
+    print(f"Caches: {'warm' if args.warm else 'cold (disabled)'}")
+    print(f"{'mode':<6} {'median s':>9} {'min s':>7} {'max s':>7} {'tokens':>9} {'cost $':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['median_seconds']:>9.1f} {r['min_seconds']:>7.1f} "
+            f"{r['max_seconds']:>7.1f} {r['avg_tokens']:>9.0f} {r['avg_cost_usd']:>9.4f}"
+        )
+
+    by_mode = {r["mode"]: r for r in results}
+    if "fast" in by_mode and "full" in by_mode:
+        fast, full = by_mode["fast"], by_mode["full"]
+        print(
+            f"\nFast mode: {full['median_seconds'] / max(fast['median_seconds'], 1e-6):.1f}x faster, "
+            f"{full['avg_cost_usd'] / max(fast['avg_cost_usd'], 1e-9):.1f}x cheaper"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,75 @@
 """Ad Quality Rater Crew - Main Orchestrator"""
 
-from crewai import Crew, Task, Process
+from crewai import Task
 from typing import Optional
 import uuid
 from datetime import datetime
 import time
 import json
-import re
 
-from agents.ad_visual_analyst import create_ad_visual_analyst
-from agents.landing_page_scraper import create_landing_page_scraper
-from agents.copywriting_expert import create_copywriting_expert
-from agents.brand_consistency_agent import create_brand_consistency_agent
-from agents.quality_rating_synthesizer import create_quality_rating_synthesizer
+from agents.registry import get_agent
+from crew.dag import FunctionOutput, SkippedOutput, TaskGraph
+from crew.report import (
+    AdQualityReport,
+    ReportDraft,
+    ReportMetadata,
+    SectionReport,
+    parse_report_draft,
+    weighted_score,
+)
+from crew.report_cache import (
+    analysis_input_hash,
+    get_report_cache,
+    input_index_key,
+    report_cache_enabled,
+    report_cache_key,
+)
+from tools.copy_metrics import analyze_copy, format_copy_metrics
+from tools.landing_page_fetcher import fetch_landing_page, fetch_summary
+from tools.page_condenser import CondensedPage, get_token_budget
+from tools.visual_metrics import compute_visual_metrics_for_source, format_visual_metrics
+from utils.artifacts import read_source_bytes
+from utils.events import current_channel, emit
+from utils.llm_config import estimate_cost
+from utils.metrics import metrics
+from utils.tokens import estimate_tokens
+
+
+# Longest text forwarded per progress event
+MAX_EVENT_TEXT = 300
+
+# Canned brand result when no guidelines were supplied (no LLM call needed)
+NO_BRAND_GUIDELINES = "No brand guidelines provided."
+
+
+def _on_agent_step(step) -> None:
+    """Forward CrewAI agent steps (tool calls, thoughts) to the run's event channel"""
+    tool = getattr(step, "tool", None)
+    thought = (getattr(step, "thought", None) or "").strip()
+    if tool:
+        emit("log", f"🔧 Tool: {tool}")
+    if thought:
+        emit("log", f"💭 {thought[:MAX_EVENT_TEXT]}")
+
+
+def _on_task_done(output) -> None:
+    """Forward finished task summaries to the run's event channel"""
+    summary = str(getattr(output, "summary", "") or "")[:MAX_EVENT_TEXT]
+    emit("log", f"✅ {getattr(output, 'agent', 'Agent')}: {summary}")
 
 
 class AdQualityRaterCrew:
     """
     Main Crew orchestrator for Ad Quality Analysis
 
-    This crew coordinates 5 agents in a sequential process to analyze
+    This crew coordinates 4 agents as a dependency graph to analyze
     ads and landing pages for quality, consistency, and brand compliance.
+    The landing page is fetched by a deterministic stage (no LLM); stages
+    without mutual dependencies run in parallel. Finished reports are cached
+    under the full analysis input; the lookup happens once the landing page
+    is fetched. The vision stage runs meanwhile, unless a report for the same
+    input is known, in which case it waits so a hit costs no LLM call.
+    force_refresh bypasses the cache.
     """
 
     def __init__(
@@ -30,26 +79,52 @@ class AdQualityRaterCrew:
         brand_guidelines: Optional[dict] = None,
         target_audience: Optional[str] = None,
         campaign_goal: Optional[str] = None,
+        ad_text: Optional[str] = None,
+        force_refresh: bool = False,
     ):
         self.ad_url = ad_url
         self.landing_page_url = landing_page_url
         self.brand_guidelines = brand_guidelines or {}
         self.target_audience = target_audience or "Allgemeine Zielgruppe"
         self.campaign_goal = campaign_goal or "Allgemeine Kampagne"
+        self.ad_text = ad_text
+        self.force_refresh = force_refresh
         self.report_id = str(uuid.uuid4())
         self.start_time = None
-
-        # Create agents
-        self.ad_visual_analyst = create_ad_visual_analyst()
-        self.landing_page_scraper = create_landing_page_scraper()
-        self.copywriting_expert = create_copywriting_expert()
-        self.brand_consistency_agent = create_brand_consistency_agent()
-        self.quality_rating_synthesizer = create_quality_rating_synthesizer()
-
-    def _create_tasks(self) -> list[Task]:
+        self.critical_path: list[str] = []
+        self.skipped_stages: dict[str, str] = {}
+        self.landing_page_fetch: Optional[dict] = None
+        self.input_hash: Optional[str] = None
+        self.cache_key: Optional[str] = None
+        self.report_cache: Optional[str] = None
+        self.cached_report: Optional[AdQualityReport] = None
+        self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        self.landing_page: Optional[CondensedPage] = None
+        self.stage_input_tokens: dict[str, dict[str, int]] = {}
+        self.visual_metrics: Optional[dict] = None
+
+        # Per-run copies of the prebuilt agents (LLM client and tools are shared)
+        setup_started = time.time()
+        self.ad_visual_analyst = get_agent("ad_visual_analyst")
+        self.copywriting_expert = get_agent("copywriting_expert")
+        self.brand_consistency_agent = get_agent("brand_consistency_agent")
+        self.quality_rating_synthesizer = get_agent("quality_rating_synthesizer")
+
+        # Progress is reported through the per-run event channel, not stdout
+        for agent in (
+            self.ad_visual_analyst,
+            self.copywriting_expert,
+            self.brand_consistency_agent,
+            self.quality_rating_synthesizer,
+        ):
+            agent.step_callback = _on_agent_step
+
+        metrics.observe("crew.setup_seconds", time.time() - setup_started)
+
+    def _create_tasks(self) -> dict[str, Task]:
         """Create all tasks with proper context dependencies"""
 
-        # Task 1: Analyze Ad Visuals
+        # Task 1: Analyze Ad Visuals (the vision tool adds the measured visual metrics)
         analyze_ad_task = Task(
             description=f"""Analyze the ad visual using Gemini Vision Tool.
 
@@ -71,33 +146,27 @@ class AdQualityRaterCrew:
             Be clear and constructive. MAX 6 sentences.""",
             expected_output="""Clear, constructive visual analysis (max 6 sentences) with score and specific improvement suggestions. Response in the SAME LANGUAGE as the ad content.""",
             agent=self.ad_visual_analyst,
+            callback=_on_task_done,
         )
 
-        # Task 2: Scrape Landing Page
-        scrape_lp_task = Task(
-            description=f"""Extrahiere den vollständigen Text-Content von folgender Landingpage: {self.landing_page_url}
-
-            Verwende Playwright für dynamische Seiten und trafilatura als Fallback.
+        # The landing page comes from the "scrape_lp" function stage (see kickoff)
 
-            Achte auf:
-            - Vollständige Extraktion aller sichtbaren Texte
-            - Headlines, Subheadlines, Body-Text
-            - Call-to-Actions
-            - Entfernung von Boilerplate (Footer, Cookie-Banner-Text, etc.)
-
-            Bei Problemen (Timeout, 404, etc.) gib eine klare Fehlermeldung zurück.""",
-            expected_output="""Extrahierter Text-Content der Landingpage als String,
-            oder Fehlermeldung bei Problemen.""",
-            agent=self.landing_page_scraper,
-        )
+        # Ad copy limits are only measured when the ad text was supplied
+        if self.ad_text:
+            length_check = "Intro >150 chars? Headline >70 chars? (use the MEASURED COPY METRICS of the ad copy)"
+        else:
+            length_check = (
+                "Intro >150 chars? Headline >70 chars? (judge the text in the ad image; "
+                "the measured metrics describe the landing page, not the ad)"
+            )
 
-        # Task 3: Copywriting Analysis
+        # Task 2: Copywriting Analysis
         copywriting_task = Task(
             description=f"""Evaluate copy quality. Be honest and constructive.
 
             **Input:**
             - Ad Analysis: {{analyze_ad_task.output}}
-            - Landing Page: {{scrape_lp_task.output}}
+            - Landing Page: condensed page (title, headings, CTAs, text) in the context
 
             **Evaluate:**
             1. Consistency Ad→LP: X/100
@@ -105,7 +174,7 @@ class AdQualityRaterCrew:
             3. CTA: Appropriate? Yes/No
             4. Pain Point: Clear? Yes/No
             5. PIO Formula: Present? Yes/No
-            6. Length: Intro >150 chars? Headline >70 chars?
+            6. Length: {length_check}
             7. Triggers: Which? (Specificity, Familiarity, etc.)
 
             **Improvement:** Ready-to-use text suggestion OR "Good as is"
@@ -114,147 +183,368 @@ class AdQualityRaterCrew:
             Be clear and constructive. MAX 6 sentences.""",
             expected_output="""Clear copywriting analysis (max 6 sentences) with score and ready-to-use improvement text. Response in the SAME LANGUAGE as the ad content.""",
             agent=self.copywriting_expert,
-            context=[analyze_ad_task, scrape_lp_task],
+            context=[analyze_ad_task],
+            callback=_on_task_done,
         )
 
-        # Task 4: Brand Compliance Check (OPTIONAL - only if guidelines provided)
-        brand_compliance_task = Task(
-            description=f"""ONLY if brand guidelines are provided: Quick brand compliance check.
+        # Task 3: Brand Compliance Check (only built if guidelines provided)
+        brand_compliance_task = None
+        if self.brand_guidelines:
+            brand_compliance_task = Task(
+                description=f"""Quick brand compliance check.
 
             **Brand Guidelines:**
-            {self.brand_guidelines if self.brand_guidelines else "NO Guidelines - SKIP this analysis"}
+            {self.brand_guidelines}
 
-            **If guidelines provided:**
             - Quick check: Tone, colors, forbidden words
             - Score (0-100): Overall rating
             - MAX 2-3 sentences feedback
 
-            **If NO guidelines:**
-            - Write: "No brand guidelines provided."
-
             IMPORTANT: Use the SAME LANGUAGE as detected in previous analyses.
             Be BRIEF. Maximum 3 sentences.""",
-            expected_output="""Brief brand analysis (max 3 sentences) OR "No guidelines provided". Response in the SAME LANGUAGE as the ad content.""",
-            agent=self.brand_consistency_agent,
-            context=[analyze_ad_task, scrape_lp_task],
-        )
+                expected_output="""Brief brand analysis (max 3 sentences). Response in the SAME LANGUAGE as the ad content.""",
+                agent=self.brand_consistency_agent,
+                context=[analyze_ad_task],
+                callback=_on_task_done,
+            )
 
-        # Task 5: Synthesize Final Report
+        brand_input = "{brand_compliance_task.output}" if brand_compliance_task else NO_BRAND_GUIDELINES
+
+        # Task 4: Synthesize Final Report (structured output, rendered on request)
         synthesize_report_task = Task(
-            description=f"""Create a CONCISE, CLEAR performance report.
+            description=f"""Create a CONCISE, CLEAR performance report as structured data.
 
             **Input Analyses:**
             - Visual: {{analyze_ad_task.output}}
             - Copy: {{copywriting_task.output}}
-            - Brand: {{brand_compliance_task.output}}
-
-            **Report Structure (BRIEF!):**
+            - Brand: {brand_input}
+            - Measured visual metrics (exact - do not re-estimate): in the context
 
-            # 📊 Ad Performance Analysis
-
-            **Score:** X/100 (Visual 40%, Copy 50%, Brand 10%)
-            **Assessment:** [Good/Needs Improvement/Poor - BE HONEST]
-
-            ---
-
-            ## 🎨 Visual (MAX 4 sentences)
-            - Format: [1:1 or other? Assessment]
-            - Authenticity: [Stock photo? Yes/No]
-            - Text Overlay: [Assessment]
-            - **Improvement:** [Specific suggestion OR "Good as is"]
-
-            ## ✍️ Copy (MAX 4 sentences)
-            - Consistency Ad→LP: [Score 0-100]
-            - Tone: [Salesy/Educational]
-            - PIO Formula: [Yes/No]
-            - **Improvement:** [Specific text suggestion OR "Good as is"]
-
-            ## 🎯 Brand (MAX 2 sentences - OR skip if no guidelines)
-            - [Brief feedback OR "No guidelines provided"]
-
-            ## 🔥 TOP 2 IMPROVEMENTS (Only if needed!)
-
-            **1. [Highest Impact - e.g. "Headline"]**
-            ❌ Current: "[Show current text]"
-            ✅ Suggested: "[Ready-to-use new text]"
-            Expected Impact: +X%
-
-            **2. [Second Priority - e.g. "CTA"]**
-            ❌ Current: "[Show current text]"
-            ✅ Suggested: "[Ready-to-use new text]"
-            Expected Impact: +X%
+            **Fill the report fields:**
+            - visual / copywriting: score (0-100), max 4 short findings, one specific improvement (null if good as is)
+            - brand: null if no brand guidelines were provided
+            - overall_score: Visual 40%, Copy 50%, Brand 10%
+            - assessment: Good / Needs Improvement / Poor - BE HONEST
+            - recommendations: TOP 2 improvements, each with current text, ready-to-use suggested text and expected impact
 
             **RULES:**
-            - BRIEF: Maximum 3-4 sentences per section
+            - BRIEF: One sentence per finding
             - CLEAR: Be specific and constructive
             - ACTIONABLE: Every critique includes a concrete fix
             - FOCUS: Only TOP 2 improvements for highest impact
-            - Skip brand section if no guidelines provided
-            - LANGUAGE: Use the SAME LANGUAGE as detected in all previous analyses
-
-            Be concise and constructive.""",
-            expected_output="""Concise performance report (max 15 sentences total) with:
-            - Clear assessment
-            - Top 2 improvements with ready-to-use text
-            - Constructive feedback
-            - Response in the SAME LANGUAGE as the ad content""",
+            - LANGUAGE: Write all texts in the SAME LANGUAGE as detected in all previous analyses""",
+            expected_output="""JSON object matching the report schema (no markdown, no prose around it).
+            All texts in the SAME LANGUAGE as the ad content.""",
+            output_pydantic=ReportDraft,
             agent=self.quality_rating_synthesizer,
-            context=[analyze_ad_task, scrape_lp_task, copywriting_task, brand_compliance_task],
+            context=[
+                task for task in (analyze_ad_task, copywriting_task, brand_compliance_task)
+                if task is not None
+            ],
+            callback=_on_task_done,
         )
 
-        return [
-            analyze_ad_task,
-            scrape_lp_task,
-            copywriting_task,
-            brand_compliance_task,
-            synthesize_report_task,
-        ]
+        tasks = {
+            "analyze_ad": analyze_ad_task,
+            "copywriting": copywriting_task,
+        }
+        if brand_compliance_task is not None:
+            tasks["brand_compliance"] = brand_compliance_task
+        tasks["synthesize_report"] = synthesize_report_task
+        return tasks
+
+    def _on_event(self, event: dict) -> None:
+        """Record the LLM usage tools report for this run"""
+        if event.get("type") == "llm_usage":
+            for key in self.token_usage:
+                self.token_usage[key] += event["data"].get(key, 0)
+
+    def _add_agent_usage(self) -> None:
+        """Add the tokens CrewAI counted for each agent's LLM calls"""
+        for agent in (
+            self.ad_visual_analyst,
+            self.copywriting_expert,
+            self.brand_consistency_agent,
+            self.quality_rating_synthesizer,
+        ):
+            token_process = getattr(agent, "_token_process", None)
+            if token_process is None:
+                continue
+            summary = token_process.get_summary()
+            self.token_usage["prompt_tokens"] += getattr(summary, "prompt_tokens", 0) or 0
+            self.token_usage["completion_tokens"] += getattr(summary, "completion_tokens", 0) or 0
+
+    def _fetch_landing_page(self) -> FunctionOutput:
+        """Function stage: tiered landing page fetch, condensed for the LLM stages"""
+        result = fetch_landing_page(self.landing_page_url)
+        self.landing_page_fetch = result
+        if result.get("success") and result.get("page"):
+            self.landing_page = CondensedPage(**result["page"])
+            output = FunctionOutput(raw=self.landing_page.to_text(get_token_budget()), data=result)
+        elif result.get("success"):
+            output = FunctionOutput(raw=result.get("text") or "", data=result)
+        else:
+            output = FunctionOutput(
+                raw=f"Landing page could not be scraped: {result.get('error')}",
+                data=result,
+            )
+        self._lookup_report()
+        return output
+
+    def _measure_visuals(self) -> FunctionOutput:
+        """Function stage: exact visual metrics (format, palette, contrast) of the ad image"""
+        self.visual_metrics = compute_visual_metrics_for_source(self.ad_url)
+        if self.visual_metrics is None:
+            return FunctionOutput(raw="Measured visual metrics: not available for this image source.")
+        return FunctionOutput(
+            raw="Measured Visual Metrics (exact - do not re-estimate):\n" + format_visual_metrics(self.visual_metrics),
+            data=self.visual_metrics,
+        )
 
-    def kickoff(self) -> str:
+    def _report_input_hash(self) -> Optional[str]:
         """
-        Start the crew analysis
+        Hash of the analysis input for the report cache, or None to bypass it
 
-        Returns:
-            Text report from the analysis
+        Only uploads and local files are hashed; reports for remote or data:
+        images are not cached, and an unreadable source is left for the
+        vision stage to report.
         """
-        self.start_time = time.time()
-
+        if not report_cache_enabled() or self.ad_url.startswith(("http://", "https://", "data:")):
+            return None
         try:
-            # Create crew
-            crew = Crew(
-                agents=[
-                    self.ad_visual_analyst,
-                    self.landing_page_scraper,
-                    self.copywriting_expert,
-                    self.brand_consistency_agent,
-                    self.quality_rating_synthesizer,
-                ],
-                tasks=self._create_tasks(),
-                process=Process.sequential,
-                verbose=True,
-            )
-
-            # Execute crew
-            result = crew.kickoff()
-
-            # Return the text result directly
-            processing_time = time.time() - self.start_time
-
-            # Convert result to string
-            result_text = str(result)
-
-            # Add processing time footer
-            result_text += f"\n\n---\n\n**⏱️ Verarbeitungszeit:** {processing_time:.1f} Sekunden"
+            image_bytes = read_source_bytes(self.ad_url)
+        except (OSError, KeyError):
+            return None
+        return analysis_input_hash(
+            image_bytes,
+            self.brand_guidelines,
+            self.target_audience,
+            self.campaign_goal,
+            self.ad_text,
+        )
 
-            return result_text
+    def _lookup_report(self) -> None:
+        """
+        Look up a cached report once the landing page is known
 
-        except Exception as e:
-            processing_time = time.time() - self.start_time if self.start_time else 0
+        Called at the end of the scrape_lp stage while the vision stage may
+        still run. Sets ``cache_key`` (where the new report is stored)
+        and, on a hit, ``cached_report``, which skips the remaining LLM stages.
+        """
+        if self.input_hash is None or self._scrape_failure({}) is not None:
+            return  # incomplete reports are not cached
+
+        self.cache_key = report_cache_key(self.input_hash, self.landing_page_fetch)
+        if self.force_refresh:
+            self.report_cache = "refresh"
+            metrics.incr("cache.report.refreshes")
+            emit("log", "🔄 Report cache bypassed (force refresh)")
+            return
+
+        cached = get_report_cache().get(self.cache_key)
+        if cached is None:
+            self.report_cache = "miss"
+            return
+        self.report_cache = "hit"
+        self.cached_report = AdQualityReport.model_validate(cached)
+        emit("log", f"♻️ Report served from cache (report {self.cached_report.metadata.report_id})")
+
+    def _expect_report_hit(self) -> bool:
+        """True if a report for the same input (any landing page version) is cached"""
+        if self.input_hash is None or self.force_refresh:
+            return False
+        return get_report_cache().get(input_index_key(self.input_hash)) is not None
+
+    def _serve_cached_report(self, processing_time: float) -> AdQualityReport:
+        """The cached report with this run's id, timing and spent tokens"""
+        report = self.cached_report
+        report.metadata = report.metadata.model_copy(update={
+            "report_id": self.report_id,
+            "created_at": datetime.now().isoformat(),
+            "processing_seconds": round(processing_time, 2),
+            "landing_page_fetch": fetch_summary(self.landing_page_fetch),
+            "token_usage": self.token_usage,
+            "cost_usd": round(estimate_cost(**self.token_usage), 6),
+            "report_cache": "hit",
+            "cached_report_id": report.metadata.report_id,
+        })
+        metrics.observe("analysis.full.seconds", processing_time)
+        return report
+
+    def _skip_cached(self, outputs: dict) -> Optional[SkippedOutput]:
+        """Skip an LLM stage whose report was found in the report cache"""
+        if self.cached_report is None:
+            return None
+        return SkippedOutput(raw="Report served from cache.", reason="report served from cache")
+
+    def _scrape_failure(self, outputs: dict) -> Optional[str]:
+        """Reason why the landing page fetch failed, or None if it succeeded"""
+        result = self.landing_page_fetch or {}
+        if result.get("success") and (result.get("text") or result.get("page")):
+            return None
+        return result.get("error") or "landing page could not be extracted"
+
+    def _skip_copywriting(self, outputs: dict) -> Optional[SkippedOutput]:
+        """Skip the copy analysis when there is no landing page text to compare"""
+        cached = self._skip_cached(outputs)
+        if cached is not None:
+            return cached
+        reason = self._scrape_failure(outputs)
+        if reason is None:
+            return None
+        return SkippedOutput(
+            raw=f"Copy analysis skipped: the landing page could not be scraped ({reason}).",
+            reason=f"landing page scrape failed: {reason}",
+        )
 
-            return f"""# ❌ Analyse Fehlgeschlagen
+    def _skip_synthesis(self, outputs: dict) -> Optional[SkippedOutput]:
+        """Assemble the report locally from the visual analysis after a failed scrape"""
+        cached = self._skip_cached(outputs)
+        if cached is not None:
+            return cached
+        reason = self._scrape_failure(outputs)
+        if reason is None:
+            return None
+        draft = ReportDraft(
+            language="unknown",
+            assessment=f"Unvollständig - die Landingpage konnte nicht geladen werden ({reason})",
+            visual=SectionReport(findings=[outputs["analyze_ad"].raw.strip()]),
+            copywriting=SectionReport(
+                findings=["Die Copy-Analyse wurde übersprungen, da kein Landingpage-Text vorliegt."],
+                improvement="Landingpage-URL prüfen und die Analyse erneut starten.",
+            ),
+        )
+        return SkippedOutput(raw=draft.model_dump_json(), reason=f"landing page scrape failed: {reason}")
 
-**Fehler:** {str(e)}
+    def _record_input_tokens(self, graph: TaskGraph) -> None:
+        """Per-stage input tokens, and what they would be with the full page text"""
+        if self.landing_page is not None:
+            saved = self.landing_page.full_tokens - estimate_tokens(
+                self.landing_page.to_text(get_token_budget())
+            )
+        else:
+            saved = 0
+
+        for name, tokens in graph.input_tokens.items():
+            uncondensed = tokens + max(saved, 0) if "scrape_lp" in graph.dependencies[name] else tokens
+            self.stage_input_tokens[name] = {"condensed": tokens, "uncondensed": uncondensed}
+            metrics.observe(f"tokens.{name}.input", tokens)
+            metrics.observe(f"tokens.{name}.input_uncondensed", uncondensed)
+        emit("input_tokens", self.stage_input_tokens)
+
+    def _copy_metrics_context(self, outputs: dict) -> str:
+        """Deterministic copy metrics computed before the copywriting LLM call"""
+        if self.landing_page is not None:
+            landing_page_text = self.landing_page.copy_text()
+        else:
+            landing_page_text = outputs["scrape_lp"].raw if "scrape_lp" in outputs else ""
+        landing_page = analyze_copy(landing_page_text) if landing_page_text else None
+        ad = analyze_copy(self.ad_text, ad=True) if self.ad_text else None
+        return format_copy_metrics(landing_page, ad)
+
+    def kickoff(self) -> AdQualityReport:
+        """
+        Start the crew analysis
 
-**Verarbeitungszeit:** {processing_time:.1f} Sekunden
+        Returns:
+            Structured report (render with crew.report.render_markdown)
 
-Bitte versuchen Sie es erneut oder kontaktieren Sie den Support."""
+        Raises:
+            ValueError: If the synthesizer output is not a valid report
+        """
+        self.start_time = time.time()
+        self.input_hash = self._report_input_hash()
+        expect_hit = self._expect_report_hit()
+
+        # Tools report their LLM usage as structured events
+        channel = current_channel()
+        if channel is not None:
+            channel.add_listener(self._on_event)
+
+        # Stages whose outcome is already known are dropped up front
+        if not self.brand_guidelines:
+            self.skipped_stages["brand_compliance"] = "no brand guidelines provided"
+            emit("stage", {"name": "brand_compliance", "status": "skipped", "reason": NO_BRAND_GUIDELINES})
+
+        # Execute tasks as a dependency graph (independent stages run in parallel);
+        # the landing page fetch (and report cache lookup) and the visual metrics
+        # overlap with the vision analysis, unless a likely cache hit makes the
+        # vision stage wait for the landing page
+        tasks = self._create_tasks()
+        held_back = ["analyze_ad"] if expect_hit else []
+        if expect_hit:
+            emit("log", "♻️ Cached report for this ad found, checking the landing page first")
+        graph = TaskGraph(
+            tasks,
+            context_builders={"copywriting": self._copy_metrics_context},
+            skip_conditions={
+                "analyze_ad": self._skip_cached,
+                "copywriting": self._skip_copywriting,
+                "brand_compliance": self._skip_cached,
+                "synthesize_report": self._skip_synthesis,
+            },
+            functions={"scrape_lp": self._fetch_landing_page, "visual_metrics": self._measure_visuals},
+            depends_on={
+                **{
+                    name: ["scrape_lp"]
+                    for name in (*held_back, "copywriting", "brand_compliance")
+                    if name in tasks
+                },
+                "synthesize_report": ["scrape_lp", "visual_metrics"],
+            },
+        )
+        outputs = graph.run()
+        self.skipped_stages.update(graph.skipped)
+        self._add_agent_usage()
+        self._record_input_tokens(graph)
+
+        processing_time = time.time() - self.start_time
+        if self.cached_report is not None:
+            return self._serve_cached_report(processing_time)
+
+        # The final stage holds the synthesized report
+        final_output = outputs["synthesize_report"]
+        draft = getattr(final_output, "pydantic", None)
+        if not isinstance(draft, ReportDraft):
+            draft = parse_report_draft(final_output.raw)
+        if not self.brand_guidelines:
+            draft.brand = None
+        # Deterministic weighting; the LLM's own score only if no section was scored
+        overall_score = weighted_score(draft)
+        if overall_score is None:
+            overall_score = draft.overall_score
+
+        # Report the critical path of this run
+        path, path_time = graph.critical_path()
+        self.critical_path = path
+        emit("critical_path", {"stages": path, "seconds": round(path_time, 2)})
+
+        # Latency and cost, comparable with fast mode
+        total_tokens = sum(self.token_usage.values())
+        cost = estimate_cost(**self.token_usage)
+        metrics.observe("analysis.full.seconds", processing_time)
+        metrics.observe("analysis.full.tokens", total_tokens)
+        metrics.observe("analysis.full.cost_usd", cost)
+
+        report = AdQualityReport(
+            **draft.model_dump(exclude={"overall_score"}),
+            overall_score=overall_score,
+            metadata=ReportMetadata(
+                report_id=self.report_id,
+                mode="full",
+                processing_seconds=round(processing_time, 2),
+                critical_path=path,
+                critical_path_seconds=round(path_time, 2),
+                skipped_stages=self.skipped_stages,
+                stage_input_tokens=self.stage_input_tokens,
+                landing_page_fetch=fetch_summary(self.landing_page_fetch) if self.landing_page_fetch else None,
+                token_usage=self.token_usage,
+                cost_usd=round(cost, 6),
+                visual_metrics=self.visual_metrics,
+                report_cache=self.report_cache,
+            ),
+        )
+        if self.cache_key is not None:
+            get_report_cache().set(self.cache_key, report.model_dump(mode="json"))
+            get_report_cache().set(input_index_key(self.input_hash), self.cache_key)
+        return report
@@ -0,0 +1,231 @@
+"""Dependency-Graph Executor for CrewAI Tasks"""
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import contextvars
+import time
+
+from utils.events import emit
+from utils.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from crewai import Task
+
+
+# Divider CrewAI uses when it aggregates context outputs
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock timing of a single stage"""
+
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class SkippedOutput:
+    """Stand-in output of a stage whose result was known without running it"""
+
+    raw: str
+    reason: str
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+@dataclass
+class FunctionOutput:
+    """Output of a deterministic (non-LLM) function stage"""
+
+    raw: str
+    data: Any = None
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+class TaskGraph:
+    """
+    Runs CrewAI tasks as a dependency graph
+
+    Edges are read from each task's ``context=[...]`` declaration. Tasks whose
+    dependencies are finished are executed in parallel on a thread pool, so
+    independent stages (e.g. vision analysis and scraping) overlap.
+
+    ``context_builders`` maps a task name to a function that receives the
+    outputs finished so far and returns extra context (e.g. locally computed
+    metrics) appended right before that task runs.
+
+    ``skip_conditions`` maps a task name to a function that receives the same
+    outputs and returns a SkippedOutput when the stage's result is already
+    known (e.g. upstream failed), or None to run it. Skipped stages cost no
+    LLM call and are listed in ``skipped``.
+
+    Estimated input tokens per stage are kept in ``input_tokens``.
+
+    ``functions`` adds deterministic stages: plain callables returning an
+    object with ``raw`` (e.g. the landing page fetch) that cost no LLM call.
+    CrewAI only accepts Tasks in ``context``, so edges to them are declared
+    in ``depends_on`` (stage name -> extra dependency names).
+    """
+
+    def __init__(
+        self,
+        tasks: dict[str, "Task"],
+        max_workers: Optional[int] = None,
+        context_builders: Optional[dict[str, Callable[[dict], str]]] = None,
+        skip_conditions: Optional[dict[str, Callable[[dict], Optional[SkippedOutput]]]] = None,
+        functions: Optional[dict[str, Callable[[], Any]]] = None,
+        depends_on: Optional[dict[str, list[str]]] = None,
+    ):
+        self.tasks = tasks
+        self.functions = functions or {}
+        self.names = [*self.functions, *tasks]
+        self.max_workers = max_workers or len(self.names)
+        self.context_builders = context_builders or {}
+        self.skip_conditions = skip_conditions or {}
+        self.skipped: dict[str, str] = {}
+        self.input_tokens: dict[str, int] = {}
+        self.timings: dict[str, StageTiming] = {}
+
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Function stages and tasks must have distinct names")
+
+        depends_on = depends_on or {}
+        names_by_task = {id(task): name for name, task in tasks.items()}
+        self.dependencies: dict[str, list[str]] = {name: [] for name in self.functions}
+        for name, task in tasks.items():
+            deps = []
+            for context_task in task.context or []:
+                if id(context_task) not in names_by_task:
+                    raise ValueError(f"Task '{name}' depends on a task outside the graph")
+                deps.append(names_by_task[id(context_task)])
+            self.dependencies[name] = deps
+        for name, extra in depends_on.items():
+            if name not in self.dependencies or any(dep not in self.dependencies for dep in extra):
+                raise ValueError(f"Stage '{name}' has a dependency outside the graph")
+            self.dependencies[name] += [dep for dep in extra if dep not in self.dependencies[name]]
+
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        """Raise ValueError if the declared context edges contain a cycle"""
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected in task graph at '{name}'")
+            visiting.add(name)
+            for dep in self.dependencies[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.names:
+            visit(name)
+
+    def _run_task(self, name: str, context: str):
+        """Execute one stage (task with the given dependency context, or function)"""
+        emit("stage", {"name": name, "status": "started", "input_tokens": self.input_tokens.get(name)})
+        started = time.time()
+        try:
+            if name in self.functions:
+                return self.functions[name]()
+            task = self.tasks[name]
+            return task.execute_sync(agent=task.agent, context=context, tools=task.agent.tools)
+        finally:
+            self.timings[name] = StageTiming(name, started, time.time())
+            emit("stage", {
+                "name": name,
+                "status": "finished",
+                "duration": round(self.timings[name].duration, 2),
+            })
+
+    def run(self) -> dict:
+        """
+        Execute all tasks respecting their dependencies
+
+        Returns:
+            Mapping of stage name to its TaskOutput (or FunctionOutput /
+            SkippedOutput), function stages first, then tasks in declaration order
+        """
+        outputs = {}
+        pending = dict(self.dependencies)
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready = [name for name, deps in pending.items() if all(d in outputs for d in deps)]
+                while ready:
+                    for name in ready:
+                        del pending[name]
+                        condition = self.skip_conditions.get(name)
+                        skipped = condition(dict(outputs)) if condition else None
+                        if skipped is not None:
+                            outputs[name] = skipped
+                            self.skipped[name] = skipped.reason
+                            emit("stage", {"name": name, "status": "skipped", "reason": skipped.reason})
+                            continue
+
+                        context = ""
+                        if name in self.tasks:
+                            parts = [outputs[dep].raw for dep in self.dependencies[name]]
+                            builder = self.context_builders.get(name)
+                            extra_context = builder(dict(outputs)) if builder else ""
+                            if extra_context:
+                                parts.append(extra_context)
+                            context = CONTEXT_DIVIDER.join(parts)
+                            task = self.tasks[name]
+                            self.input_tokens[name] = estimate_tokens(
+                                f"{task.description}\n{task.expected_output}\n{context}"
+                            )
+                        # Copy the caller's context so per-run state (event channel) follows the stage
+                        ctx = contextvars.copy_context()
+                        future = pool.submit(ctx.run, self._run_task, name, context)
+                        running[future] = name
+                    # Skipped stages may unblock their dependents right away
+                    ready = [name for name, deps in pending.items() if all(d in outputs for d in deps)]
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+        return {name: outputs[name] for name in self.names}
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """
+        Longest chain of dependent stages by measured duration
+
+        Returns:
+            Tuple of (stage names along the path, summed duration in seconds)
+        """
+        best: dict[str, tuple[list[str], float]] = {}
+
+        def longest(name: str) -> tuple[list[str], float]:
+            if name not in best:
+                duration = self.timings[name].duration if name in self.timings else 0.0
+                chains = [longest(dep) for dep in self.dependencies[name]]
+                path, total = max(chains, key=lambda c: c[1], default=([], 0.0))
+                best[name] = (path + [name], total + duration)
+            return best[name]
+
+        return max((longest(name) for name in self.names), key=lambda c: c[1], default=([], 0.0))
@@ -0,0 +1,220 @@
+"""Fast Mode - One Multimodal Gemini Call Instead of the Full Crew"""
+
+from typing import Optional
+import json
+import os
+import time
+import uuid
+
+from agents.registry import combined_rubric
+from crew.crew import NO_BRAND_GUIDELINES
+from crew.report import (
+    AdQualityReport,
+    ReportDraft,
+    ReportMetadata,
+    parse_report_draft,
+    weighted_score,
+)
+from tools.copy_metrics import analyze_copy, format_copy_metrics
+from tools.gemini_vision_tool import (
+    IMAGE_TOKENS,
+    generate_with_image,
+    response_text,
+    response_usage,
+    vision_model_name,
+)
+from tools.image_preprocessing import preprocess_image
+from tools.landing_page_fetcher import fetch_landing_page, fetch_summary
+from tools.page_condenser import CondensedPage, get_token_budget
+from tools.visual_metrics import compute_visual_metrics, format_visual_metrics
+from utils.artifacts import read_source_bytes
+from utils.events import emit
+from utils.llm_config import estimate_cost
+from utils.metrics import metrics
+from utils.tokens import estimate_tokens
+
+
+# Agents whose expertise is merged into the single-call rubric
+FAST_MODE_AGENTS = [
+    "ad_visual_analyst",
+    "copywriting_expert",
+    "brand_consistency_agent",
+    "quality_rating_synthesizer",
+]
+
+# Landing page text beyond this is cut off when no condensed page is available
+MAX_LANDING_PAGE_CHARS = int(os.getenv("FAST_MODE_MAX_LP_CHARS", "12000"))
+
+
+class FastAdQualityRater:
+    """
+    Single-call alternative to AdQualityRaterCrew for interactive previews
+
+    The landing page is scraped up front, then the ad image, the page text,
+    the measured metrics and the brand guidelines go to Gemini in one request
+    with a rubric built from the crew's agent backstories. The report has the
+    same shape as the crew's, with less depth. Its reports are not cached,
+    so force_refresh is accepted for API symmetry only.
+    """
+
+    def __init__(
+        self,
+        ad_url: str,
+        landing_page_url: str,
+        brand_guidelines: Optional[dict] = None,
+        target_audience: Optional[str] = None,
+        campaign_goal: Optional[str] = None,
+        ad_text: Optional[str] = None,
+        force_refresh: bool = False,
+    ):
+        self.ad_url = ad_url
+        self.landing_page_url = landing_page_url
+        self.brand_guidelines = brand_guidelines or {}
+        self.target_audience = target_audience or "Allgemeine Zielgruppe"
+        self.campaign_goal = campaign_goal or "Allgemeine Kampagne"
+        self.ad_text = ad_text
+        self.report_id = str(uuid.uuid4())
+        self.start_time = None
+        self.visual_metrics: Optional[dict] = None
+        self.token_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        self.timings: dict[str, float] = {}
+
+    def _build_prompt(self, page: dict) -> str:
+        """Combined rubric, inputs and report schema in one prompt"""
+        if page.get("page"):
+            condensed = CondensedPage(**page["page"])
+            landing_page_content = condensed.to_text(get_token_budget())
+            landing_page_text = condensed.copy_text()
+        else:
+            landing_page_text = page.get("text") or ""
+            landing_page_content = landing_page_text[:MAX_LANDING_PAGE_CHARS]
+
+        if self.brand_guidelines:
+            brand = json.dumps(self.brand_guidelines, ensure_ascii=False, indent=2)
+        else:
+            brand = f"{NO_BRAND_GUIDELINES} Set brand to null."
+
+        copy_metrics = format_copy_metrics(
+            analyze_copy(landing_page_text) if landing_page_text else None,
+            analyze_copy(self.ad_text, ad=True) if self.ad_text else None,
+        )
+        measured_visuals = format_visual_metrics(self.visual_metrics) if self.visual_metrics else "n/a"
+
+        return f"""You are a team of B2B LinkedIn ad experts reviewing the attached ad image.
+Apply ALL of the following expert rubrics, then write ONE report.
+
+{combined_rubric(FAST_MODE_AGENTS)}
+
+=== INPUTS ===
+**Target Audience:** {self.target_audience}
+**Campaign Goal:** {self.campaign_goal}
+**Ad Copy:** {self.ad_text or "n/a (judge the text in the image)"}
+
+**Measured Visual Metrics (exact - do not re-estimate):**
+{measured_visuals}
+
+{copy_metrics}
+
+**Brand Guidelines:**
+{brand}
+
+**Landing Page ({self.landing_page_url}):**
+{landing_page_content or "n/a - the landing page could not be scraped; skip the Ad→LP consistency check."}
+
+=== OUTPUT ===
+Return ONE JSON object matching this JSON schema:
+
+{json.dumps(ReportDraft.model_json_schema(), ensure_ascii=False)}
+
+**RULES:**
+- BRIEF: One sentence per finding, max 4 findings per section
+- ACTIONABLE: Every critique includes a concrete fix
+- FOCUS: Only TOP 2 recommendations for highest impact, with ready-to-use text
+- LANGUAGE: Detect the language of the ad and write all texts in that SAME LANGUAGE"""
+
+    def _generate(self, prompt: str, image_part: dict) -> ReportDraft:
+        """
+        One JSON-mode Gemini call through the completion cache and rate limiter
+
+        API errors (429, 5xx) are retried by the limiter; an answer that is
+        not a valid report is asked for once more.
+        """
+        model_name = vision_model_name()
+        max_attempts = 2
+
+        for attempt in range(max_attempts):
+            response = generate_with_image(
+                prompt,
+                image_part,
+                {"temperature": 0.3, "max_output_tokens": 4096, "response_mime_type": "application/json"},
+                estimated_tokens=estimate_tokens(prompt) + IMAGE_TOKENS + 1500,
+                source="fast_mode",
+            )
+            usage = response_usage(response)
+            for key in self.token_usage:
+                self.token_usage[key] += usage[key]
+            emit("llm_usage", {"source": "fast_mode", "model": model_name, **usage})
+
+            try:
+                answer = response_text(response)
+                if not answer:
+                    raise ValueError("Gemini returned an empty report")
+                return parse_report_draft(answer)
+            except ValueError as e:
+                emit("log", f"⚠️ Gemini attempt {attempt + 1} failed: {str(e)[:200]}")
+                if attempt == max_attempts - 1:
+                    raise
+
+    def kickoff(self) -> AdQualityReport:
+        """
+        Run the fast analysis
+
+        Returns:
+            Structured report, same model as AdQualityRaterCrew.kickoff()
+        """
+        self.start_time = time.time()
+
+        image_bytes = read_source_bytes(self.ad_url)
+        self.visual_metrics = compute_visual_metrics(image_bytes)
+
+        emit("stage", {"name": "scrape_lp", "status": "started"})
+        started = time.time()
+        page = fetch_landing_page(self.landing_page_url)
+        self.timings["scrape_lp"] = time.time() - started
+        emit("stage", {"name": "scrape_lp", "status": "finished", "duration": round(self.timings["scrape_lp"], 2)})
+
+        image = preprocess_image(image_bytes)
+        image_part = {"mime_type": image.mime_type, "data": image.data}
+
+        emit("stage", {"name": "fast_report", "status": "started"})
+        started = time.time()
+        draft = self._generate(self._build_prompt(page), image_part)
+        self.timings["fast_report"] = time.time() - started
+        emit("stage", {"name": "fast_report", "status": "finished", "duration": round(self.timings["fast_report"], 2)})
+
+        if not self.brand_guidelines:
+            draft.brand = None
+        overall_score = weighted_score(draft)
+        if overall_score is None:
+            overall_score = draft.overall_score
+
+        processing_time = time.time() - self.start_time
+        total_tokens = sum(self.token_usage.values())
+        cost = estimate_cost(**self.token_usage)
+        metrics.observe("analysis.fast.seconds", processing_time)
+        metrics.observe("analysis.fast.tokens", total_tokens)
+        metrics.observe("analysis.fast.cost_usd", cost)
+
+        return AdQualityReport(
+            **draft.model_dump(exclude={"overall_score"}),
+            overall_score=overall_score,
+            metadata=ReportMetadata(
+                report_id=self.report_id,
+                mode="fast",
+                processing_seconds=round(processing_time, 2),
+                landing_page_fetch=fetch_summary(page),
+                token_usage=self.token_usage,
+                cost_usd=round(cost, 6),
+                visual_metrics=self.visual_metrics,
+            ),
+        )
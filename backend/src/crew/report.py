@@ -0,0 +1,190 @@
+"""Structured Ad Quality Report Model and Markdown Rendering"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field, ValidationError, field_validator
+import json
+import re
+
+from tools.visual_metrics import format_visual_metrics
+
+
+# Weights of the overall score (brand only counts when guidelines exist)
+SCORE_WEIGHTS = {"visual": 0.4, "copywriting": 0.5, "brand": 0.1}
+
+# Recommendations kept per report (highest impact first)
+MAX_RECOMMENDATIONS = 2
+
+
+class SectionReport(BaseModel):
+    """Score and findings of one analysis area"""
+
+    score: Optional[int] = Field(None, ge=0, le=100, description="Score 0-100, null if not assessed")
+    findings: list[str] = Field(default_factory=list, description="Short, specific observations (max 4)")
+    improvement: Optional[str] = Field(
+        None, description='Specific improvement suggestion, null if "Good as is"'
+    )
+
+
+class Recommendation(BaseModel):
+    """One prioritized, ready-to-use improvement"""
+
+    area: str = Field(description='What to change, e.g. "Headline" or "CTA"')
+    current: Optional[str] = Field(None, description="Current text or element")
+    suggested: str = Field(description="Ready-to-use replacement text")
+    expected_impact: Optional[str] = Field(None, description='Expected impact, e.g. "+15% CTR"')
+
+
+class ReportDraft(BaseModel):
+    """Report fields filled by the LLM"""
+
+    language: str = Field(description="Language of the ad and of all texts in this report, e.g. 'de' or 'en'")
+    overall_score: Optional[int] = Field(
+        None, ge=0, le=100, description="Weighted score: Visual 40%, Copy 50%, Brand 10%"
+    )
+    assessment: str = Field(description="Good / Needs Improvement / Poor (in the report language)")
+    visual: SectionReport
+    copywriting: SectionReport
+    brand: Optional[SectionReport] = Field(None, description="null if no brand guidelines were provided")
+    recommendations: list[Recommendation] = Field(
+        default_factory=list, description="TOP 2 improvements, highest impact first"
+    )
+
+    @field_validator("recommendations")
+    @classmethod
+    def _keep_top_recommendations(cls, value: list[Recommendation]) -> list[Recommendation]:
+        return value[:MAX_RECOMMENDATIONS]
+
+
+class ReportMetadata(BaseModel):
+    """Run information attached to a report"""
+
+    report_id: str
+    mode: str = "full"
+    created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    processing_seconds: float = 0.0
+    critical_path: list[str] = Field(default_factory=list)
+    critical_path_seconds: Optional[float] = None
+    skipped_stages: dict[str, str] = Field(default_factory=dict)
+    stage_input_tokens: dict[str, dict[str, int]] = Field(default_factory=dict)
+    landing_page_fetch: Optional[dict] = None
+    token_usage: dict[str, int] = Field(default_factory=dict)
+    cost_usd: Optional[float] = None
+    visual_metrics: Optional[dict] = None
+    report_cache: Optional[str] = None
+    cached_report_id: Optional[str] = None
+
+
+class AdQualityReport(ReportDraft):
+    """Complete report: LLM findings plus run metadata"""
+
+    metadata: ReportMetadata
+
+
+def weighted_score(draft: ReportDraft) -> Optional[int]:
+    """Overall score from the section scores (weights renormalized over scored sections)"""
+    sections = {"visual": draft.visual, "copywriting": draft.copywriting, "brand": draft.brand}
+    scored = {
+        name: section.score for name, section in sections.items()
+        if section is not None and section.score is not None
+    }
+    if not scored:
+        return None
+    total_weight = sum(SCORE_WEIGHTS[name] for name in scored)
+    return round(sum(SCORE_WEIGHTS[name] * score for name, score in scored.items()) / total_weight)
+
+
+def parse_report_draft(text: str) -> ReportDraft:
+    """
+    Parse LLM output into a ReportDraft
+
+    Accepts bare JSON as well as JSON wrapped in a markdown code fence or
+    surrounded by prose.
+
+    Raises:
+        ValueError: If no valid report JSON is found
+    """
+    candidate = (text or "").strip()
+    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", candidate, re.DOTALL)
+    if fenced:
+        candidate = fenced.group(1)
+    elif not candidate.startswith("{"):
+        start, end = candidate.find("{"), candidate.rfind("}")
+        if start != -1 and end > start:
+            candidate = candidate[start:end + 1]
+
+    try:
+        return ReportDraft.model_validate(json.loads(candidate))
+    except (json.JSONDecodeError, ValidationError) as e:
+        raise ValueError(f"LLM output is not a valid report: {str(e)[:300]}") from e
+
+
+def _render_section(title: str, section: Optional[SectionReport], empty: str) -> str:
+    if section is None:
+        return f"## {title}\n- {empty}"
+    lines = [f"## {title}"]
+    if section.score is not None:
+        lines.append(f"- Score: {section.score}/100")
+    lines.extend(f"- {finding}" for finding in section.findings)
+    lines.append(f"- **Improvement:** {section.improvement or 'Good as is'}")
+    return "\n".join(lines)
+
+
+def render_markdown(report: AdQualityReport) -> str:
+    """Render a report as the markdown shown in the UI"""
+    meta = report.metadata
+    score = f"{report.overall_score}/100" if report.overall_score is not None else "n/a"
+    parts = [
+        "# 📊 Ad Performance Analysis",
+        f"**Score:** {score} (Visual 40%, Copy 50%, Brand 10%)\n**Assessment:** {report.assessment}",
+        "---",
+        _render_section("🎨 Visual", report.visual, "Not assessed"),
+        _render_section("✍️ Copy", report.copywriting, "Not assessed"),
+        _render_section("🎯 Brand", report.brand, "No brand guidelines provided."),
+    ]
+
+    if report.recommendations:
+        improvements = ["## 🔥 TOP 2 IMPROVEMENTS"]
+        for i, rec in enumerate(report.recommendations, start=1):
+            block = [f"**{i}. {rec.area}**"]
+            if rec.current:
+                block.append(f'❌ Current: "{rec.current}"')
+            block.append(f'✅ Suggested: "{rec.suggested}"')
+            if rec.expected_impact:
+                block.append(f"Expected Impact: {rec.expected_impact}")
+            improvements.append("\n".join(block))
+        parts.append("\n\n".join(improvements))
+
+    footer = [f"**⏱️ Verarbeitungszeit:** {meta.processing_seconds:.1f} Sekunden"]
+    if meta.mode == "fast":
+        footer.append("**⚡ Modus:** Fast (1 Gemini-Aufruf statt Crew)")
+    if meta.report_cache == "hit":
+        footer.append(f"**♻️ Cache:** Report aus dem Cache (ursprünglich {meta.cached_report_id})")
+    if meta.token_usage:
+        cost = f" (~${meta.cost_usd:.4f})" if meta.cost_usd is not None else ""
+        footer.append(f"**💰 LLM-Nutzung:** {sum(meta.token_usage.values())} Tokens{cost}")
+    if meta.landing_page_fetch and meta.landing_page_fetch.get("tier"):
+        fetch = meta.landing_page_fetch
+        tiers = ", ".join(f"{tier} {seconds:.2f} s" for tier, seconds in fetch.get("tier_seconds", {}).items())
+        footer.append(f"**🌐 Landingpage:** {fetch['tier']} ({tiers}; Cache: {fetch.get('cache', 'n/a')})")
+    if meta.critical_path:
+        footer.append(
+            f"**🧭 Kritischer Pfad:** {' → '.join(meta.critical_path)} "
+            f"({meta.critical_path_seconds or 0:.1f} Sekunden)"
+        )
+    if meta.stage_input_tokens:
+        stages = ", ".join(
+            f"{name} {counts['condensed']}"
+            + (f" (statt {counts['uncondensed']})" if counts["uncondensed"] != counts["condensed"] else "")
+            for name, counts in meta.stage_input_tokens.items()
+        )
+        footer.append(f"**📉 Input-Tokens je Stufe:** {stages}")
+    if meta.skipped_stages:
+        skipped = "; ".join(f"{name} ({reason})" for name, reason in meta.skipped_stages.items())
+        footer.append(f"**⏭️ Übersprungene Stufen:** {skipped}")
+    if meta.visual_metrics:
+        footer.append(f"**📐 Gemessene Visual-Metriken:**\n{format_visual_metrics(meta.visual_metrics)}")
+
+    parts.append("---")
+    parts.extend(footer)
+    return "\n\n".join(parts)
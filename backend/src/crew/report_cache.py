@@ -0,0 +1,131 @@
+"""End-to-End Cache of Full Crew Reports"""
+
+from functools import lru_cache
+from typing import Optional
+import hashlib
+import json
+import os
+import threading
+
+from tools.gemini_vision_tool import vision_model_name
+from tools.image_preprocessing import preprocessing_fingerprint
+from tools.page_condenser import get_token_budget
+from utils.cache import TTLCache
+from utils.llm_config import AGENT_MODEL
+
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Files whose text or output ends up in a prompt or the report schema;
+# editing any of them changes the fingerprint and thereby every report cache key
+PROMPT_SOURCES = (
+    "agents",
+    os.path.join("crew", "crew.py"),
+    os.path.join("crew", "report.py"),
+    os.path.join("tools", "gemini_vision_tool.py"),
+    os.path.join("tools", "copy_metrics.py"),
+    os.path.join("tools", "visual_metrics.py"),
+    os.path.join("tools", "page_condenser.py"),
+)
+
+
+@lru_cache(maxsize=1)
+def prompt_fingerprint() -> str:
+    """Hash over the agent, task and vision prompt sources (computed once per process)"""
+    paths = []
+    for source in PROMPT_SOURCES:
+        path = os.path.join(SRC_DIR, source)
+        if os.path.isdir(path):
+            paths.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".py")
+            )
+        else:
+            paths.append(path)
+
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, SRC_DIR).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def landing_page_hash(fetch_result: dict) -> str:
+    """
+    Hash of the extracted landing page content (condensed page, else plain text)
+
+    The condensed page's URL is left out: it is whichever URL (tracking
+    parameters included) happened to fill the landing page cache first.
+    """
+    page = fetch_result.get("page")
+    if page:
+        content = {name: value for name, value in page.items() if name != "url"}
+    else:
+        content = fetch_result.get("text") or ""
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def analysis_input_hash(
+    image_bytes: bytes,
+    brand_guidelines: Optional[dict],
+    target_audience: Optional[str],
+    campaign_goal: Optional[str],
+    ad_text: Optional[str],
+) -> str:
+    """
+    Hash of everything in a report cache key except the landing page
+
+    Combines what the crew reads up front (image, guidelines, audience, goal,
+    ad copy) with what shapes its answer: model names, prompt fingerprint,
+    image preprocessing and landing page token budget. Computed before the
+    run starts, so only the landing page is added once it has been fetched.
+    """
+    return hashlib.sha256(json.dumps({
+        "image": hashlib.sha256(image_bytes).hexdigest(),
+        "brand_guidelines": brand_guidelines or {},
+        "target_audience": target_audience or "",
+        "campaign_goal": campaign_goal or "",
+        "ad_text": ad_text or "",
+        "models": {"agents": AGENT_MODEL, "vision": vision_model_name()},
+        "prompts": prompt_fingerprint(),
+        "settings": f"{preprocessing_fingerprint()}:{get_token_budget()}",
+    }, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def report_cache_key(input_hash: str, landing_page: dict) -> str:
+    """Key of a full crew report: analysis input hash plus extracted landing page"""
+    return hashlib.sha256(f"{input_hash}:{landing_page_hash(landing_page)}".encode()).hexdigest()
+
+
+def input_index_key(input_hash: str) -> str:
+    """
+    Report cache entry pointing from an analysis input to its latest report key
+
+    Lets a run see before the landing page is fetched whether a cached report
+    may exist, so it can hold back the vision stage until the lookup is done.
+    """
+    return f"input:{input_hash}"
+
+
+def report_cache_enabled() -> bool:
+    return os.getenv("REPORT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+_report_cache: Optional[TTLCache] = None
+_report_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> TTLCache:
+    """Get or create the process-wide cache of full crew reports"""
+    global _report_cache
+    with _report_cache_lock:
+        if _report_cache is None:
+            _report_cache = TTLCache(
+                "report",
+                ttl=float(os.getenv("REPORT_CACHE_TTL", str(24 * 3600))),
+                max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "200")),
+                disk_dir=os.getenv("REPORT_CACHE_DIR", ".cache/reports") or None,
+            )
+        return _report_cache
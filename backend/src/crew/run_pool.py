@@ -0,0 +1,149 @@
+"""Bounded Execution Pool for Crew Runs with Admission Control"""
+
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import math
+import os
+import threading
+import time
+
+from utils.metrics import metrics
+
+
+class QueueFullError(Exception):
+    """Raised when the crew pool cannot accept another run"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Crew queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Ticket:
+    fn: Callable[[], Any]
+    future: Future
+    submitted: float
+    on_position: Optional[Callable[[int], None]] = None
+
+    def notify(self, position: int):
+        if self.on_position is not None:
+            try:
+                self.on_position(position)
+            except Exception:
+                pass
+
+
+class CrewRunPool:
+    """
+    Fixed number of crew workers in front of a bounded FIFO queue
+
+    Runs beyond ``max_workers + max_queue`` are rejected immediately with
+    QueueFullError (carrying a Retry-After estimate) instead of piling up
+    browsers and Gemini calls. Waiting callers are told their queue position
+    (1 = next) whenever it changes, and 0 once their run starts.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 20):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._waiting: deque[_Ticket] = deque()
+        self._cond = threading.Condition()
+        self._running = 0
+        self._avg_run_seconds = 60.0
+        self._workers: list[threading.Thread] = []
+
+    def _ensure_workers(self):
+        if not self._workers:
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker, name=f"crew-run-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _update_gauges(self):
+        metrics.set_gauge("crew_pool.running", self._running)
+        metrics.set_gauge("crew_pool.queued", len(self._waiting))
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, for the Retry-After header"""
+        waves = math.ceil((len(self._waiting) + 1) / self.max_workers)
+        return max(1, int(self._avg_run_seconds * waves))
+
+    def submit(self, fn: Callable[[], Any], on_position: Optional[Callable[[int], None]] = None) -> Future:
+        """
+        Queue fn for execution
+
+        Args:
+            fn: Crew run to execute on a pool worker
+            on_position: Called with the queue position whenever it changes
+
+        Returns:
+            Future resolving to fn's return value
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full
+        """
+        future: Future = Future()
+        ticket = _Ticket(fn, future, time.time(), on_position)
+
+        with self._cond:
+            if self._running + len(self._waiting) >= self.max_workers + self.max_queue:
+                metrics.incr("crew_pool.rejected")
+                raise QueueFullError(self.retry_after())
+
+            self._ensure_workers()
+            self._waiting.append(ticket)
+            position = len(self._waiting)
+            busy = self._running
+            self._update_gauges()
+            self._cond.notify()
+
+        if busy >= self.max_workers:
+            ticket.notify(position)
+        return future
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._waiting:
+                    self._cond.wait()
+                ticket = self._waiting.popleft()
+                self._running += 1
+                remaining = list(self._waiting)
+                self._update_gauges()
+
+            metrics.observe("crew_pool.wait_seconds", time.time() - ticket.submitted)
+            for position, waiting in enumerate(remaining, start=1):
+                waiting.notify(position)
+
+            started = time.time()
+            if ticket.future.set_running_or_notify_cancel():
+                ticket.notify(0)
+                try:
+                    ticket.future.set_result(ticket.fn())
+                except Exception as e:
+                    ticket.future.set_exception(e)
+
+            duration = time.time() - started
+            metrics.observe("crew_pool.run_seconds", duration)
+            with self._cond:
+                self._running -= 1
+                self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * duration
+                self._update_gauges()
+
+
+_pool: Optional[CrewRunPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crew_pool() -> CrewRunPool:
+    """Get or create the process-wide crew run pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrewRunPool(
+                max_workers=int(os.getenv("CREW_MAX_CONCURRENT", "2")),
+                max_queue=int(os.getenv("CREW_QUEUE_SIZE", "20")),
+            )
+        return _pool
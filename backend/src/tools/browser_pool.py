@@ -0,0 +1,205 @@
+"""Process-wide Pool of Persistent Chromium Browsers (Async Playwright)"""
+
+from typing import Any, Awaitable, Callable, Optional
+from playwright.async_api import async_playwright
+import asyncio
+import os
+import threading
+import time
+
+from utils.async_loop import get_background_loop
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 720},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+
+
+class _PooledBrowser:
+    """A browser plus the number of jobs it served and is serving"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = 0
+        self.active = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """
+    Pool of long-lived Chromium instances
+
+    Browsers are driven through Playwright's async API on the process-wide
+    background event loop, so a scrape waiting on the network holds no OS
+    thread. Each browser serves up to ``max_concurrent_pages`` isolated
+    BrowserContexts at the same time; a job goes to the least busy browser
+    and its context is closed afterwards. Browsers are retired after
+    ``max_pages`` jobs or when they crash, and closed once their open
+    contexts are done.
+
+    Sync code calls run(); coroutines on the background loop await run_async().
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, max_concurrent_pages: int = 8):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_concurrent_pages = max_concurrent_pages
+        self._playwright = None
+        self._browsers: list[_PooledBrowser] = []
+        # Created lazily on the background loop (asyncio primitives are loop-bound)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._busy = 0
+        self._queued = 0
+        self._started = False
+
+    def start(self, wait: bool = True, timeout: float = 30.0):
+        """Start Playwright and (optionally) wait for the browsers to warm up"""
+        future = get_background_loop().submit(self._ensure_started())
+        if not wait:
+            return
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            logger.warning("Browser pool warm-up timed out", size=self.size)
+
+    def shutdown(self):
+        """Close all browsers and stop Playwright"""
+        get_background_loop().run(self._shutdown(), timeout=30)
+
+    def run(self, fn: Callable[[Any], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Execute fn(context) on a pooled browser and wait for its result
+
+        Args:
+            fn: Coroutine function receiving a fresh BrowserContext
+            timeout: Maximum seconds to wait for the result
+
+        Returns:
+            Whatever fn returns
+        """
+        return get_background_loop().run(self.run_async(fn), timeout=timeout)
+
+    async def run_async(self, fn: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Coroutine version of run(), for code already on the background loop"""
+        await self._ensure_started()
+
+        submitted = time.time()
+        self._queued += 1
+        metrics.set_gauge("browser_pool.queued", self._queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+            metrics.set_gauge("browser_pool.queued", self._queued)
+        metrics.observe("browser_pool.wait_seconds", time.time() - submitted)
+
+        entry = None
+        context = None
+        try:
+            entry = await self._pick_browser()
+            entry.active += 1
+            entry.pages += 1
+            self._set_busy(1)
+            context = await entry.browser.new_context(**CONTEXT_OPTIONS)
+            return await fn(context)
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            if entry is not None:
+                entry.active -= 1
+                self._set_busy(-1)
+                metrics.incr("browser_pool.pages")
+                if entry.retired and entry.active == 0:
+                    await self._close(entry)
+            self._slots.release()
+
+    def _set_busy(self, delta: int):
+        self._busy += delta
+        metrics.set_gauge("browser_pool.busy", self._busy)
+
+    async def _ensure_started(self):
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self._playwright = await async_playwright().start()
+            self._slots = asyncio.Semaphore(self.size * self.max_concurrent_pages)
+            await asyncio.gather(*(self._launch() for _ in range(self.size)))
+            self._started = True
+            metrics.set_gauge("browser_pool.size", self.size)
+
+    async def _launch(self) -> Optional[_PooledBrowser]:
+        try:
+            browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        except Exception as e:
+            logger.error("Browser launch failed", error=str(e))
+            return None
+        entry = _PooledBrowser(browser)
+        self._browsers.append(entry)
+        return entry
+
+    async def _close(self, entry: _PooledBrowser):
+        try:
+            await entry.browser.close()
+        except Exception:
+            pass
+
+    async def _pick_browser(self) -> _PooledBrowser:
+        """Least busy healthy browser; crashed and worn-out browsers are replaced first"""
+        for entry in list(self._browsers):
+            if not entry.browser.is_connected():
+                metrics.incr("browser_pool.crashes")
+                self._browsers.remove(entry)
+            elif entry.pages >= self.max_pages:
+                metrics.incr("browser_pool.recycled")
+                entry.retired = True
+                self._browsers.remove(entry)
+                if entry.active == 0:
+                    await self._close(entry)
+
+        async with self._start_lock:
+            while len(self._browsers) < self.size:
+                if await self._launch() is None:
+                    break
+
+        available = [entry for entry in self._browsers if entry.active < self.max_concurrent_pages]
+        if not available:
+            raise RuntimeError("Browser launch failed")
+        return min(available, key=lambda entry: entry.active)
+
+    async def _shutdown(self):
+        for entry in self._browsers:
+            await self._close(entry)
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._started = False
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the process-wide browser pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+                max_pages=int(os.getenv("BROWSER_MAX_PAGES", "50")),
+                max_concurrent_pages=int(os.getenv("BROWSER_MAX_CONCURRENT_PAGES", "8")),
+            )
+        return _pool
@@ -0,0 +1,200 @@
+"""Deterministic Copy Metrics for the Copywriting Expert"""
+
+from typing import Optional
+import re
+
+
+# LinkedIn best-practice limits (see copywriting expert backstory)
+HEADLINE_MAX_CHARS = 70
+INTRO_MAX_CHARS = 150
+
+# CTA phrases per funnel stage (DE + EN), matched case-insensitively
+CTA_LEXICON = {
+    "TOFU": [
+        "mehr erfahren", "jetzt lesen", "weiterlesen", "entdecken", "ansehen",
+        "learn more", "read more", "discover", "watch", "explore",
+    ],
+    "MOFU": [
+        "registrieren", "anmelden", "herunterladen", "download", "guide sichern",
+        "webinar", "whitepaper", "register", "sign up", "subscribe", "get the guide",
+    ],
+    "BOFU": [
+        "demo anfordern", "demo buchen", "termin buchen", "kostenlos testen",
+        "jetzt kaufen", "angebot anfordern", "kontakt aufnehmen", "request demo",
+        "book a demo", "start free trial", "free trial", "get started", "buy now",
+        "contact sales", "get a quote",
+    ],
+}
+
+# Whole-word matching: "order" must not match "border"
+CTA_PATTERNS = {
+    stage: [(phrase, re.compile(rf"\b{re.escape(phrase)}\b")) for phrase in phrases]
+    for stage, phrases in CTA_LEXICON.items()
+}
+ANY_CTA_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for phrases in CTA_LEXICON.values() for p in phrases) + r")\b",
+    re.IGNORECASE,
+)
+
+PAIN_WORDS = [
+    "problem", "verschwenden", "verlieren", "kostet", "scheitern", "frust", "risiko",
+    "waste", "lose", "losing", "struggle", "fail", "costly", "risk", "pain",
+]
+
+STOPWORDS = {
+    "de": {
+        "der", "die", "das", "und", "ist", "nicht", "mit", "für", "sie",
+        "ihr", "wir", "auf", "ein", "eine", "mehr", "wie", "diese",
+    },
+    "en": {
+        "the", "and", "is", "not", "with", "for", "you", "your", "we",
+        "on", "a", "an", "to", "of", "more", "how", "this",
+    },
+}
+
+NUMBER_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9])(?:[$€£]\s?)?\d+(?:[.,]\d+)*\s?"
+    r"(?:%|x\b|k\b|mio\.?|million|tage[n]?|days?|wochen|weeks?|minuten|minutes?|€|eur|usd)?",
+    re.IGNORECASE,
+)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD_PATTERN = re.compile(r"[A-Za-zÄÖÜäöüß]+")
+PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+
+
+def detect_language(text: str) -> str:
+    """'de' or 'en' by stopword frequency ('unknown' if neither shows up)"""
+    words = [w.lower() for w in WORD_PATTERN.findall(text)]
+    scores = {lang: sum(w in stop for w in words) for lang, stop in STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else "unknown"
+
+
+def find_cta_phrases(text: str) -> dict[str, list[str]]:
+    """CTA lexicon phrases contained in text as whole words, per funnel stage"""
+    lowered = (text or "").lower()
+    return {
+        stage: [phrase for phrase, pattern in patterns if pattern.search(lowered)]
+        for stage, patterns in CTA_PATTERNS.items()
+    }
+
+
+def split_ad_copy(text: str) -> tuple[str, Optional[str]]:
+    """
+    Intro and headline of ad copy in the ad_text format
+
+    ad_text follows the LinkedIn layout: the intro (may span several
+    paragraphs), a blank line, then the headline as the last paragraph.
+    Without a blank line the whole text is the intro and the headline is
+    unknown (None).
+    """
+    paragraphs = [p.strip() for p in PARAGRAPH_SPLIT.split((text or "").strip()) if p.strip()]
+    if len(paragraphs) < 2:
+        return (paragraphs[0] if paragraphs else ""), None
+    return "\n\n".join(paragraphs[:-1]), paragraphs[-1]
+
+
+def analyze_copy(text: str, ad: bool = False) -> dict:
+    """
+    Exact copy metrics for a text
+
+    Args:
+        text: Ad copy (ad=True, see split_ad_copy) or landing page copy
+        ad: Parse text as ad copy; otherwise the first non-empty line is the
+            page headline and the first paragraph the intro
+
+    Returns:
+        Metrics dict; headline fields are None when ad copy has no headline
+    """
+    text = (text or "").strip()
+    if ad:
+        intro, headline = split_ad_copy(text)
+    else:
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        paragraphs = [p.strip() for p in PARAGRAPH_SPLIT.split(text) if p.strip()]
+        headline = lines[0] if lines else ""
+        intro = paragraphs[0] if paragraphs else ""
+
+    sentences = [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
+    sentence_words = [len(WORD_PATTERN.findall(s)) for s in sentences]
+    lowered = text.lower()
+
+    numbers = [m.group(0).strip() for m in NUMBER_PATTERN.finditer(text)]
+    ctas = find_cta_phrases(text)
+    pain_hits = [word for word in PAIN_WORDS if re.search(rf"\b{word}", lowered)]
+    questions = sum(1 for s in sentences if s.endswith("?"))
+
+    return {
+        "language": detect_language(text),
+        "chars": len(text),
+        "words": len(WORD_PATTERN.findall(text)),
+        "headline": headline[:120] if headline is not None else None,
+        "headline_chars": len(headline) if headline is not None else None,
+        "headline_within_limit": len(headline) <= HEADLINE_MAX_CHARS if headline is not None else None,
+        "intro_chars": len(intro),
+        "intro_within_limit": len(intro) <= INTRO_MAX_CHARS,
+        "sentences": len(sentences),
+        "avg_sentence_words": round(sum(sentence_words) / len(sentence_words), 1) if sentences else 0.0,
+        "max_sentence_words": max(sentence_words, default=0),
+        "questions": questions,
+        "numbers": numbers[:10],
+        "specificity": len(numbers),
+        "cta_phrases": {stage: found for stage, found in ctas.items() if found},
+        "pain_signals": pain_hits,
+        "pio": {
+            "pain": bool(pain_hits) or questions > 0,
+            "impact": bool(numbers),
+            "offer": any(ctas.values()),
+        },
+    }
+
+
+def _format_one(label: str, metrics: dict, ad_limits: bool) -> str:
+    ctas = "; ".join(
+        f"{stage}: {', '.join(found)}" for stage, found in metrics["cta_phrases"].items()
+    ) or "none"
+    pio = ", ".join(f"{part}={'yes' if present else 'no'}" for part, present in metrics["pio"].items())
+    if ad_limits:
+        if metrics["headline"] is None:
+            headline = "- Headline: not supplied (judge the headline in the ad image)\n"
+        else:
+            headline = (
+                f"- Headline: {metrics['headline_chars']} chars "
+                f"({'OK' if metrics['headline_within_limit'] else 'over'} {HEADLINE_MAX_CHARS}) "
+                f"\"{metrics['headline'][:70]}\"\n"
+            )
+        length = headline + (
+            f"- Intro: {metrics['intro_chars']} chars "
+            f"({'OK' if metrics['intro_within_limit'] else 'over'} {INTRO_MAX_CHARS})\n"
+        )
+    else:
+        # The LinkedIn ad limits do not apply to page copy
+        length = (
+            f"- Page headline (first line): {metrics['headline_chars']} chars \"{metrics['headline'][:70]}\"\n"
+            f"- First paragraph: {metrics['intro_chars']} chars\n"
+        )
+    header = f"{label} ({metrics['language']}, {metrics['chars']} chars, {metrics['words']} words):\n"
+    return header + length + (
+        f"- Sentences: {metrics['sentences']}, avg {metrics['avg_sentence_words']} words, "
+        f"longest {metrics['max_sentence_words']}, questions {metrics['questions']}\n"
+        f"- Numbers/specifics ({metrics['specificity']}): {', '.join(metrics['numbers']) or 'none'}\n"
+        f"- CTA phrases: {ctas}\n"
+        f"- PIO signals: {pio}"
+    )
+
+
+def format_copy_metrics(landing_page: Optional[dict], ad: Optional[dict] = None) -> str:
+    """
+    Compact metrics block handed to the copywriting agent
+
+    The LinkedIn headline / intro limits are only checked for the ad copy
+    (the ad_text form field); landing page metrics are labelled as such.
+    """
+    blocks = []
+    if ad:
+        blocks.append(_format_one("Ad copy", ad, ad_limits=True))
+    if landing_page:
+        blocks.append(_format_one("Landing page copy (not the ad)", landing_page, ad_limits=False))
+    if not blocks:
+        return ""
+    return "MEASURED COPY METRICS (exact - use these values, do not recount):\n" + "\n".join(blocks)
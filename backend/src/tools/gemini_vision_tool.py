@@ -1,6 +1,7 @@
 """Gemini Vision Tool for Ad Image Analysis"""
 
 from crewai.tools import tool
+from dataclasses import dataclass
 from typing import Optional, Any
 import google.generativeai as genai
 from google.generativeai import types
@@ -8,39 +9,182 @@ import requests
 import os
 import base64
 import re
-import time
+import hashlib
+import threading
+
+from tools.image_preprocessing import preprocess_image, preprocessing_fingerprint
+from tools.visual_metrics import compute_visual_metrics, format_visual_metrics
+from utils.artifacts import get_artifact_store, is_artifact
+from utils.cache import TTLCache
+from utils.events import emit
+from utils.llm_cache import LLMCacheMissError, completion_key, get_llm_cache
+from utils.logger import logger
+from utils.metrics import metrics
+from utils.rate_limiter import get_rate_limiter
+from utils.tokens import estimate_tokens
+
+
+# Token reservation per vision call: normalized image (up to four 768px tiles) and answer
+IMAGE_TOKENS = 1032
+EXPECTED_OUTPUT_TOKENS = 500
+
+_vision_cache: Optional[TTLCache] = None
+_vision_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> TTLCache:
+    """Get or create the process-wide cache of vision analyses"""
+    global _vision_cache
+    with _vision_cache_lock:
+        if _vision_cache is None:
+            _vision_cache = TTLCache(
+                "vision",
+                ttl=float(os.getenv("VISION_CACHE_TTL", str(7 * 24 * 3600))),
+                max_entries=int(os.getenv("VISION_CACHE_MAX_ENTRIES", "500")),
+                disk_dir=os.getenv("VISION_CACHE_DIR", ".cache/vision") or None,
+            )
+        return _vision_cache
+
+
+def vision_cache_key(image_bytes: bytes, prompt: str, model_name: str, variant: str = "") -> str:
+    """Content-addressed key: same creative + prompt + model (+ variant) = same analysis"""
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    prompt_hash = hashlib.sha256(f"{prompt}|{variant}".encode()).hexdigest()
+    return f"{model_name}:{prompt_hash}:{image_hash}"
+
+
+# Shared Gemini clients, one per model name. genai.configure() resets the
+# SDK's cached transport, so it is only called when the API key changes;
+# afterwards every call reuses the same client and its open connection.
+_clients: dict[str, Any] = {}
+_configured_api_key: Optional[str] = None
+_client_lock = threading.Lock()
+
+
+def vision_model_name() -> str:
+    """Gemini model used for vision and fast mode calls (MODEL)"""
+    return os.getenv("MODEL", "gemini-2.5-flash")
 
 
-# Initialize Gemini client
 def get_gemini_client():
-    """Get or create Gemini client"""
+    """Get the shared Gemini client for the model configured in MODEL"""
+    global _configured_api_key
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
-    model_name = os.getenv("MODEL", "gemini-2.5-flash")
-    genai.configure(api_key=api_key)
-    client = genai.GenerativeModel(model_name)
+    model_name = vision_model_name()
+
+    with _client_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+            _clients.clear()
+
+        client = _clients.get(model_name)
+        if client is None:
+            client = genai.GenerativeModel(model_name)
+            _clients[model_name] = client
+            metrics.incr("gemini_client.created")
+        else:
+            metrics.incr("gemini_client.reused")
+
     return client, model_name
 
 
+def response_usage(response) -> dict:
+    """Prompt and completion token counts of a Gemini response (0 if unknown)"""
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "prompt_tokens": int(getattr(usage, "prompt_token_count", 0) or 0),
+        "completion_tokens": int(getattr(usage, "candidates_token_count", 0) or 0),
+    }
+
+
+@dataclass
+class CachedResponse:
+    """Gemini answer served from the completion cache (no usage, no candidates)"""
+
+    text: str
+    usage_metadata: Any = None
+    candidates: tuple = ()
+
+
+def response_text(response) -> Optional[str]:
+    """Answer text, or None if Gemini returned none (blocked or empty)"""
+    try:
+        return response.text or None
+    except ValueError:
+        return None
+
+
+def generate_with_image(
+    prompt: str,
+    image_part: dict,
+    generation_config: dict,
+    estimated_tokens: int,
+    source: str,
+):
+    """
+    One multimodal Gemini call through the completion cache and the rate limiter
+
+    The completion cache key is the model, the prompt, the image's content
+    hash and the generation config. The client is only built when Gemini is
+    actually called, so replay runs need no API key.
+
+    Returns:
+        Gemini response, or a CachedResponse when served from the cache
+
+    Raises:
+        LLMCacheMissError: In replay mode, if the call was never recorded
+    """
+    model_name = vision_model_name()
+    responses = []
+
+    def send():
+        client, _ = get_gemini_client()
+        response = get_rate_limiter().call(
+            lambda: client.generate_content(
+                contents=[prompt, image_part],
+                generation_config=genai.types.GenerationConfig(**generation_config),
+            ),
+            estimated_tokens=estimated_tokens,
+            usage=lambda r: sum(response_usage(r).values()),
+            source=source,
+        )
+        responses.append(response)
+        return response
+
+    cache = get_llm_cache()
+    if cache is None:
+        return send()
+
+    key = completion_key(
+        model_name,
+        [prompt, {"mime_type": image_part["mime_type"], "sha256": hashlib.sha256(image_part["data"]).hexdigest()}],
+        generation_config,
+    )
+    # Empty answers come back as None, so they are never stored
+    text = cache.call(key, model_name, lambda: response_text(send()))
+    return responses[0] if responses else CachedResponse(text)
+
+
 @tool("Gemini Vision Analyzer")
 def analyze_ad_image(image_url: str) -> dict:
     """Analyzes advertisement images using Gemini 2.5 Flash Vision.
 
     Args:
-        image_url: The URL or local file path to the ad image (required)
+        image_url: The URL, local file path or upload handle (artifact://...) of the ad image (required)
 
     Returns:
         JSON with 'success' (bool), 'analysis' (string), and 'image_source' (string)
         The analysis includes: colors, composition quality, emotional tone, CTA visibility, and brand elements.
 
     Example:
-        analyze_ad_image("/tmp/tmpX1Y2Z3.jpg")
+        analyze_ad_image("artifact://3f2a9c...")
     """
     prompt = None  # Always use default prompt
     try:
-        # Get Gemini client
-        client, model_name = get_gemini_client()
+        model_name = vision_model_name()
 
         # Use default prompt if none provided
         if not prompt:
@@ -79,34 +223,32 @@ MAX 6 sentences. Be clear and constructive."""
 
             final_bytes = base64.b64decode(base64_data)
 
+        elif is_artifact(image_url):
+            # Uploaded ad image, held in memory by the API
+            try:
+                artifact = get_artifact_store().get(image_url)
+            except KeyError:
+                return {
+                    "success": False,
+                    "error": "Uploaded image is no longer available",
+                    "image_source": display_source,
+                }
+            final_bytes = artifact.data
+            final_mime_type = artifact.mime_type
+            display_source = artifact.filename or display_source
+
         elif image_url.startswith(("http://", "https://")):
             # Fetch from URL
             response = requests.get(image_url, timeout=30)
             response.raise_for_status()
             final_bytes = response.content
-
-            # Detect MIME type from URL
-            final_mime_type = "image/jpeg"  # default
-            if image_url.lower().endswith('.png'):
-                final_mime_type = "image/png"
-            elif image_url.lower().endswith('.gif'):
-                final_mime_type = "image/gif"
-            elif image_url.lower().endswith('.webp'):
-                final_mime_type = "image/webp"
+            final_mime_type = (response.headers.get("Content-Type") or "").split(";")[0] or None
 
         else:
             # Local file
             with open(image_url, 'rb') as f:
                 final_bytes = f.read()
-
-            # Detect MIME type from file extension
-            final_mime_type = "image/jpeg"  # default
-            if image_url.lower().endswith('.png'):
-                final_mime_type = "image/png"
-            elif image_url.lower().endswith('.gif'):
-                final_mime_type = "image/gif"
-            elif image_url.lower().endswith('.webp'):
-                final_mime_type = "image/webp"
+            final_mime_type = None  # sniffed from magic bytes below
 
         # Validate image size (max 10MB for Gemini)
         MAX_IMAGE_SIZE = 10 * 1024 * 1024
@@ -117,75 +259,87 @@ MAX 6 sentences. Be clear and constructive."""
                 "image_source": display_source,
             }
 
+        # Repeat creatives skip the Gemini call entirely
+        cache = get_vision_cache()
+        cache_key = vision_cache_key(final_bytes, prompt, model_name, preprocessing_fingerprint())
+        cached = cache.get(cache_key)
+        if cached is not None:
+            emit("log", "🖼️ Vision analysis served from cache")
+            return {**cached, "image_source": display_source, "cached": True}
+
+        # Exact metrics are computed locally; Gemini only judges what needs a model
+        visual_metrics = compute_visual_metrics(final_bytes)
+        if visual_metrics:
+            prompt += (
+                "\n\nMEASURED METRICS (exact - use these values, do not estimate them yourself):\n"
+                + format_visual_metrics(visual_metrics)
+                + "\nItems 1-2 are answered by these measurements: restate them briefly and "
+                "use CTA contrast and text area as facts for the remaining items."
+            )
+
+        # Normalize before upload: real format, EXIF orientation, max edge, no metadata
+        image = preprocess_image(final_bytes, final_mime_type)
+        metrics.incr("vision.payload_bytes_original", image.original_bytes)
+        metrics.incr("vision.payload_bytes_sent", image.final_bytes)
+        emit("log", f"🖼️ Image payload: {image.original_bytes / 1024:.0f} KB → {image.final_bytes / 1024:.0f} KB")
+
         # Create Part from bytes (proper Gemini SDK method)
         # For google-generativeai package, we pass a dict for inline data
         image_part = {
-            "mime_type": final_mime_type,
-            "data": final_bytes
+            "mime_type": image.mime_type,
+            "data": image.data
         }
 
-        # Generate analysis with retry logic (up to 3 attempts)
-        max_retries = 3
-        last_error = None
-
-        for attempt in range(max_retries):
-            try:
-                response = client.generate_content(
-                    contents=[prompt, image_part],
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.1,
-                        max_output_tokens=4096,
-                    )
+        # Generate analysis through the shared limiter (429 / 5xx retries with backoff)
+        response = generate_with_image(
+            prompt,
+            image_part,
+            {"temperature": 0.1, "max_output_tokens": 4096},
+            estimated_tokens=estimate_tokens(prompt) + IMAGE_TOKENS + EXPECTED_OUTPUT_TOKENS,
+            source="vision",
+        )
+
+        analysis = response_text(response)
+        if analysis is None or not analysis.strip():
+            # Check for safety ratings or blocked content
+            candidates = getattr(response, "candidates", None)
+            if candidates and hasattr(candidates[0], "finish_reason"):
+                finish_reason = str(candidates[0].finish_reason)
+                logger.warning(
+                    "Gemini returned no vision analysis",
+                    finish_reason=finish_reason,
+                    safety_ratings=str(getattr(candidates[0], "safety_ratings", None)),
                 )
-
-                # Debug: Log response structure
-                print(f"[DEBUG] Gemini response received (attempt {attempt + 1})")
-                print(f"[DEBUG] Has candidates: {hasattr(response, 'candidates')}")
-
-                # Check if response has text
-                if not hasattr(response, 'text') or not response.text or response.text.strip() == "":
-                    # Check for safety ratings or blocked content
-                    if hasattr(response, 'candidates') and response.candidates:
-                        candidate = response.candidates[0]
-                        print(f"[DEBUG] Candidate finish_reason: {getattr(candidate, 'finish_reason', 'None')}")
-                        print(f"[DEBUG] Candidate safety_ratings: {getattr(candidate, 'safety_ratings', 'None')}")
-
-                        if hasattr(candidate, 'finish_reason'):
-                            finish_reason = str(candidate.finish_reason)
-                            return {
-                                "success": False,
-                                "error": f"Gemini could not analyze the image (reason: {finish_reason}). The image may have been blocked by safety filters. Please try a different image.",
-                                "image_source": display_source,
-                            }
-
-                    print(f"[DEBUG] Empty response, no finish_reason found")
-                    return {
-                        "success": False,
-                        "error": "Gemini could not create an analysis. The image might be too small, unclear, or blocked by filters. Please try a different image.",
-                        "image_source": display_source,
-                    }
-
-                print(f"[DEBUG] Success! Analysis length: {len(response.text)} chars")
                 return {
-                    "success": True,
-                    "analysis": response.text,
+                    "success": False,
+                    "error": f"Gemini could not analyze the image (reason: {finish_reason}). The image may have been blocked by safety filters. Please try a different image.",
                     "image_source": display_source,
                 }
 
-            except Exception as e:
-                last_error = e
-                print(f"[DEBUG] Attempt {attempt + 1} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    # Exponential backoff: 1s, 2s
-                    wait_time = 2 ** attempt
-                    print(f"[DEBUG] Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    # All retries failed
-                    print(f"[DEBUG] All retries failed. Last error: {str(e)}")
-                    raise
+            logger.warning("Gemini returned an empty vision analysis without finish_reason")
+            return {
+                "success": False,
+                "error": "Gemini could not create an analysis. The image might be too small, unclear, or blocked by filters. Please try a different image.",
+                "image_source": display_source,
+            }
+
+        emit("llm_usage", {"source": "vision", "model": model_name, **response_usage(response)})
+        emit("log", f"🎨 Vision analysis received ({len(analysis)} chars)")
+        cache.set(cache_key, {
+            "success": True,
+            "analysis": analysis,
+            "visual_metrics": visual_metrics,
+        })
+        return {
+            "success": True,
+            "analysis": analysis,
+            "visual_metrics": visual_metrics,
+            "image_source": display_source,
+            "payload_bytes": {"original": image.original_bytes, "sent": image.final_bytes},
+        }
 
+    except LLMCacheMissError:
+        raise  # replay runs must fail, not continue with an error result
     except requests.exceptions.RequestException as e:
         error_source = "[Image]"
         if image_url and not image_url.startswith("data:image"):
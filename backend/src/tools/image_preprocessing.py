@@ -0,0 +1,137 @@
+"""Image Preprocessing Before Gemini Vision Calls"""
+
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+from PIL import Image, ImageOps
+import os
+
+
+# Formats Gemini accepts inline
+SUPPORTED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/heic", "image/heif"}
+
+# Image.info keys of embedded metadata (EXIF incl. GPS, XMP, comments)
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp", "comment")
+
+# Pillow format name -> MIME type of the re-encoded output
+OUTPUT_FORMATS = {
+    "WEBP": "image/webp",
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+}
+
+
+def sniff_mime_type(data: bytes) -> Optional[str]:
+    """Detect the real image format from magic bytes (ignores file extensions)"""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:8] == b"ftyp" and data[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "image/heic"
+    return None
+
+
+@dataclass
+class PreprocessedImage:
+    """Image payload ready for Gemini, with before/after sizes"""
+
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    original_width: Optional[int] = None
+    original_height: Optional[int] = None
+
+    @property
+    def final_bytes(self) -> int:
+        return len(self.data)
+
+
+def preprocessing_fingerprint() -> str:
+    """Settings that influence the payload (part of the vision cache key)"""
+    return f"{_max_edge()}:{_output_format()}:{_quality()}"
+
+
+def _max_edge() -> int:
+    return int(os.getenv("VISION_MAX_EDGE", "1536"))
+
+
+def _output_format() -> str:
+    fmt = os.getenv("VISION_IMAGE_FORMAT", "WEBP").upper()
+    return fmt if fmt in OUTPUT_FORMATS else "WEBP"
+
+
+def _quality() -> int:
+    return int(os.getenv("VISION_IMAGE_QUALITY", "85"))
+
+
+def preprocess_image(data: bytes, declared_mime_type: Optional[str] = None) -> PreprocessedImage:
+    """
+    Normalize an ad image before it is sent to Gemini
+
+    Applies the EXIF orientation, downsizes to VISION_MAX_EDGE pixels on the
+    longest side and re-encodes to VISION_IMAGE_FORMAT without metadata.
+    The original bytes are only kept for an image without embedded metadata
+    that needed no resize or rotation and would not shrink by re-encoding,
+    so EXIF (including GPS positions) never leaves the server. Undecodable
+    input is passed through with its sniffed MIME type.
+    """
+    sniffed = sniff_mime_type(data) or declared_mime_type or "image/jpeg"
+
+    try:
+        with Image.open(BytesIO(data)) as opened:
+            original_size = opened.size
+            exif = opened.getexif()
+            rotated = exif.get(0x0112, 1) != 1  # EXIF Orientation
+            has_metadata = bool(exif) or any(key in opened.info for key in METADATA_KEYS)
+            icc_profile = opened.info.get("icc_profile")  # kept: colors shift without it
+            image = ImageOps.exif_transpose(opened)  # always returns a copy
+
+            max_edge = _max_edge()
+            resized = max(image.size) > max_edge
+            if resized:
+                image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+            fmt = _output_format()
+            has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+            if fmt == "JPEG" or not has_alpha:
+                image = image.convert("RGB")
+            else:
+                image = image.convert("RGBA")
+
+            buffer = BytesIO()
+            save_options = {"optimize": True} if fmt == "PNG" else {"quality": _quality()}
+            if icc_profile:
+                save_options["icc_profile"] = icc_profile
+            image.save(buffer, format=fmt, **save_options)
+            encoded = buffer.getvalue()
+
+    except Exception:
+        return PreprocessedImage(data=data, mime_type=sniffed, original_bytes=len(data))
+
+    if not resized and not rotated and not has_metadata and len(encoded) >= len(data) and sniffed in SUPPORTED_MIME_TYPES:
+        return PreprocessedImage(
+            data=data,
+            mime_type=sniffed,
+            original_bytes=len(data),
+            width=original_size[0],
+            height=original_size[1],
+            original_width=original_size[0],
+            original_height=original_size[1],
+        )
+
+    return PreprocessedImage(
+        data=encoded,
+        mime_type=OUTPUT_FORMATS[fmt],
+        original_bytes=len(data),
+        width=image.size[0],
+        height=image.size[1],
+        original_width=original_size[0],
+        original_height=original_size[1],
+    )
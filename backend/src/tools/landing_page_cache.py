@@ -0,0 +1,132 @@
+"""URL-Keyed Cache for Extracted Landing Page Content"""
+
+from typing import Callable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import os
+import threading
+import requests
+
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+# Tracking parameters that never change the page content
+TRACKING_PARAMS = {"gclid", "li_fat_id", "fbclid", "msclkid"}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical cache key for a landing page URL
+
+    Lower-cases scheme and host, drops the fragment and tracking parameters
+    (utm_*, gclid, li_fat_id, ...) and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(sorted(query)),
+        "",
+    ))
+
+
+class LandingPageCache:
+    """
+    Cache of extracted landing page text with conditional revalidation
+
+    Entries younger than ``fresh_ttl`` are served without any network access.
+    Older entries (up to ``max_age``) are revalidated with a conditional GET
+    using the stored ETag / Last-Modified; a 304 keeps the cached text and
+    avoids a full browser render.
+    """
+
+    def __init__(
+        self,
+        fresh_ttl: float = 900,
+        max_age: float = 86400,
+        max_bytes: int = 50 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+    ):
+        self.fresh_ttl = fresh_ttl
+        self.cache = TTLCache(
+            "landing_page",
+            ttl=max_age,
+            max_entries=10000,
+            max_bytes=max_bytes,
+            disk_dir=disk_dir,
+        )
+
+    def _revalidate(self, url: str, validators: dict) -> bool:
+        """Conditional GET; True if the server confirms the cached copy (304)"""
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        if not headers:
+            return False
+
+        try:
+            # stream=True: a changed page (200) is not downloaded here
+            with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+                return response.status_code == 304
+        except requests.exceptions.RequestException:
+            return False
+
+    def fetch(self, url: str, fetch_fn: Callable[[str], dict]) -> dict:
+        """
+        Return the extracted page for url, calling fetch_fn(url) only when needed
+
+        Args:
+            url: Landing page URL
+            fetch_fn: Full fetch + extraction returning the tool result dict
+
+        Returns:
+            Tool result dict with an added 'cache' field (hit/revalidated/miss)
+        """
+        key = normalize_url(url)
+        entry = self.cache.get_entry(key)
+
+        if entry is not None:
+            if entry.age < self.fresh_ttl:
+                return {**entry.value, "url": url, "cache": "hit"}
+
+            if self._revalidate(url, entry.meta):
+                metrics.incr("cache.landing_page.revalidated")
+                self.cache.set(key, entry.value, entry.meta)
+                return {**entry.value, "url": url, "cache": "revalidated"}
+
+        result = fetch_fn(url)
+        if result.get("success"):
+            validators = {
+                "etag": result.get("etag"),
+                "last_modified": result.get("last_modified"),
+            }
+            self.cache.set(key, result, validators)
+
+        return {**result, "cache": "miss"}
+
+
+_cache: Optional[LandingPageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_landing_page_cache() -> LandingPageCache:
+    """Get or create the process-wide landing page cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LandingPageCache(
+                fresh_ttl=float(os.getenv("LP_CACHE_TTL", "900")),
+                max_age=float(os.getenv("LP_CACHE_MAX_AGE", "86400")),
+                max_bytes=int(os.getenv("LP_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+                disk_dir=os.getenv("LP_CACHE_DIR") or None,
+            )
+        return _cache
@@ -0,0 +1,328 @@
+"""Tiered Landing Page Fetch - Pooled HTTP First, Browser Only When Needed"""
+
+from typing import Optional
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+import httpx
+import trafilatura
+
+from tools.browser_pool import CONTEXT_OPTIONS, get_browser_pool
+from tools.landing_page_cache import get_landing_page_cache, normalize_url
+from tools.page_condenser import condense_html
+from tools.request_filter import install_request_filter, record_request_stats
+from utils.async_loop import get_background_loop
+from utils.events import emit
+from utils.llm_cache import RECORD, REPLAY, completion_key, get_llm_cache
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+# Extracted text shorter than this is escalated to the browser tier
+MIN_TEXT_CHARS = int(os.getenv("LP_MIN_TEXT_CHARS", "500"))
+
+# HTTP tier timeout (seconds) and browser tier page load timeout (ms)
+HTTP_TIMEOUT = float(os.getenv("LP_HTTP_TIMEOUT", "10"))
+RENDER_TIMEOUT_MS = int(os.getenv("LP_RENDER_TIMEOUT_MS", "20000"))
+
+# Seconds the whole tiered fetch may take, waiting for a free browser included
+FETCH_DEADLINE = float(os.getenv("LP_FETCH_DEADLINE", "45"))
+
+# Statuses a browser cannot fix; everything else non-2xx is retried in the browser
+FINAL_HTTP_STATUSES = {404, 410}
+
+# Empty SPA mount points (server-rendered apps fill them) and "enable JavaScript" notices
+APP_SHELL_PATTERN = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt|svelte)[\"'][^>]*>\s*</div>",
+    re.IGNORECASE,
+)
+NOSCRIPT_NOTICE_PATTERN = re.compile(
+    r"enable javascript|javascript (?:is )?required|javascript aktivieren",
+    re.IGNORECASE,
+)
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client, created on the background loop"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                follow_redirects=True,
+                headers={
+                    "User-Agent": CONTEXT_OPTIONS["user_agent"],
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "de,en;q=0.8",
+                },
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30),
+            )
+        return _client
+
+
+async def _http_get(url: str) -> httpx.Response:
+    client = await _get_client()
+    return await client.get(url)
+
+
+def _js_shell_reason(html: str, text: Optional[str]) -> Optional[str]:
+    """Why static HTML needs rendering, or None if its text is usable"""
+    if not text:
+        return "no extractable text"
+    if APP_SHELL_PATTERN.search(html):
+        return "JavaScript app shell"
+    if len(text) < MIN_TEXT_CHARS:
+        if NOSCRIPT_NOTICE_PATTERN.search(html):
+            return "page requires JavaScript"
+        return f"only {len(text)} chars of text"
+    return None
+
+
+def _fetch_http(url: str) -> tuple[dict, Optional[str]]:
+    """
+    Tier 1: pooled HTTP GET and static extraction
+
+    Returns:
+        Tuple of (tool result dict, reason to escalate or None)
+    """
+    try:
+        response = get_background_loop().run(_http_get(url), timeout=HTTP_TIMEOUT + 5)
+    except Exception as e:
+        error = f"HTTP fetch failed: {type(e).__name__}: {str(e)[:200]}"
+        return {"success": False, "url": url, "error": error}, error
+
+    if response.status_code >= 400:
+        error = f"HTTP {response.status_code}"
+        failed = {"success": False, "url": url, "error": error}
+        return failed, None if response.status_code in FINAL_HTTP_STATUSES else error
+
+    html = response.text
+    text = trafilatura.extract(html, include_comments=False, include_tables=True, no_fallback=False)
+    escalate = _js_shell_reason(html, text)
+    if escalate and not text:
+        return {"success": False, "url": url, "error": f"Failed to extract text content ({escalate})"}, escalate
+
+    return {
+        "success": True,
+        "url": url,
+        "text": text,
+        "text_length": len(text),
+        "page": condense_html(html, url, text).to_dict(),
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }, escalate
+
+
+async def render_page(context, url: str, timeout: int = RENDER_TIMEOUT_MS) -> dict:
+    """
+    Render a landing page inside a fresh browser context and extract it
+
+    Runs on the background loop via BrowserPool.run(); handles cookie
+    banners and lazy loading, and blocks images, fonts, media and trackers.
+
+    Args:
+        context: Playwright BrowserContext (async API)
+        url: Landing page URL
+        timeout: Page load timeout in milliseconds
+
+    Returns:
+        Result dict like the HTTP tier's, plus the blocked 'requests' stats
+    """
+    page = await context.new_page()
+    # Images, fonts, media and trackers are aborted before they are downloaded
+    request_stats = await install_request_filter(page, url=url)
+
+    try:
+        # Navigate to page - use domcontentloaded (faster than networkidle)
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        headers = response.headers if response else {}
+
+        # Quick cookie banner handling (try first match only, don't iterate all)
+        try:
+            await page.click(
+                'button:has-text("Accept"), button:has-text("Akzeptieren"), #onetrust-accept-btn-handler',
+                timeout=1000  # Only wait 1 second
+            )
+        except Exception:
+            pass  # No cookie banner or already accepted
+
+        # Scroll to bottom (trigger lazy loading) with shorter wait
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await page.wait_for_timeout(500)  # Reduced from 2s to 0.5s
+
+        # Get HTML
+        html = await page.content()
+
+        # Extract text with trafilatura (CPU-bound: kept off the shared event loop)
+        text = await asyncio.to_thread(
+            trafilatura.extract,
+            html,
+            include_comments=False,
+            include_tables=True,
+            no_fallback=False,
+        )
+
+        if not text:
+            # Fallback: get all text
+            text = await page.inner_text("body")
+        condensed = await asyncio.to_thread(condense_html, html, url, text)
+
+        record_request_stats(request_stats)
+        return {
+            "success": True,
+            "url": url,
+            "text": text,
+            "text_length": len(text) if text else 0,
+            "page": condensed.to_dict(),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "requests": request_stats.to_dict(),
+        }
+
+    except PlaywrightTimeout:
+        return {
+            "success": False,
+            "url": url,
+            "error": f"Page load timeout ({timeout}ms)",
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "url": url,
+            "error": f"Scraping failed: {str(e)}",
+        }
+
+
+def _fetch_browser(url: str, timeout: float) -> dict:
+    """
+    Tier 2: render the page in the browser pool
+
+    Args:
+        url: Landing page URL
+        timeout: Seconds to wait for a browser slot and the render together;
+            on expiry the render is cancelled and its slot freed
+    """
+    try:
+        return get_browser_pool().run(
+            lambda context: render_page(context, url, RENDER_TIMEOUT_MS),
+            timeout=timeout,
+        )
+    except TimeoutError:
+        metrics.incr("scrape.browser_timeouts")
+        return {"success": False, "url": url, "error": f"Browser tier timed out after {timeout:.0f}s"}
+    except Exception as e:
+        return {"success": False, "url": url, "error": f"Browser launch failed: {str(e)}"}
+
+
+def _fetch_tiered(url: str) -> dict:
+    """HTTP tier, escalating to the browser for failed, short or JS-shell pages"""
+    tier_seconds = {}
+    deadline = time.time() + FETCH_DEADLINE
+
+    started = time.time()
+    result, escalate = _fetch_http(url)
+    tier_seconds["http"] = round(time.time() - started, 3)
+    metrics.observe("scrape.http.seconds", tier_seconds["http"])
+
+    if escalate is None:
+        return {**result, "tier": "http", "tier_seconds": tier_seconds}
+
+    emit("log", f"🌐 Static fetch not sufficient ({escalate}), rendering landing page...")
+    started = time.time()
+    rendered = _fetch_browser(url, timeout=max(deadline - time.time(), 1.0))
+    tier_seconds["browser"] = round(time.time() - started, 3)
+    metrics.observe("scrape.browser.seconds", tier_seconds["browser"])
+
+    # A short static page still beats a failed render
+    if not rendered.get("success") and result.get("success"):
+        logger.warning("Browser tier failed, using static text", url=url, error=rendered.get("error"))
+        return {**result, "tier": "http", "tier_seconds": tier_seconds, "escalation": escalate}
+    return {**rendered, "tier": "browser", "tier_seconds": tier_seconds, "escalation": escalate}
+
+
+def _fetch_cached(url: str) -> dict:
+    """
+    Landing page from the landing page cache, or recorded with the completions
+
+    Record / replay runs (LLM_CACHE_MODE) keep the extracted page in the
+    completion cache next to the LLM answers that read it, so a replay needs
+    neither the network nor LP_CACHE_DIR and fails on a page it never saw.
+
+    Raises:
+        LLMCacheMissError: In replay mode, if the page was never recorded
+    """
+    llm_cache = get_llm_cache()
+    if llm_cache is None or llm_cache.mode not in (RECORD, REPLAY):
+        return get_landing_page_cache().fetch(url, _fetch_tiered)
+
+    key = completion_key("landing_page", normalize_url(url), {})
+    recorded = llm_cache.call(
+        key,
+        "landing_page",
+        lambda: json.dumps(get_landing_page_cache().fetch(url, _fetch_tiered), ensure_ascii=False),
+    )
+    result = {**json.loads(recorded), "url": url}
+    if llm_cache.mode == REPLAY:
+        result["cache"] = "replay"
+    return result
+
+
+def fetch_landing_page(url: str) -> dict:
+    """
+    Fetch and condense a landing page without any LLM involvement
+
+    Served from the landing page cache when possible; otherwise the pooled
+    HTTP client is tried first and the browser pool only renders pages whose
+    static text is missing, too short or a JavaScript shell.
+
+    Args:
+        url: Landing page URL
+
+    Returns:
+        Tool result dict ('success', 'text', 'page', 'error') plus 'cache',
+        'tier' (http/browser) and 'tier_seconds' per attempted tier
+    """
+    result = _fetch_cached(url)
+    if result["cache"] == "miss" and result.get("tier"):
+        metrics.incr(f"scrape.tier.{result['tier']}")
+
+    emit("scrape", {
+        "url": url,
+        "success": bool(result.get("success")),
+        "error": result.get("error"),
+        "text_length": result.get("text_length", 0),
+        "page": result.get("page"),
+        "tier": result.get("tier"),
+        "tier_seconds": result.get("tier_seconds"),
+        "cache": result.get("cache"),
+        "requests": result.get("requests"),
+    })
+    if result.get("success"):
+        emit("log", (
+            f"🌐 Landing page extracted: {result['text_length']} chars "
+            f"(tier: {result.get('tier')}, cache: {result['cache']})"
+        ))
+        requests = result.get("requests")
+        if requests and result["cache"] == "miss":
+            emit("log", (
+                f"🚫 Blocked {requests['blocked']} of {requests['blocked'] + requests['allowed']} requests "
+                f"(~{requests['bytes_saved_estimate'] // 1024} KB saved)"
+            ))
+    else:
+        emit("log", f"⚠️ Landing page extraction failed: {result.get('error')}")
+    return result
+
+
+def fetch_summary(result: dict) -> dict:
+    """How a landing page was served (tier, per-tier seconds, cache status) for report metadata"""
+    keys = ("tier", "tier_seconds", "escalation", "cache", "requests")
+    return {key: result[key] for key in keys if result.get(key) is not None}
@@ -0,0 +1,227 @@
+"""Landing Page Condenser - Structured, Token-Budgeted Page Content (lxml)"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+import os
+import re
+
+from lxml import html as lxml_html
+
+from tools.copy_metrics import ANY_CTA_PATTERN
+from utils.tokens import estimate_tokens
+
+
+# Elements whose text is never page copy
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe"}
+
+# Page chrome: skipped for above-the-fold text and summary, but still scanned for CTAs
+CHROME_TAGS = {"nav", "footer", "aside", "form"}
+
+# Block elements that make up the readable copy
+TEXT_TAGS = {"p", "li", "blockquote", "td", "figcaption", "dd"}
+
+# Class / id fragments that mark a link as a button-style CTA
+CTA_CLASS_PATTERN = re.compile(r"btn|button|cta", re.IGNORECASE)
+
+# Approximate amount of copy visible without scrolling
+ABOVE_FOLD_CHARS = 600
+
+MAX_HEADINGS = 25
+MAX_CTAS = 10
+MAX_CTA_CHARS = 60
+
+
+def _clean(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def _first_sentence(text: str, max_chars: int = 200) -> str:
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    return sentence[:max_chars]
+
+
+@dataclass
+class CondensedPage:
+    """Compact structure of a landing page handed to the LLM stages"""
+
+    url: str
+    title: str = ""
+    meta_description: str = ""
+    headings: list[tuple[int, str]] = field(default_factory=list)
+    ctas: list[dict] = field(default_factory=list)
+    above_fold: str = ""
+    summary: list[str] = field(default_factory=list)
+    full_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def headline(self) -> str:
+        """First H1 (falls back to the title)"""
+        return next((text for level, text in self.headings if level == 1), self.title)
+
+    def copy_text(self) -> str:
+        """Headline + above-the-fold text + summary, for the copy metrics"""
+        return "\n\n".join(part for part in (self.headline, self.above_fold, " ".join(self.summary)) if part)
+
+    def to_text(self, token_budget: int) -> str:
+        """
+        Render as prompt text within token_budget
+
+        Title, meta description, CTAs and headings (up to half the budget)
+        come first; the above-the-fold text and the body summary fill the
+        remaining budget.
+        """
+        lines = [f"URL: {self.url}"]
+        if self.title:
+            lines.append(f"TITLE: {self.title}")
+        if self.meta_description:
+            lines.append(f"META DESCRIPTION: {self.meta_description}")
+        if self.headings:
+            lines.append("HEADINGS:")
+            used = estimate_tokens("\n".join(lines))
+            for level, text in self.headings:
+                line = f"{'  ' * (level - 1)}H{level}: {text}"
+                used += estimate_tokens(line) + 1
+                if used > token_budget // 2:
+                    break
+                lines.append(line)
+        if self.ctas:
+            ctas = "; ".join(
+                f"\"{cta['text']}\"" + (f" ({cta['href']})" if cta.get("href") else "")
+                for cta in self.ctas
+            )
+            lines.append(f"CTAs: {ctas}")
+
+        text = "\n".join(lines)
+        remaining = token_budget - estimate_tokens(text)
+
+        if self.above_fold and remaining > 20:
+            above_fold = _truncate_to_tokens(self.above_fold, remaining - 5)
+            text += f"\nABOVE THE FOLD:\n{above_fold}"
+            remaining = token_budget - estimate_tokens(text)
+
+        summary_lines = []
+        for sentence in self.summary:
+            cost = estimate_tokens(sentence) + 1
+            if remaining - cost < 5:
+                break
+            summary_lines.append(f"- {sentence}")
+            remaining -= cost
+        if summary_lines:
+            text += "\nSUMMARY:\n" + "\n".join(summary_lines)
+
+        return text
+
+
+def _truncate_to_tokens(text: str, tokens: int) -> str:
+    max_chars = max(0, tokens * 4)
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " …"
+
+
+def condense_html(html: str, url: str, full_text: Optional[str] = None) -> CondensedPage:
+    """
+    Extract the structure of a landing page in a single lxml pass
+
+    Args:
+        html: Page HTML (static download or rendered DOM)
+        url: Page URL
+        full_text: Extracted main text, only used for the token comparison
+
+    Returns:
+        CondensedPage (empty apart from the URL if the HTML cannot be parsed)
+    """
+    page = CondensedPage(url=url)
+    try:
+        root = lxml_html.fromstring(html)
+    except Exception:
+        return page
+
+    seen_ctas: set[str] = set()
+    above_fold: list[str] = []
+    above_fold_chars = 0
+    first_h2_seen = False
+
+    # iter() walks the tree once in document order; skipped subtrees are
+    # tracked by their element so descendants can be ignored cheaply
+    skipped: set = set()
+    chrome: set = set()
+    consumed: set = set()  # inside a text block that was already taken
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        parent = element.getparent()
+        if parent is not None and parent in skipped:
+            skipped.add(element)
+            continue
+        tag = element.tag.lower()
+
+        if tag == "title" and not page.title:
+            page.title = _clean(element.text_content())[:200]
+            continue
+        if tag == "meta":
+            name = (element.get("name") or element.get("property") or "").lower()
+            if name in ("description", "og:description") and not page.meta_description:
+                page.meta_description = _clean(element.get("content"))[:300]
+            continue
+        if tag in SKIP_TAGS:
+            skipped.add(element)
+            continue
+
+        in_chrome = tag in CHROME_TAGS or (parent is not None and parent in chrome)
+        if in_chrome:
+            chrome.add(element)
+        if parent is not None and parent in consumed:
+            consumed.add(element)
+
+        if tag in ("a", "button", "input") or element.get("role") == "button":
+            text = _clean(element.text_content() if tag != "input" else element.get("value"))
+            if tag == "input" and (element.get("type") or "").lower() not in ("submit", "button"):
+                continue
+            marker = f"{element.get('class', '')} {element.get('id', '')}"
+            is_cta = (
+                tag != "a"
+                or CTA_CLASS_PATTERN.search(marker)
+                or ANY_CTA_PATTERN.search(text)
+            )
+            if is_cta and text and len(text) <= MAX_CTA_CHARS and text.lower() not in seen_ctas:
+                if len(page.ctas) < MAX_CTAS:
+                    seen_ctas.add(text.lower())
+                    page.ctas.append({"text": text, "href": element.get("href") if tag == "a" else None})
+            continue
+
+        if in_chrome or element in consumed:
+            continue
+
+        if tag in ("h1", "h2", "h3"):
+            text = _clean(element.text_content())
+            if text and len(page.headings) < MAX_HEADINGS:
+                page.headings.append((int(tag[1]), text[:150]))
+            if tag == "h2":
+                first_h2_seen = True
+            continue
+
+        if tag in TEXT_TAGS:
+            text = _clean(element.text_content())
+            if len(text) < 20:
+                continue
+            consumed.add(element)
+            if not first_h2_seen and above_fold_chars < ABOVE_FOLD_CHARS:
+                above_fold.append(text)
+                above_fold_chars += len(text)
+            else:
+                page.summary.append(_first_sentence(text))
+
+    page.above_fold = " ".join(above_fold)[:ABOVE_FOLD_CHARS]
+    page.full_tokens = estimate_tokens(full_text if full_text is not None else root.text_content())
+    return page
+
+
+def get_token_budget() -> int:
+    """Token budget of the condensed landing page (LP_TOKEN_BUDGET)"""
+    return int(os.getenv("LP_TOKEN_BUDGET", "1500"))
+
@@ -0,0 +1,194 @@
+"""Request Interception for Playwright Scraping (Resource Types, Trackers)"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+import os
+
+from utils.metrics import metrics
+
+
+# Built-in analytics / ad / tag-manager hosts (matched with subdomains)
+TRACKER_DOMAINS = {
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com",
+    "doubleclick.net", "googlesyndication.com", "analytics.google.com",
+    "facebook.net", "connect.facebook.net", "facebook.com",
+    "snap.licdn.com", "px.ads.linkedin.com", "ads.linkedin.com",
+    "hotjar.com", "hotjar.io", "clarity.ms", "mouseflow.com", "fullstory.com",
+    "segment.com", "segment.io", "cdn.segment.com", "mixpanel.com", "amplitude.com",
+    "hs-analytics.net", "hs-banner.com", "hsadspixel.net", "hubspot.com", "hs-scripts.com",
+    "bat.bing.com", "ads-twitter.com", "analytics.twitter.com", "static.ads-twitter.com",
+    "tiktok.com", "analytics.tiktok.com", "pinterest.com", "ct.pinterest.com",
+    "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "adroll.com",
+    "quantserve.com", "scorecardresearch.com", "matomo.cloud", "plausible.io",
+    "intercom.io", "intercomcdn.com", "drift.com", "driftt.com", "leadfeeder.com",
+    "cookiebot.com", "usercentrics.eu", "onetrust.com", "cookielaw.org",
+    "newrelic.com", "nr-data.net", "sentry.io", "bugsnag.com", "optimizely.com",
+    "vwo.com", "visualwebsiteoptimizer.com", "zdassets.com", "youtube.com", "vimeo.com",
+}
+
+# Public suffixes with two labels (no full public suffix list needed for the
+# sites we scrape): "shop.example.co.uk" belongs to "example.co.uk"
+MULTI_LABEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au", "co.nz",
+    "co.jp", "co.za", "co.in", "com.br", "com.mx", "com.tr", "com.cn", "com.sg",
+}
+
+# Typical transfer size per blocked resource type; blocked requests are never
+# downloaded, so the savings are estimated from these averages
+ESTIMATED_BYTES = {
+    "image": 80_000,
+    "media": 1_000_000,
+    "font": 40_000,
+    "script": 40_000,
+    "stylesheet": 20_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 10_000,
+}
+
+DEFAULT_BLOCKED_TYPES = "image,media,font"
+
+
+def _host_matches(host: str, domains: set[str]) -> bool:
+    """True if host equals one of domains or is a subdomain of one"""
+    parts = host.split(".")
+    return any(".".join(parts[i:]) in domains for i in range(len(parts) - 1))
+
+
+def registrable_domain(host: str) -> str:
+    """Domain a host belongs to ("info.hubspot.com" -> "hubspot.com")"""
+    parts = host.lower().strip(".").split(".")
+    labels = 3 if ".".join(parts[-2:]) in MULTI_LABEL_SUFFIXES else 2
+    return ".".join(parts[-labels:])
+
+
+def _parse_list(value: str) -> set[str]:
+    return {item.strip().lower() for item in value.split(",") if item.strip()}
+
+
+@dataclass
+class RequestPolicy:
+    """
+    Allow/deny policy for requests made while scraping
+
+    Order: allowed domains always pass; then blocked resource types, the
+    built-in tracker list and extra blocked domains are denied. The page's
+    own navigation is never passed to the policy, and requests to the
+    landing page's own domain (``site_domains``) are exempt from the tracker
+    and domain lists, so a page hosted on e.g. hubspot.com keeps its scripts.
+    """
+
+    blocked_types: set[str] = field(default_factory=lambda: _parse_list(DEFAULT_BLOCKED_TYPES))
+    blocked_domains: set[str] = field(default_factory=set)
+    allowed_domains: set[str] = field(default_factory=set)
+    block_trackers: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RequestPolicy":
+        """Policy from SCRAPE_BLOCK_TYPES, SCRAPE_BLOCK_DOMAINS, SCRAPE_ALLOW_DOMAINS, SCRAPE_BLOCK_TRACKERS"""
+        return cls(
+            blocked_types=_parse_list(os.getenv("SCRAPE_BLOCK_TYPES", DEFAULT_BLOCKED_TYPES)),
+            blocked_domains=_parse_list(os.getenv("SCRAPE_BLOCK_DOMAINS", "")),
+            allowed_domains=_parse_list(os.getenv("SCRAPE_ALLOW_DOMAINS", "")),
+            block_trackers=os.getenv("SCRAPE_BLOCK_TRACKERS", "true").lower() == "true",
+        )
+
+    def block_reason(
+        self,
+        resource_type: str,
+        url: str,
+        site_domains: frozenset[str] = frozenset(),
+    ) -> Optional[str]:
+        """Why a request should be blocked ('type', 'tracker', 'domain'), or None to allow it"""
+        host = (urlsplit(url).hostname or "").lower()
+        if host and _host_matches(host, self.allowed_domains):
+            return None
+        if resource_type in self.blocked_types:
+            return "type"
+        if host and _host_matches(host, site_domains):
+            return None
+        if host and self.block_trackers and _host_matches(host, TRACKER_DOMAINS):
+            return "tracker"
+        if host and _host_matches(host, self.blocked_domains):
+            return "domain"
+        return None
+
+
+@dataclass
+class RequestStats:
+    """Requests seen by one scrape"""
+
+    allowed: int = 0
+    blocked: dict[str, int] = field(default_factory=dict)
+    blocked_types: dict[str, int] = field(default_factory=dict)
+    bytes_saved_estimate: int = 0
+
+    @property
+    def blocked_total(self) -> int:
+        return sum(self.blocked.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "blocked": self.blocked_total,
+            "blocked_by_reason": dict(self.blocked),
+            "blocked_by_type": dict(self.blocked_types),
+            "bytes_saved_estimate": self.bytes_saved_estimate,
+        }
+
+
+async def install_request_filter(
+    page,
+    policy: Optional[RequestPolicy] = None,
+    url: Optional[str] = None,
+) -> RequestStats:
+    """
+    Intercept all requests of a Playwright page according to policy
+
+    Args:
+        page: Playwright Page (async API)
+        policy: Allow/deny policy (default: from environment)
+        url: Landing page URL; its registrable domain (and that of every
+            main-frame redirect) is exempt from the tracker and domain lists
+
+    Returns:
+        RequestStats that fill up while the page loads
+    """
+    policy = policy or RequestPolicy.from_env()
+    stats = RequestStats()
+    site_domains: set[str] = set()
+    if url and urlsplit(url).hostname:
+        site_domains.add(registrable_domain(urlsplit(url).hostname))
+
+    async def handle(route):
+        request = route.request
+        # The landing page itself may live on a listed domain (e.g. HubSpot pages)
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            host = urlsplit(request.url).hostname
+            if host:
+                site_domains.add(registrable_domain(host))
+            reason = None
+        else:
+            reason = policy.block_reason(request.resource_type, request.url, frozenset(site_domains))
+        if reason is None:
+            stats.allowed += 1
+            await route.continue_()
+            return
+
+        stats.blocked[reason] = stats.blocked.get(reason, 0) + 1
+        stats.blocked_types[request.resource_type] = stats.blocked_types.get(request.resource_type, 0) + 1
+        stats.bytes_saved_estimate += ESTIMATED_BYTES.get(request.resource_type, ESTIMATED_BYTES["other"])
+        await route.abort("blockedbyclient")
+
+    await page.route("**/*", handle)
+    return stats
+
+
+def record_request_stats(stats: RequestStats):
+    """Add a finished scrape's request stats to the process metrics"""
+    metrics.incr("scrape.requests_allowed", stats.allowed)
+    metrics.incr("scrape.requests_blocked", stats.blocked_total)
+    metrics.incr("scrape.bytes_saved_estimate", stats.bytes_saved_estimate)
+    for reason, count in stats.blocked.items():
+        metrics.incr(f"scrape.blocked_{reason}", count)
@@ -0,0 +1,183 @@
+"""Deterministic Visual Metrics for Ad Creatives (NumPy)"""
+
+from io import BytesIO
+from typing import Optional
+from PIL import Image, ImageOps
+import numpy as np
+import os
+
+from utils.artifacts import is_artifact, read_source_bytes
+
+
+# Longest edge the image is reduced to before computing palette and edges
+ANALYSIS_EDGE = 256
+
+# Common LinkedIn / social ad formats (width / height)
+KNOWN_FORMATS = [
+    (1.0, "1:1 (square)"),
+    (1.91, "1.91:1 (landscape)"),
+    (16 / 9, "16:9 (landscape)"),
+    (4 / 5, "4:5 (vertical)"),
+    (9 / 16, "9:16 (vertical)"),
+]
+
+# WCAG 2.x thresholds
+WCAG_AA = 4.5
+WCAG_AA_LARGE = 3.0
+
+
+def classify_format(width: int, height: int) -> str:
+    """Map an aspect ratio to the nearest known ad format (3% tolerance)"""
+    ratio = width / height
+    for target, label in KNOWN_FORMATS:
+        if abs(ratio - target) / target <= 0.03:
+            return label
+    return f"{ratio:.2f}:1 ({'landscape' if ratio > 1 else 'vertical'})"
+
+
+def _kmeans_palette(pixels: np.ndarray, k: int = 5, iterations: int = 12) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized k-means on RGB pixels
+
+    Centers are initialised deterministically at luminance quantiles, so the
+    same image always yields the same palette.
+
+    Returns:
+        Tuple of (centers as uint8 RGB array [k, 3], share of pixels per center)
+    """
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luminance, kind="stable")
+    quantiles = ((np.arange(k) + 0.5) / k * (len(order) - 1)).astype(int)
+    centers = pixels[order[quantiles]].copy()
+
+    for _ in range(iterations):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k).astype(np.float32)
+        sums = np.stack([np.bincount(labels, weights=pixels[:, c], minlength=k) for c in range(3)], axis=1)
+        nonempty = counts > 0
+        new_centers = centers.copy()
+        new_centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+        if np.allclose(new_centers, centers, atol=0.5):
+            centers = new_centers
+            break
+        centers = new_centers
+
+    shares = counts / counts.sum()
+    ranked = np.argsort(-shares, kind="stable")
+    ranked = ranked[shares[ranked] > 0]  # flat images collapse to fewer colors
+    return np.clip(np.rint(centers[ranked]), 0, 255).astype(np.uint8), shares[ranked]
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance for an array of sRGB colors [..., 3]"""
+    c = rgb.astype(np.float64) / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_matrix(rgb: np.ndarray) -> np.ndarray:
+    """Pairwise WCAG contrast ratios between colors [n, 3] -> [n, n]"""
+    lum = relative_luminance(rgb)
+    lighter = np.maximum(lum[:, None], lum[None, :])
+    darker = np.minimum(lum[:, None], lum[None, :])
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _edge_metrics(gray: np.ndarray, threshold: float = 40.0, block: int = 8) -> tuple[float, float]:
+    """
+    Edge density and text-area estimate from gradient magnitude
+
+    Text produces dense, high-contrast edges; blocks whose edge share exceeds
+    20% are counted as text-like.
+    """
+    gx = np.abs(np.diff(gray, axis=1))[:-1, :]
+    gy = np.abs(np.diff(gray, axis=0))[:, :-1]
+    edges = (gx + gy) > threshold
+
+    h, w = (edges.shape[0] // block) * block, (edges.shape[1] // block) * block
+    if h == 0 or w == 0:
+        return float(edges.mean()) if edges.size else 0.0, 0.0
+    blocks = edges[:h, :w].reshape(h // block, block, w // block, block).mean(axis=(1, 3))
+    return float(edges.mean()), float((blocks > 0.2).mean())
+
+
+def compute_visual_metrics(data: bytes, palette_size: int = 5) -> Optional[dict]:
+    """
+    Exact, reproducible visual metrics for an ad image
+
+    Returns:
+        Dict with format, palette, contrast and edge metrics, or None if the
+        image cannot be decoded
+    """
+    try:
+        with Image.open(BytesIO(data)) as opened:
+            image = ImageOps.exif_transpose(opened).convert("RGB")
+    except Exception:
+        return None
+
+    width, height = image.size
+    image.thumbnail((ANALYSIS_EDGE, ANALYSIS_EDGE), Image.Resampling.BILINEAR)
+    array = np.asarray(image, dtype=np.float32)
+
+    centers, shares = _kmeans_palette(array.reshape(-1, 3), k=palette_size)
+    contrast = contrast_matrix(centers)
+    i, j = np.unravel_index(np.argmax(contrast), contrast.shape)
+    hex_codes = ["#{:02X}{:02X}{:02X}".format(*color) for color in centers]
+
+    gray = array @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    edge_density, text_area = _edge_metrics(gray)
+
+    primary_contrast = float(contrast[0, 1]) if len(centers) > 1 else 1.0
+    max_contrast = float(contrast[i, j])
+    return {
+        "width": width,
+        "height": height,
+        "aspect_ratio": round(width / height, 3),
+        "format": classify_format(width, height),
+        "is_square": classify_format(width, height).startswith("1:1"),
+        "palette": [
+            {"hex": hex_code, "share": round(float(share), 3)}
+            for hex_code, share in zip(hex_codes, shares)
+        ],
+        "primary_contrast": round(primary_contrast, 2),
+        "max_contrast": {
+            "ratio": round(max_contrast, 2),
+            "colors": [hex_codes[i], hex_codes[j]],
+            "passes_aa": max_contrast >= WCAG_AA,
+            "passes_aa_large": max_contrast >= WCAG_AA_LARGE,
+        },
+        "edge_density": round(edge_density, 3),
+        "text_area_estimate": round(text_area, 3),
+    }
+
+
+def compute_visual_metrics_for_source(source: str) -> Optional[dict]:
+    """Visual metrics for an uploaded artifact or local ad image path (None for URLs or unreadable files)"""
+    if is_artifact(source):
+        try:
+            return compute_visual_metrics(read_source_bytes(source))
+        except KeyError:
+            return None
+    if not source or source.startswith(("http://", "https://", "data:")) or not os.path.isfile(source):
+        return None
+    with open(source, "rb") as f:
+        return compute_visual_metrics(f.read())
+
+
+def format_visual_metrics(metrics: dict) -> str:
+    """Compact text block for prompts and reports"""
+    palette = ", ".join(
+        f"{c['hex']} ({c['share'] * 100:.0f}%)" for c in metrics["palette"] if c["share"] >= 0.01
+    )
+    best = metrics["max_contrast"]
+    wcag = "AA" if best["passes_aa"] else ("AA large text only" if best["passes_aa_large"] else "fails AA")
+    return (
+        f"- Format: {metrics['width']}x{metrics['height']} px, {metrics['format']}\n"
+        f"- Dominant colors: {palette}\n"
+        f"- Contrast of the two main colors: {metrics['primary_contrast']}:1\n"
+        f"- Highest contrast pair (CTA candidate): {best['colors'][0]} / {best['colors'][1]} "
+        f"= {best['ratio']}:1 ({wcag})\n"
+        f"- Edge density: {metrics['edge_density'] * 100:.1f}%, "
+        f"estimated text area: {metrics['text_area_estimate'] * 100:.0f}% of the image"
+    )
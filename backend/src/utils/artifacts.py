@@ -0,0 +1,131 @@
+"""In-Process Store for Uploaded Ad Images (Handles Instead of Temp Files)"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+import os
+import threading
+import time
+import uuid
+
+from utils.metrics import metrics
+
+
+ARTIFACT_SCHEME = "artifact://"
+
+
+class ArtifactStoreFullError(Exception):
+    """Raised when an upload does not fit into the artifact store"""
+
+
+@dataclass
+class Artifact:
+    """Uploaded bytes plus what the vision stage needs to know about them"""
+
+    data: bytes
+    mime_type: Optional[str] = None
+    filename: Optional[str] = None
+    created: float = field(default_factory=time.time)
+
+
+def is_artifact(source: Optional[str]) -> bool:
+    """True if source is an artifact handle rather than a path or URL"""
+    return bool(source) and source.startswith(ARTIFACT_SCHEME)
+
+
+class ArtifactStore:
+    """
+    Bounded in-memory store of uploaded files, addressed by handle
+
+    Analysis runs receive an 'artifact://<id>' handle instead of a temp file
+    path, so they read the ad image from memory. (While the request is
+    parsed, the multipart parser may still spool a large upload to its own
+    temporary file; that file is gone once the bytes are stored here.) The
+    run that owns a handle releases it when it ends; entries older than
+    ``max_age`` are swept on the next put() as a safety net for handles
+    whose run never started.
+    """
+
+    def __init__(self, max_bytes: int = 200 * 1024 * 1024, max_age: float = 3600):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._items: dict[str, Artifact] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def _publish_gauges(self):
+        metrics.set_gauge("artifacts.bytes", self._bytes)
+        metrics.set_gauge("artifacts.count", len(self._items))
+
+    def _sweep(self):
+        cutoff = time.time() - self.max_age
+        expired = [h for h, a in self._items.items() if a.created < cutoff]
+        for handle in expired:
+            self._bytes -= len(self._items.pop(handle).data)
+            metrics.incr("artifacts.expired")
+        if expired:
+            self._publish_gauges()  # also when the following put() is rejected
+
+    def put(self, data: bytes, mime_type: Optional[str] = None, filename: Optional[str] = None) -> str:
+        """
+        Store bytes and return their handle
+
+        Raises:
+            ArtifactStoreFullError: If the store has no room for data
+        """
+        with self._lock:
+            self._sweep()
+            if self._bytes + len(data) > self.max_bytes:
+                raise ArtifactStoreFullError(
+                    f"Artifact store full ({self._bytes} of {self.max_bytes} bytes in use)"
+                )
+            handle = f"{ARTIFACT_SCHEME}{uuid.uuid4().hex}"
+            self._items[handle] = Artifact(data=data, mime_type=mime_type, filename=filename)
+            self._bytes += len(data)
+            self._publish_gauges()
+            return handle
+
+    def get(self, handle: str) -> Artifact:
+        """
+        Artifact for a handle
+
+        Raises:
+            KeyError: If the handle was released, expired or never existed
+        """
+        with self._lock:
+            return self._items[handle]
+
+    def release(self, handle: Optional[str]):
+        """Drop an artifact (no-op for unknown handles)"""
+        with self._lock:
+            artifact = self._items.pop(handle, None) if handle else None
+            if artifact is not None:
+                self._bytes -= len(artifact.data)
+            self._publish_gauges()
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get or create the process-wide artifact store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(
+                max_bytes=int(os.getenv("ARTIFACT_STORE_MAX_BYTES", str(200 * 1024 * 1024))),
+                max_age=float(os.getenv("ARTIFACT_MAX_AGE", "3600")),
+            )
+        return _store
+
+
+def read_source_bytes(source: str) -> bytes:
+    """Bytes of an ad image given as artifact handle or local file path"""
+    if is_artifact(source):
+        return get_artifact_store().get(source).data
+    with open(source, "rb") as f:
+        return f.read()
@@ -0,0 +1,63 @@
+"""Process-Wide Background Event Loop for Async Clients Used From Sync Code"""
+
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+import asyncio
+import threading
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever on a daemon thread
+
+    Async clients (connection pools) are bound to the loop they were created
+    on. Keeping one loop alive for the whole process lets sync callers (crew
+    stages, worker threads) share those clients and their keep-alive
+    connections instead of starting a new loop per call.
+    """
+
+    def __init__(self, name: str = "background-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Seconds to wait for the result (None = no limit)
+
+        Raises:
+            RuntimeError: If called from the loop's own thread (would deadlock)
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run() called from its own loop thread")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+_loop: Optional[BackgroundLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Get or start the process-wide background loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = BackgroundLoop()
+        return _loop
@@ -0,0 +1,213 @@
+"""LRU + TTL Cache with Optional Disk Persistence"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.metrics import metrics
+
+
+# Minimum seconds between two sweeps of a disk tier
+DISK_SWEEP_INTERVAL = 60
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with its storage time and free-form metadata"""
+
+    value: Any
+    stored_at: float
+    size: int
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with TTL expiry
+
+    Memory is bounded by entry count and by the approximate JSON size of the
+    values. When ``disk_dir`` is set, entries are also written as JSON files
+    and survive restarts; a memory miss falls back to disk. The disk tier is
+    swept on startup and after writes (at most every DISK_SWEEP_INTERVAL
+    seconds): expired files are deleted, and so are the oldest files beyond
+    ``max_disk_entries`` (default: 10x ``max_entries``). Values must be
+    JSON-serializable. Hit/miss counters are published as ``cache.<name>.*``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = 3600,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: Optional[int] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else max_entries * 10
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.sweep_disk()
+
+    def _count(self, event: str):
+        metrics.incr(f"cache.{self.name}.{event}")
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("key") != key or time.time() - data["stored_at"] > self.ttl:
+            self._remove_disk(key)
+            return None
+
+        size = len(json.dumps(data["value"]))
+        return CacheEntry(data["value"], data["stored_at"], size, data.get("meta", {}))
+
+    def _write_disk(self, key: str, entry: CacheEntry):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"key": key, "value": entry.value, "stored_at": entry.stored_at, "meta": entry.meta},
+                    f,
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        if time.time() - self._last_sweep >= DISK_SWEEP_INTERVAL:
+            self.sweep_disk()
+
+    def sweep_disk(self):
+        """Delete expired disk entries and the oldest ones beyond max_disk_entries"""
+        if not self.disk_dir or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_sweep = time.time()
+            files = []
+            with os.scandir(self.disk_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        files.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+
+            # Files are rewritten on every set(), so the mtime is the storage time
+            cutoff = self._last_sweep - self.ttl
+            files.sort()
+            excess = len(files) - self.max_disk_entries
+            for index, (mtime, path) in enumerate(files):
+                if mtime >= cutoff and index >= excess:
+                    break
+                try:
+                    os.remove(path)
+                    self._count("disk_evictions")
+                except OSError:
+                    pass
+        finally:
+            self._sweep_lock.release()
+
+    def _remove_disk(self, key: str):
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _store(self, key: str, entry: CacheEntry):
+        """Insert into memory and evict least recently used entries (lock held)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._count("evictions")
+
+        metrics.set_gauge(f"cache.{self.name}.entries", len(self._entries))
+        metrics.set_gauge(f"cache.{self.name}.bytes", self._bytes)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the unexpired entry for key (memory first, then disk), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.age > self.ttl:
+                    self._bytes -= self._entries.pop(key).size
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+                    self._count("hits")
+                    return entry
+
+        if self.disk_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._store(key, entry)
+                self._count("hits")
+                self._count("disk_hits")
+                return entry
+
+        self._count("misses")
+        return None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default"""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else default
+
+    def set(self, key: str, value: Any, meta: Optional[dict] = None):
+        """Store a value (resets its age)"""
+        entry = CacheEntry(value, time.time(), len(json.dumps(value)), meta or {})
+        with self._lock:
+            self._store(key, entry)
+        if self.disk_dir:
+            self._write_disk(key, entry)
+
+    def delete(self, key: str):
+        """Remove key from memory and disk"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        if self.disk_dir:
+            self._remove_disk(key)
+
+    def stats(self) -> dict:
+        """Current size of the memory tier"""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
@@ -0,0 +1,111 @@
+"""Per-Run Event Channel for Progress Reporting"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+import threading
+
+
+class EventChannel:
+    """
+    Bounded, thread-safe event channel of a single analysis run
+
+    Producers (crew callbacks, tools) call emit() from any thread; a consumer
+    drains events with get() or drain(). When the buffer is full the oldest
+    events are dropped. Listeners are invoked synchronously for every event
+    (e.g. to persist job progress); notifiers are called without arguments
+    after every emit and on close, so an asyncio consumer can be woken up via
+    loop.call_soon_threadsafe instead of polling.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self._events: deque = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self._listeners: list[Callable[[dict], None]] = []
+        self._notifiers: list[Callable[[], None]] = []
+        self.closed = False
+        self.dropped = 0
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """Call listener(event) for every emitted event"""
+        self._listeners.append(listener)
+
+    def add_notifier(self, notifier: Callable[[], None]):
+        """Call notifier() whenever new events arrive or the channel closes"""
+        self._notifiers.append(notifier)
+
+    def _notify(self):
+        for notifier in self._notifiers:
+            try:
+                notifier()
+            except Exception:
+                pass
+
+    def emit(self, event_type: str, data: Any = None):
+        """Publish an event"""
+        event = {"type": event_type, "data": data}
+        with self._cond:
+            if self._events.maxlen and len(self._events) >= self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify_all()
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass
+        self._notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None on timeout or when the channel is closed and drained"""
+        with self._cond:
+            if not self._events and not self.closed:
+                self._cond.wait(timeout)
+            return self._events.popleft() if self._events else None
+
+    def drain(self) -> list[dict]:
+        """All buffered events, without blocking"""
+        with self._cond:
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self):
+        """Mark the run as finished; wakes up waiting consumers"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        self._notify()
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the channel is closed and all events were consumed"""
+        with self._cond:
+            return self.closed and not self._events
+
+
+_current_channel: ContextVar[Optional[EventChannel]] = ContextVar("run_events", default=None)
+
+
+@contextmanager
+def bind_events(channel: EventChannel):
+    """Route emit() calls in this context (and copied contexts) to channel"""
+    token = _current_channel.set(channel)
+    try:
+        yield channel
+    finally:
+        _current_channel.reset(token)
+
+
+def current_channel() -> Optional[EventChannel]:
+    """Event channel of the current run (None outside a run)"""
+    return _current_channel.get()
+
+
+def emit(event_type: str, data: Any = None):
+    """Publish an event to the channel of the current run (no-op outside a run)"""
+    channel = _current_channel.get()
+    if channel is not None:
+        channel.emit(event_type, data)
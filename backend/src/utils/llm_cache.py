@@ -0,0 +1,171 @@
+"""SQLite-backed Cache of LLM Completions (Record / Replay)"""
+
+from typing import Any, Callable, Optional
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.artifacts import get_artifact_store
+from utils.metrics import metrics
+
+
+# Cache modes (LLM_CACHE_MODE)
+OFF = "off"
+READWRITE = "readwrite"  # serve hits, call and store on misses
+RECORD = "record"        # always call, store (overwrite) every completion
+REPLAY = "replay"        # serve hits only; a miss raises instead of calling the API
+MODES = (OFF, READWRITE, RECORD, REPLAY)
+
+# Sampling parameters of the LLM client that change the completion
+SAMPLING_PARAMS = (
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens",
+    "presence_penalty", "frequency_penalty", "seed", "response_format",
+)
+
+# Upload handles differ per request; keys use the content hash instead
+ARTIFACT_HANDLE_PATTERN = re.compile(r"artifact://[0-9a-f]{32}")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used);
+"""
+
+
+class LLMCacheMissError(Exception):
+    """Raised in replay mode when a prompt was never recorded"""
+
+
+def _stable_artifacts(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        try:
+            data = get_artifact_store().get(match.group(0)).data
+        except KeyError:
+            return match.group(0)
+        return f"artifact:sha256:{hashlib.sha256(data).hexdigest()}"
+
+    return ARTIFACT_HANDLE_PATTERN.sub(replace, text)
+
+
+def completion_key(model: str, messages: Any, params: dict, tools: Any = None) -> str:
+    """Hash of model, messages, sampling parameters and offered tools"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params, "tools": tools},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(_stable_artifacts(payload).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache of exact-repeat LLM completions
+
+    Entries are evicted least recently used first once the stored responses
+    exceed ``max_bytes``. One shared connection guarded by a lock, as in
+    the job store.
+    """
+
+    def __init__(self, path: str, mode: str = READWRITE, max_bytes: int = 100 * 1024 * 1024):
+        if mode not in MODES:
+            raise ValueError(f"LLM_CACHE_MODE must be one of: {', '.join(MODES)}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached completion for key (marks it as recently used), or None"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE completions SET last_used = ? WHERE key = ?", (time.time(), key))
+        metrics.incr("cache.llm.hits" if row is not None else "cache.llm.misses")
+        return row[0] if row is not None else None
+
+    def set(self, key: str, model: str, response: str):
+        """Store a completion and evict the least recently used beyond max_bytes"""
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+
+            while self._bytes > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key, size FROM completions ORDER BY last_used LIMIT 1"
+                ).fetchone()
+                if row is None or row[0] == key:
+                    break
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (row[0],))
+                self._bytes -= row[1]
+                metrics.incr("cache.llm.evictions")
+        metrics.set_gauge("cache.llm.bytes", self._bytes)
+
+    def call(self, key: str, model: str, fn: Callable[[], Any]) -> Any:
+        """
+        Completion for key according to the cache mode, calling fn() when needed
+
+        Raises:
+            LLMCacheMissError: In replay mode, if key was never recorded
+        """
+        if self.mode in (READWRITE, REPLAY):
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            if self.mode == REPLAY:
+                raise LLMCacheMissError(f"No recorded completion for {model} (key {key[:12]})")
+
+        result = fn()
+        # Only plain text answers are cached (tool call results may be objects)
+        if isinstance(result, str):
+            self.set(key, model, result)
+        return result
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def replay_enabled() -> bool:
+    """True if LLM_CACHE_MODE=replay (no Gemini API key or network needed)"""
+    return os.getenv("LLM_CACHE_MODE", OFF).lower() == REPLAY
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide completion cache, or None when LLM_CACHE_MODE is off (default)"""
+    global _cache
+    mode = os.getenv("LLM_CACHE_MODE", OFF).lower()
+    if mode == OFF:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                os.getenv("LLM_CACHE_PATH", ".cache/llm.db"),
+                mode=mode,
+                max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(100 * 1024 * 1024))),
+            )
+        return _cache
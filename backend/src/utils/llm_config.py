@@ -1,25 +1,106 @@
 """LLM Configuration for CrewAI Agents"""
 
+import json
 import os
+import threading
 from crewai import LLM
 
+from utils.llm_cache import SAMPLING_PARAMS, completion_key, get_llm_cache, replay_enabled
+from utils.rate_limiter import get_rate_limiter
+from utils.tokens import estimate_tokens
+
+
+# Model behind every CrewAI agent (part of the report cache key)
+AGENT_MODEL = "gemini/gemini-2.5-flash"
+
+# Completion tokens reserved per agent call before the real count is known
+EXPECTED_COMPLETION_TOKENS = 800
+
+
+class RateLimitedLLM(LLM):
+    """
+    CrewAI LLM whose calls go through the process-wide Gemini rate limiter
+
+    With LLM_CACHE_MODE set, exact repeats (same model, messages, sampling
+    parameters and tools) are answered from the completion cache first.
+    """
+
+    def call(self, messages, *args, **kwargs):
+        prompt = messages if isinstance(messages, str) else json.dumps(messages, ensure_ascii=False, default=str)
+
+        def send():
+            return get_rate_limiter().call(
+                lambda: LLM.call(self, messages, *args, **kwargs),
+                estimated_tokens=estimate_tokens(prompt) + EXPECTED_COMPLETION_TOKENS,
+                usage=lambda answer: estimate_tokens(prompt) + estimate_tokens(str(answer)),
+                source="agent",
+            )
+
+        cache = get_llm_cache()
+        if cache is None:
+            return send()
+        key = completion_key(
+            self.model,
+            messages,
+            {name: getattr(self, name, None) for name in SAMPLING_PARAMS},
+            tools={
+                "tools": args[0] if args else kwargs.get("tools"),
+                "response_model": kwargs.get("response_model"),
+            },
+        )
+        return cache.call(key, self.model, send)
+
+
+_llm = None
+_llm_lock = threading.Lock()
+
 
 def get_gemini_llm():
     """
-    Create and return configured Gemini LLM for CrewAI agents
+    Return the shared Gemini LLM for CrewAI agents
 
-    Uses CrewAI's native LLM class with Gemini.
+    Uses CrewAI's native LLM class with Gemini, rate limited together with
+    the vision and fast mode calls. The client is built once per process; it
+    holds no per-run state, so all agents can share it. In replay mode
+    (LLM_CACHE_MODE=replay) no API key is needed, since every call is
+    answered from the completion cache.
 
     Returns:
         LLM instance configured for Gemini
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-
-    # Return CrewAI's LLM with gemini/ prefix as per official docs
-    return LLM(
-        model='gemini/gemini-2.5-flash',
-        api_key=api_key,
-        temperature=0.7
-    )
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                if not replay_enabled():
+                    raise ValueError("GEMINI_API_KEY environment variable not set")
+                api_key = "replay"  # never sent: replay misses raise before any request
+
+            # CrewAI's LLM with gemini/ prefix as per official docs
+            llm = RateLimitedLLM(
+                model=AGENT_MODEL,
+                api_key=api_key,
+                temperature=0.7
+            )
+            # Newer CrewAI versions may hand back a native provider class from
+            # LLM.__new__, which would bypass the rate limiter in call()
+            if not isinstance(llm, RateLimitedLLM):
+                raise RuntimeError(
+                    f"CrewAI built {type(llm).__name__} instead of RateLimitedLLM; "
+                    "install crewai<1.0.0 as pinned in requirements.txt"
+                )
+            _llm = llm
+        return _llm
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimated Gemini cost in USD for a token count
+
+    Prices per million tokens come from GEMINI_PRICE_INPUT_PER_M and
+    GEMINI_PRICE_OUTPUT_PER_M (defaults: Gemini 2.5 Flash list prices).
+    """
+    input_price = float(os.getenv("GEMINI_PRICE_INPUT_PER_M", "0.30"))
+    output_price = float(os.getenv("GEMINI_PRICE_OUTPUT_PER_M", "2.50"))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
@@ -0,0 +1,58 @@
+"""Process Memory Readings Around a Request"""
+
+from typing import Optional
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux only, None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * resource.getpagesize() / (1024 * 1024) if resource else None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Highest resident set size this process has reached, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux, in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryProbe:
+    """
+    Memory used while one request runs
+
+    The heap is shared by all concurrent requests, so the readings are
+    process-wide: RSS at start and end, and how far the process high-water
+    mark rose during the request (0 when an earlier request set it higher).
+    The upload bytes held for the request are exact.
+    """
+
+    def __init__(self, upload_bytes: int = 0):
+        self.upload_bytes = upload_bytes
+        self.rss_start = current_rss_mb()
+        self.peak_start = peak_rss_mb()
+
+    def finish(self) -> dict:
+        rss_end = current_rss_mb()
+        peak_end = peak_rss_mb()
+        growth = None
+        if peak_end is not None and self.peak_start is not None:
+            growth = round(peak_end - self.peak_start, 1)
+        return {
+            "upload_bytes": self.upload_bytes,
+            "rss_start_mb": round(self.rss_start, 1) if self.rss_start is not None else None,
+            "rss_end_mb": round(rss_end, 1) if rss_end is not None else None,
+            "peak_rss_mb": round(peak_end, 1) if peak_end is not None else None,
+            "peak_growth_mb": growth,
+        }
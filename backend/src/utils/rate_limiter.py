@@ -0,0 +1,296 @@
+"""Process-Wide Gemini Rate Limiter (Token Buckets, Adaptive Backoff, Circuit Breaker)"""
+
+from typing import Any, Callable, Optional
+import os
+import random
+import threading
+import time
+
+from utils.events import emit
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+# Error classes the limiter reacts to (anything else is raised unchanged)
+RATE_LIMITED = "rate_limited"
+UNAVAILABLE = "unavailable"
+
+RATE_LIMIT_MARKERS = ("429", "resource exhausted", "resource_exhausted", "rate limit", "quota")
+UNAVAILABLE_MARKERS = (
+    "503", "500", "502", "504", "unavailable", "overloaded", "deadline exceeded", "timed out", "timeout",
+    "connection reset", "connection aborted",
+)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling Gemini while the circuit breaker is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Gemini API unavailable, circuit open for another {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """RATE_LIMITED for 429 / quota errors, UNAVAILABLE for 5xx and timeouts, else None"""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status == 429:
+        return RATE_LIMITED
+    if isinstance(status, int) and 500 <= status < 600:
+        return UNAVAILABLE
+
+    text = f"{type(error).__name__} {error}".lower()
+    if any(marker in text for marker in RATE_LIMIT_MARKERS):
+        return RATE_LIMITED
+    if any(marker in text for marker in UNAVAILABLE_MARKERS):
+        return UNAVAILABLE
+    return None
+
+
+class _Bucket:
+    """Token bucket refilled continuously at ``per_minute * factor`` per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float, factor: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity * factor / 60)
+        self.updated = now
+
+    def wait_for(self, amount: float, factor: float) -> float:
+        """Seconds until amount is available (amount is capped at the capacity)"""
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing / (self.capacity * factor / 60)
+
+
+class GeminiRateLimiter:
+    """
+    Shared limiter in front of every Gemini call (vision, fast mode, agents)
+
+    Two token buckets cap requests and tokens per minute. A 429 pauses all
+    callers for a jittered, exponentially growing backoff and halves the
+    refill rate, which then recovers additively with each success (AIMD), so
+    concurrent runs do not retry in lockstep. Consecutive 5xx / timeout
+    failures open the circuit breaker: calls fail fast with CircuitOpenError
+    for ``open_seconds``, then a single trial call decides whether it closes.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 150,
+        tpm: float = 1_000_000,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+
+        self._requests = _Bucket(rpm)
+        self._tokens = _Bucket(tpm)
+        self._rate_factor = 1.0
+        self._penalty = 0.0
+        self._backoff_until = 0.0
+        self._failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+    def _check_circuit(self, now: float):
+        if self._state == OPEN:
+            remaining = self._opened_at + self.open_seconds - now
+            if remaining > 0:
+                metrics.incr("gemini_limiter.rejected_open")
+                raise CircuitOpenError(remaining)
+            self._set_state(HALF_OPEN)
+        if self._state == HALF_OPEN and self._trial_in_flight:
+            metrics.incr("gemini_limiter.rejected_open")
+            raise CircuitOpenError(self.open_seconds)
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            logger.info("Gemini circuit breaker state changed", old=self._state, new=state)
+            self._state = state
+            metrics.set_gauge("gemini_limiter.circuit_open", 1 if state == OPEN else 0)
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Block until a request with estimated_tokens may be sent
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        started = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._check_circuit(now)
+                    self._requests.refill(now, self._rate_factor)
+                    self._tokens.refill(now, self._rate_factor)
+                    wait = max(
+                        self._backoff_until - now,
+                        self._requests.wait_for(1, self._rate_factor),
+                        self._tokens.wait_for(estimated_tokens, self._rate_factor),
+                    )
+                    if wait <= 0:
+                        self._requests.level -= 1
+                        self._tokens.level -= min(estimated_tokens, self._tokens.capacity)
+                        if self._state == HALF_OPEN:
+                            self._trial_in_flight = True
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._waiting -= 1
+
+        waited = time.monotonic() - started
+        metrics.observe("gemini_limiter.wait_seconds", waited)
+        return waited
+
+    def record_success(self, estimated_tokens: int = 0, actual_tokens: Optional[int] = None):
+        """Close the circuit, recover the rate and settle the token estimate"""
+        with self._cond:
+            if actual_tokens is not None:
+                self._tokens.level -= actual_tokens - min(estimated_tokens, self._tokens.capacity)
+            self._failures = 0
+            self._penalty = 0.0
+            self._rate_factor = min(1.0, self._rate_factor + 0.05)
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+            self._cond.notify_all()
+        metrics.incr("gemini_limiter.calls")
+
+    def record_failure(self, kind: Optional[str], attempt: int = 0) -> float:
+        """
+        Register a failed call
+
+        Returns:
+            Seconds the caller should wait before retrying
+        """
+        with self._cond:
+            self._trial_in_flight = False
+            now = time.monotonic()
+            delay = 0.0
+
+            if kind == RATE_LIMITED:
+                # Everyone pauses, and the refill rate is halved until calls succeed again
+                self._penalty = min(self.backoff_max, max(self.backoff_base, self._penalty * 2))
+                self._backoff_until = max(self._backoff_until, now + self._penalty * random.uniform(0.5, 1.5))
+                self._rate_factor = max(0.1, self._rate_factor / 2)
+                metrics.incr("gemini_limiter.rate_limited")
+            elif kind == UNAVAILABLE:
+                self._failures += 1
+                if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                    self._opened_at = now
+                    self._set_state(OPEN)
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.5)
+                metrics.incr("gemini_limiter.unavailable")
+            elif self._state == HALF_OPEN:
+                # A client-side error still proves the API answers
+                self._set_state(CLOSED)
+
+            self._cond.notify_all()
+            return delay
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        estimated_tokens: int = 0,
+        usage: Optional[Callable[[Any], int]] = None,
+        source: str = "gemini",
+    ) -> Any:
+        """
+        Run fn() under the limiter, retrying 429 / 5xx / timeouts
+
+        Args:
+            fn: The Gemini call
+            estimated_tokens: Tokens reserved before the call
+            usage: Returns the actual token count from fn's result
+            source: Caller name for logs
+
+        Raises:
+            CircuitOpenError: If the circuit is (or opens while retrying) open
+            Exception: fn's error if it is not retryable or retries are used up
+        """
+        for attempt in range(self.max_retries + 1):
+            waited = self.acquire(estimated_tokens)
+            if waited > 1:
+                emit("log", f"⏳ Gemini rate limit: {source} waited {waited:.1f}s")
+            try:
+                result = fn()
+            except Exception as e:
+                kind = classify_error(e)
+                delay = self.record_failure(kind, attempt)
+                if kind is None or attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    "Gemini call failed, retrying", source=source, kind=kind, attempt=attempt + 1, error=str(e)[:200]
+                )
+                emit("log", f"⚠️ Gemini {kind.replace('_', ' ')} ({source}), retry {attempt + 1}/{self.max_retries}")
+                time.sleep(delay)
+                continue
+
+            actual = None
+            if usage is not None:
+                try:
+                    actual = usage(result)
+                except Exception:
+                    pass
+            self.record_success(estimated_tokens, actual)
+            return result
+
+    def snapshot(self) -> dict:
+        """Current limiter state for /metrics"""
+        with self._cond:
+            now = time.monotonic()
+            self._requests.refill(now, self._rate_factor)
+            self._tokens.refill(now, self._rate_factor)
+            return {
+                "circuit": self._state,
+                "consecutive_failures": self._failures,
+                "rate_factor": round(self._rate_factor, 2),
+                "backoff_seconds": round(max(0.0, self._backoff_until - now), 2),
+                "requests_available": round(self._requests.level, 1),
+                "requests_per_minute": self._requests.capacity,
+                "tokens_available": round(self._tokens.level),
+                "tokens_per_minute": self._tokens.capacity,
+                "waiting": self._waiting,
+            }
+
+
+_limiter: Optional[GeminiRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> GeminiRateLimiter:
+    """Get or create the process-wide Gemini limiter"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = GeminiRateLimiter(
+                rpm=float(os.getenv("GEMINI_RPM", "150")),
+                tpm=float(os.getenv("GEMINI_TPM", "1000000")),
+                max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "4")),
+                backoff_base=float(os.getenv("GEMINI_BACKOFF_BASE", "1")),
+                backoff_max=float(os.getenv("GEMINI_BACKOFF_MAX", "60")),
+                failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+                open_seconds=float(os.getenv("GEMINI_BREAKER_OPEN_SECONDS", "30")),
+            )
+        return _limiter
@@ -0,0 +1,6 @@
+"""Token Estimates for Gemini Prompts"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Gemini prompts (about 4 characters per token)"""
+    return (len(text or "") + 3) // 4
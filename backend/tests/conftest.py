@@ -0,0 +1,6 @@
+"""Shared pytest setup: import backend modules the way the app does (src on sys.path)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
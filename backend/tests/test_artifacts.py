@@ -0,0 +1,53 @@
+"""Tests for the in-memory artifact store"""
+
+import time
+
+import pytest
+
+from utils.artifacts import ArtifactStore, ArtifactStoreFullError, is_artifact
+from utils.metrics import metrics
+
+
+def test_put_get_release():
+    store = ArtifactStore(max_bytes=100)
+    handle = store.put(b"image", mime_type="image/png", filename="ad.png")
+
+    assert is_artifact(handle)
+    artifact = store.get(handle)
+    assert (artifact.data, artifact.mime_type, artifact.filename) == (b"image", "image/png", "ad.png")
+    assert store.bytes == 5
+
+    store.release(handle)
+    assert store.bytes == 0
+    with pytest.raises(KeyError):
+        store.get(handle)
+    store.release(handle)  # releasing twice is a no-op
+
+
+def test_full_store_rejects_uploads():
+    store = ArtifactStore(max_bytes=10)
+    store.put(b"x" * 8)
+    with pytest.raises(ArtifactStoreFullError):
+        store.put(b"y" * 8)
+
+
+def test_orphaned_artifacts_expire_on_next_put():
+    store = ArtifactStore(max_bytes=10, max_age=0.05)
+    orphan = store.put(b"x" * 8)
+    time.sleep(0.1)
+
+    store.put(b"y" * 8)  # fits once the orphan is swept
+    with pytest.raises(KeyError):
+        store.get(orphan)
+    assert store.bytes == 8
+
+
+def test_sweep_updates_gauges_even_when_the_upload_is_rejected():
+    store = ArtifactStore(max_bytes=10, max_age=0.05)
+    store.put(b"x" * 8)
+    time.sleep(0.1)
+
+    with pytest.raises(ArtifactStoreFullError):
+        store.put(b"y" * 11)
+    gauges = metrics.snapshot()["gauges"]
+    assert (gauges["artifacts.bytes"], gauges["artifacts.count"]) == (0, 0)
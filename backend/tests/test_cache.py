@@ -0,0 +1,63 @@
+"""Tests for the LRU + TTL cache and its disk tier"""
+
+import os
+import time
+
+from utils.cache import TTLCache
+
+
+def test_lru_eviction_by_entry_count():
+    cache = TTLCache("test", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_eviction_by_bytes():
+    cache = TTLCache("test", max_entries=100, max_bytes=20)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 10
+    assert cache.stats()["bytes"] <= 20
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache("test", ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    TTLCache("test", disk_dir=str(tmp_path)).set("a", {"value": 1}, meta={"etag": "x"})
+
+    entry = TTLCache("test", disk_dir=str(tmp_path)).get_entry("a")
+
+    assert entry.value == {"value": 1}
+    assert entry.meta == {"etag": "x"}
+
+
+def test_disk_sweep_removes_expired_and_excess_files(tmp_path):
+    cache = TTLCache("test", ttl=3600, max_entries=10, disk_dir=str(tmp_path), max_disk_entries=3)
+    now = time.time()
+    for index in range(5):
+        cache.set(f"key{index}", index)
+        # Distinct storage times, the first one beyond the TTL
+        stored_at = now - 7200 if index == 0 else now - 100 + index
+        os.utime(cache._disk_path(f"key{index}"), (stored_at, stored_at))
+    expired = cache._disk_path("key0")
+
+    cache.sweep_disk()
+
+    remaining = sorted(os.listdir(tmp_path))
+    assert len(remaining) == 3
+    assert os.path.basename(expired) not in remaining
+    assert remaining == sorted(os.path.basename(cache._disk_path(f"key{i}")) for i in (2, 3, 4))
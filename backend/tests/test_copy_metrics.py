@@ -0,0 +1,86 @@
+"""Tests for the deterministic copy metrics"""
+
+import pytest
+
+from tools.copy_metrics import (
+    HEADLINE_MAX_CHARS,
+    INTRO_MAX_CHARS,
+    analyze_copy,
+    find_cta_phrases,
+    format_copy_metrics,
+    split_ad_copy,
+)
+
+
+@pytest.mark.parametrize("text, intro, headline", [
+    ("Intro line\n\nHeadline", "Intro line", "Headline"),
+    ("First intro paragraph\n\nSecond intro paragraph\n\nHeadline", "First intro paragraph\n\nSecond intro paragraph", "Headline"),
+    ("Intro only, no blank line\nstill intro", "Intro only, no blank line\nstill intro", None),
+    ("  \n\nIntro\n \nHeadline\n\n", "Intro", "Headline"),
+    ("", "", None),
+])
+def test_split_ad_copy(text, intro, headline):
+    assert split_ad_copy(text) == (intro, headline)
+
+
+@pytest.mark.parametrize("intro_chars, headline_chars, intro_ok, headline_ok", [
+    (INTRO_MAX_CHARS, HEADLINE_MAX_CHARS, True, True),
+    (INTRO_MAX_CHARS + 1, HEADLINE_MAX_CHARS, False, True),
+    (INTRO_MAX_CHARS, HEADLINE_MAX_CHARS + 1, True, False),
+])
+def test_ad_length_limits(intro_chars, headline_chars, intro_ok, headline_ok):
+    metrics = analyze_copy("i" * intro_chars + "\n\n" + "h" * headline_chars, ad=True)
+
+    assert metrics["intro_chars"] == intro_chars
+    assert metrics["headline_chars"] == headline_chars
+    assert metrics["intro_within_limit"] is intro_ok
+    assert metrics["headline_within_limit"] is headline_ok
+
+
+def test_ad_without_headline_is_not_measured_twice():
+    metrics = analyze_copy("Only an intro paragraph.", ad=True)
+
+    assert metrics["headline"] is None
+    assert metrics["headline_within_limit"] is None
+    assert "Headline: not supplied" in format_copy_metrics(None, metrics)
+
+
+def test_page_copy_uses_first_line_as_headline():
+    metrics = analyze_copy("Page title\nFirst paragraph text.\n\nMore text.")
+
+    assert metrics["headline"] == "Page title"
+    assert metrics["intro_chars"] == len("Page title\nFirst paragraph text.")
+
+
+@pytest.mark.parametrize("text, stage, phrase, found", [
+    ("Book a demo today", "BOFU", "book a demo", True),
+    ("Jetzt Demo anfordern!", "BOFU", "demo anfordern", True),
+    ("Learn more about it", "TOFU", "learn more", True),
+    ("A sharp border around the image", "MOFU", "download", False),
+    ("Rewatching the keynote", "TOFU", "watch", False),
+    ("Watch the keynote", "TOFU", "watch", True),
+    ("Our webinars", "MOFU", "webinar", False),
+])
+def test_cta_phrases_match_whole_words(text, stage, phrase, found):
+    assert (phrase in find_cta_phrases(text)[stage]) is found
+
+
+@pytest.mark.parametrize("text, language, sentences, avg_words, questions", [
+    ("Stop losing leads. Our tool fixes it.", "unknown", 2, 3.5, 0),
+    ("Is your pipeline empty? We fix this for you.", "en", 2, 4.5, 1),
+    ("Sie verlieren Leads. Wir lösen das für Sie!", "de", 2, 4.0, 0),
+])
+def test_readability(text, language, sentences, avg_words, questions):
+    metrics = analyze_copy(text)
+
+    assert metrics["language"] == language
+    assert metrics["sentences"] == sentences
+    assert metrics["avg_sentence_words"] == avg_words
+    assert metrics["questions"] == questions
+
+
+def test_landing_page_metrics_carry_no_ad_limits():
+    text = format_copy_metrics(analyze_copy("x" * 200))
+
+    assert "Landing page copy (not the ad)" in text
+    assert "over" not in text
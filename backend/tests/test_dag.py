@@ -0,0 +1,97 @@
+"""Tests for the dependency-graph executor (function stages, skips, ordering)"""
+
+import threading
+import time
+
+import pytest
+
+from crew.dag import FunctionOutput, SkippedOutput, TaskGraph
+
+
+def stage(raw, log=None, delay=0.0):
+    def run():
+        if log is not None:
+            log.append(f"start {raw}")
+        time.sleep(delay)
+        if log is not None:
+            log.append(f"end {raw}")
+        return FunctionOutput(raw=raw)
+
+    return run
+
+
+def test_dependencies_run_first():
+    log = []
+    graph = TaskGraph(
+        {},
+        functions={"fetch": stage("fetch", log), "condense": stage("condense", log)},
+        depends_on={"condense": ["fetch"]},
+    )
+    outputs = graph.run()
+
+    assert log == ["start fetch", "end fetch", "start condense", "end condense"]
+    assert [output.raw for output in outputs.values()] == ["fetch", "condense"]
+
+
+def test_independent_stages_overlap():
+    both_running = threading.Barrier(2, timeout=2)
+
+    def waits_for_other(raw):
+        def run():
+            both_running.wait()  # raises BrokenBarrierError if the stages ran one after the other
+            return FunctionOutput(raw=raw)
+
+        return run
+
+    graph = TaskGraph({}, functions={"vision": waits_for_other("vision"), "scrape": waits_for_other("scrape")})
+    assert set(graph.run()) == {"vision", "scrape"}
+
+
+def test_skipped_stage_unblocks_dependents_without_running():
+    ran = []
+    graph = TaskGraph(
+        {},
+        functions={
+            "brand": lambda: ran.append("brand"),
+            "report": stage("report"),
+        },
+        depends_on={"report": ["brand"]},
+        skip_conditions={"brand": lambda outputs: SkippedOutput(raw="n/a", reason="no guidelines")},
+    )
+    outputs = graph.run()
+
+    assert ran == []
+    assert graph.skipped == {"brand": "no guidelines"}
+    assert outputs["report"].raw == "report"
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="Cycle"):
+        TaskGraph({}, functions={"a": stage("a"), "b": stage("b")}, depends_on={"a": ["b"], "b": ["a"]})
+    with pytest.raises(ValueError, match="outside the graph"):
+        TaskGraph({}, functions={"a": stage("a")}, depends_on={"a": ["missing"]})
+
+
+def test_stage_failure_propagates():
+    def fails():
+        raise RuntimeError("scrape failed")
+
+    with pytest.raises(RuntimeError, match="scrape failed"):
+        TaskGraph({}, functions={"scrape": fails}).run()
+
+
+def test_critical_path_follows_the_slowest_chain():
+    graph = TaskGraph(
+        {},
+        functions={
+            "fast": stage("fast"),
+            "slow": stage("slow", delay=0.1),
+            "final": stage("final"),
+        },
+        depends_on={"final": ["fast", "slow"]},
+    )
+    graph.run()
+    path, seconds = graph.critical_path()
+
+    assert path == ["slow", "final"]
+    assert seconds >= 0.1
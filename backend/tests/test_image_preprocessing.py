@@ -0,0 +1,100 @@
+"""Tests for the image normalization before Gemini vision calls"""
+
+from io import BytesIO
+
+from PIL import Image, ImageCms
+
+from tools.image_preprocessing import preprocess_image, sniff_mime_type
+
+
+def encode(image, fmt, **options):
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def with_gps_exif(size=(64, 32), orientation=1):
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x8825] = {2: (52.0, 31.0, 0.0)}  # GPSInfo: latitude
+    return encode(Image.new("RGB", size, "red"), "JPEG", exif=exif)
+
+
+def decode(result):
+    return Image.open(BytesIO(result.data))
+
+
+def test_exif_is_stripped():
+    result = preprocess_image(with_gps_exif())
+    image = decode(result)
+
+    assert result.mime_type == "image/webp"
+    assert not image.getexif()
+    assert "exif" not in image.info
+
+
+def test_exif_orientation_is_applied():
+    result = preprocess_image(with_gps_exif(size=(64, 32), orientation=6))  # rotate 90°
+
+    assert (result.original_width, result.original_height) == (64, 32)
+    assert (result.width, result.height) == (32, 64)
+    assert decode(result).size == (32, 64)
+
+
+def test_transparency_is_kept():
+    data = encode(Image.new("RGBA", (40, 40), (0, 128, 255, 0)), "PNG")
+    result = preprocess_image(data)
+    image = decode(result)
+
+    assert image.mode == "RGBA"
+    assert image.getpixel((0, 0))[3] == 0
+
+
+def test_jpeg_output_flattens_alpha(monkeypatch):
+    monkeypatch.setenv("VISION_IMAGE_FORMAT", "JPEG")
+    monkeypatch.setenv("VISION_MAX_EDGE", "20")
+    data = encode(Image.new("RGBA", (40, 40), (0, 128, 255, 0)), "PNG")
+    result = preprocess_image(data)
+
+    assert result.mime_type == "image/jpeg"
+    assert decode(result).mode == "RGB"
+
+
+def test_large_image_is_downsized(monkeypatch):
+    monkeypatch.setenv("VISION_MAX_EDGE", "100")
+    result = preprocess_image(encode(Image.new("RGB", (400, 200), "blue"), "PNG"))
+
+    assert (result.width, result.height) == (100, 50)
+    assert decode(result).size == (100, 50)
+    assert result.original_bytes > 0
+
+
+def test_small_clean_image_is_passed_through():
+    data = encode(Image.new("RGB", (8, 8), "green"), "WEBP", quality=85)
+    result = preprocess_image(data)
+
+    assert result.data == data
+    assert result.mime_type == "image/webp"
+
+
+def test_undecodable_input_is_passed_through():
+    data = b"\x89PNG\r\n\x1a\n" + b"not really a png"
+    result = preprocess_image(data, declared_mime_type="image/jpeg")
+
+    assert result.data == data
+    assert result.mime_type == "image/png"
+    assert result.width is None
+
+
+def test_icc_profile_survives_reencoding(monkeypatch):
+    monkeypatch.setenv("VISION_MAX_EDGE", "32")
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    data = encode(Image.new("RGB", (64, 32), "red"), "JPEG", icc_profile=profile)
+    result = preprocess_image(data)
+
+    assert decode(result).info.get("icc_profile") == profile
+
+
+def test_sniff_ignores_declared_type():
+    assert sniff_mime_type(b"GIF89a....") == "image/gif"
+    assert sniff_mime_type(b"plain text") is None
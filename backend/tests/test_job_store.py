@@ -0,0 +1,63 @@
+"""Tests for the SQLite job store"""
+
+from api.job_store import FAILED, QUEUED, RUNNING, SUCCEEDED, JobStore
+
+
+def test_job_lifecycle(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({"mode": "fast"})
+
+    job = store.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["params"] == {"mode": "fast"}
+
+    store.set_status(job_id, RUNNING)
+    store.set_status(job_id, SUCCEEDED, result='{"overall_score": 80}')
+    job = store.get(job_id)
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == '{"overall_score": 80}'
+    assert job["error"] is None
+
+
+def test_unknown_job_is_none(tmp_path):
+    assert JobStore(str(tmp_path / "jobs.db")).get("missing") is None
+
+
+def test_events_are_numbered_per_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    first, second = store.create({}), store.create({})
+    store.add_event(first, "log", "a")
+    store.add_event(second, "log", "other job")
+    store.add_event(first, "stage", {"name": "scrape_lp"})
+
+    events = store.events(first)
+    assert [(e["seq"], e["type"], e["data"]) for e in events] == [
+        (1, "log", "a"),
+        (2, "stage", {"name": "scrape_lp"}),
+    ]
+    assert [e["seq"] for e in store.events(first, after=1)] == [2]
+
+
+def test_unfinished_jobs_fail_on_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    queued, running, done = store.create({}), store.create({}), store.create({})
+    store.set_status(running, RUNNING)
+    store.set_status(done, SUCCEEDED, result="{}")
+    store.close()
+
+    restarted = JobStore(path)
+    assert restarted.fail_unfinished("server restarted") == 2
+    assert restarted.get(queued)["status"] == FAILED
+    assert restarted.get(running)["error"] == "server restarted"
+    assert restarted.get(done)["status"] == SUCCEEDED
+
+
+def test_delete_removes_job_and_events(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create({})
+    store.add_event(job_id, "log", "queued")
+    store.delete(job_id)
+
+    assert store.get(job_id) is None
+    assert store.events(job_id) == []
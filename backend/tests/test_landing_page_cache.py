@@ -0,0 +1,92 @@
+"""Tests for the URL-keyed landing page cache and its revalidation"""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from tools.landing_page_cache import LandingPageCache, normalize_url
+
+
+@pytest.mark.parametrize("url, normalized", [
+    ("https://example.com/lp?utm_source=li&utm_campaign=q3", "https://example.com/lp"),
+    ("https://example.com/lp?fbclid=abc&gclid=1&li_fat_id=2", "https://example.com/lp"),
+    ("https://example.com/lp?UTM_Medium=paid&plan=pro", "https://example.com/lp?plan=pro"),
+    ("HTTPS://Example.COM/LP", "https://example.com/LP"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/lp/", "https://example.com/lp/"),
+    ("https://example.com/lp#pricing", "https://example.com/lp"),
+    ("  https://example.com/lp?b=2&a=1  ", "https://example.com/lp?a=1&b=2"),
+    ("https://example.com/lp?ref=", "https://example.com/lp?ref="),
+])
+def test_normalize_url(url, normalized):
+    assert normalize_url(url) == normalized
+
+
+def page(text="Landing page copy"):
+    return {"success": True, "url": "https://example.com/lp", "text": text, "etag": '"v1"'}
+
+
+class Fetcher:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        return self.result
+
+
+def test_tracking_variants_share_an_entry():
+    cache = LandingPageCache()
+    fetch = Fetcher(page())
+
+    assert cache.fetch("https://example.com/lp?utm_source=a", fetch)["cache"] == "miss"
+    hit = cache.fetch("https://EXAMPLE.com/lp?utm_source=b#top", fetch)
+    assert hit["cache"] == "hit"
+    assert hit["url"] == "https://EXAMPLE.com/lp?utm_source=b#top"
+    assert len(fetch.calls) == 1
+
+
+def stale(cache, url):
+    """Backdate the entry for url past the fresh TTL"""
+    cache.cache.get_entry(normalize_url(url)).stored_at -= cache.fresh_ttl + 1
+
+
+def test_not_modified_refreshes_without_refetching(monkeypatch):
+    cache = LandingPageCache(fresh_ttl=60)
+    cache.fetch("https://example.com/lp", Fetcher(page()))
+    stale(cache, "https://example.com/lp")
+    revalidated_with = []
+    monkeypatch.setattr(cache, "_revalidate", lambda url, validators: revalidated_with.append(validators) or True)
+
+    refetch = Fetcher(page("changed"))
+    result = cache.fetch("https://example.com/lp", refetch)
+
+    assert result["cache"] == "revalidated"
+    assert result["text"] == "Landing page copy"
+    assert refetch.calls == []
+    assert revalidated_with == [{"etag": '"v1"', "last_modified": None}]
+    # The confirmed copy is fresh again: no second revalidation
+    assert cache.fetch("https://example.com/lp", refetch)["cache"] == "hit"
+    assert len(revalidated_with) == 1
+
+
+def test_changed_page_is_fetched_again(monkeypatch):
+    cache = LandingPageCache(fresh_ttl=60)
+    cache.fetch("https://example.com/lp", Fetcher(page()))
+    stale(cache, "https://example.com/lp")
+    monkeypatch.setattr(cache, "_revalidate", lambda url, validators: False)
+
+    result = cache.fetch("https://example.com/lp", Fetcher(page("changed")))
+
+    assert result["cache"] == "miss"
+    assert result["text"] == "changed"
+
+
+def test_failed_fetch_is_not_cached():
+    cache = LandingPageCache()
+    cache.fetch("https://example.com/lp", Fetcher({"success": False, "error": "timeout"}))
+    fetch = Fetcher(page())
+
+    assert cache.fetch("https://example.com/lp", fetch)["cache"] == "miss"
+    assert len(fetch.calls) == 1
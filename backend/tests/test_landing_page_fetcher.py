@@ -0,0 +1,76 @@
+"""Tests for the tiered landing page fetch (HTTP first, browser when needed)"""
+
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("httpx")
+pytest.importorskip("trafilatura")
+
+from tools import landing_page_fetcher as fetcher
+
+
+LONG_TEXT = "Landing page copy. " * 40
+STATIC = {"success": True, "url": "https://example.com", "text": "short", "text_length": 5}
+RENDERED = {"success": True, "url": "https://example.com", "text": LONG_TEXT, "text_length": len(LONG_TEXT)}
+
+
+@pytest.mark.parametrize("html, text, reason", [
+    ("<p>copy</p>", LONG_TEXT, None),
+    ("<p></p>", None, "no extractable text"),
+    ('<div id="root"></div>', LONG_TEXT, "JavaScript app shell"),
+    ("<noscript>Please enable JavaScript</noscript>", "short", "page requires JavaScript"),
+    ("<p>short</p>", "short", "only 5 chars of text"),
+])
+def test_js_shell_reason(html, text, reason):
+    assert fetcher._js_shell_reason(html, text) == reason
+
+
+def tiers(monkeypatch, http, browser):
+    """Replace both tiers; returns the list of browser timeouts requested"""
+    browser_calls = []
+    monkeypatch.setattr(fetcher, "_fetch_http", lambda url: http)
+
+    def fetch_browser(url, timeout):
+        browser_calls.append(timeout)
+        return browser
+
+    monkeypatch.setattr(fetcher, "_fetch_browser", fetch_browser)
+    return browser_calls
+
+
+def test_sufficient_static_page_never_starts_a_browser(monkeypatch):
+    browser_calls = tiers(monkeypatch, ({**RENDERED}, None), RENDERED)
+    result = fetcher._fetch_tiered("https://example.com")
+
+    assert result["tier"] == "http"
+    assert browser_calls == []
+
+
+def test_short_page_escalates_to_browser(monkeypatch):
+    browser_calls = tiers(monkeypatch, (STATIC, "only 5 chars of text"), RENDERED)
+    result = fetcher._fetch_tiered("https://example.com")
+
+    assert result["tier"] == "browser"
+    assert result["escalation"] == "only 5 chars of text"
+    assert result["text"] == LONG_TEXT
+    assert 0 < browser_calls[0] <= fetcher.FETCH_DEADLINE
+
+
+def test_failed_render_falls_back_to_static_text(monkeypatch):
+    tiers(monkeypatch, (STATIC, "only 5 chars of text"), {"success": False, "error": "timed out"})
+    result = fetcher._fetch_tiered("https://example.com")
+
+    assert result["tier"] == "http"
+    assert result["text"] == "short"
+
+
+def test_browser_timeout_returns_an_error_result(monkeypatch):
+    class SaturatedPool:
+        def run(self, fn, timeout=None):
+            raise TimeoutError
+
+    monkeypatch.setattr(fetcher, "get_browser_pool", lambda: SaturatedPool())
+    result = fetcher._fetch_browser("https://example.com", timeout=3)
+
+    assert not result["success"]
+    assert "timed out after 3s" in result["error"]
@@ -0,0 +1,89 @@
+"""Tests for the SQLite completion cache and its record / replay modes"""
+
+import pytest
+
+from utils.artifacts import get_artifact_store
+from utils.llm_cache import (
+    READWRITE,
+    RECORD,
+    REPLAY,
+    LLMCache,
+    LLMCacheMissError,
+    completion_key,
+)
+
+
+def counting(answer):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return answer
+
+    return fn, calls
+
+
+def test_readwrite_serves_exact_repeats(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.db"), mode=READWRITE)
+    fn, calls = counting("answer")
+
+    assert cache.call("k", "model", fn) == "answer"
+    assert cache.call("k", "model", fn) == "answer"
+    assert len(calls) == 1
+
+
+def test_record_always_calls_and_replay_serves_from_disk(tmp_path):
+    path = str(tmp_path / "llm.db")
+    recorder = LLMCache(path, mode=RECORD)
+    fn, calls = counting("recorded")
+    recorder.call("k", "model", fn)
+    recorder.call("k", "model", fn)
+    assert len(calls) == 2
+
+    replay = LLMCache(path, mode=REPLAY)
+    assert replay.call("k", "model", lambda: pytest.fail("replay must not call the API")) == "recorded"
+
+
+def test_replay_miss_raises(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.db"), mode=REPLAY)
+    with pytest.raises(LLMCacheMissError):
+        cache.call("unknown", "model", lambda: "answer")
+
+
+def test_non_text_results_are_not_stored(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.db"), mode=READWRITE)
+    cache.call("none", "model", lambda: None)
+    cache.call("object", "model", lambda: {"tool": "call"})
+
+    assert cache.get("none") is None
+    assert cache.get("object") is None
+
+
+def test_least_recently_used_evicted_beyond_max_bytes(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.db"), mode=READWRITE, max_bytes=20)
+    cache.set("a", "model", "x" * 10)
+    cache.set("b", "model", "y" * 10)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", "model", "z" * 10)
+
+    assert cache.get("a") == "x" * 10
+    assert cache.get("b") is None
+    assert cache.get("c") == "z" * 10
+
+
+def messages(handle):
+    return [{"role": "user", "content": f"Analyze {handle}"}]
+
+
+def test_key_covers_sampling_params_and_uses_artifact_content():
+    store = get_artifact_store()
+    first = store.put(b"same image")
+    second = store.put(b"same image")
+    try:
+        assert completion_key("m", messages(first), {}) == completion_key("m", messages(second), {})
+        assert completion_key("m", messages(first), {"temperature": 0.1}) != completion_key(
+            "m", messages(first), {"temperature": 0.7}
+        )
+    finally:
+        store.release(first)
+        store.release(second)
@@ -0,0 +1,88 @@
+"""Tests for the token-budgeted landing page condenser"""
+
+import pytest
+
+from tools.page_condenser import CondensedPage, condense_html
+from utils.tokens import estimate_tokens
+
+
+HTML = """
+<html>
+<head>
+  <title>Acme Analytics</title>
+  <meta name="description" content="Dashboards for growing teams">
+  <script>var tracking = "never page copy";</script>
+</head>
+<body>
+  <nav><a href="/pricing">Pricing</a><a class="btn" href="/signup">Start free trial</a></nav>
+  <h1>See every metric in one place</h1>
+  <p>Acme connects your data sources and builds the dashboards for you.</p>
+  <button>Book a demo</button>
+  <h2>Why teams switch</h2>
+  <p>Setup takes five minutes. No engineers are needed for the first dashboard.</p>
+  <footer><p>Copyright Acme Inc, all rights reserved worldwide.</p></footer>
+</body>
+</html>
+"""
+
+SECTIONS = ["URL:", "TITLE:", "META DESCRIPTION:", "HEADINGS:", "CTAs:", "ABOVE THE FOLD:", "SUMMARY:"]
+
+
+def long_page():
+    return CondensedPage(
+        url="https://example.com",
+        title="Example",
+        meta_description="Example description",
+        headings=[(1, "Main headline")] + [(2, f"Section heading number {i}") for i in range(40)],
+        ctas=[{"text": "Book a demo", "href": "/demo"}],
+        above_fold="Above the fold copy. " * 100,
+        summary=[f"Summary sentence number {i}." for i in range(100)],
+    )
+
+
+def test_condense_html_extracts_structure():
+    page = condense_html(HTML, "https://acme.test")
+
+    assert page.title == "Acme Analytics"
+    assert page.meta_description == "Dashboards for growing teams"
+    assert page.headings == [(1, "See every metric in one place"), (2, "Why teams switch")]
+    assert [cta["text"] for cta in page.ctas] == ["Start free trial", "Book a demo"]
+    assert page.above_fold.startswith("Acme connects your data sources")
+    assert page.summary == ["Setup takes five minutes."]
+    assert "never page copy" not in page.to_text(1000)
+    assert "Copyright" not in page.to_text(1000)
+
+
+def test_unparseable_html_keeps_only_the_url():
+    page = condense_html("", "https://acme.test")
+
+    assert page == CondensedPage(url="https://acme.test")
+
+
+def test_sections_keep_their_order():
+    text = condense_html(HTML, "https://acme.test").to_text(1000)
+    positions = [text.index(section) for section in SECTIONS]
+
+    assert positions == sorted(positions)
+
+
+@pytest.mark.parametrize("budget", [150, 400, 1500])
+def test_text_stays_within_token_budget(budget):
+    text = long_page().to_text(budget)
+
+    assert estimate_tokens(text) <= budget
+
+
+def test_headings_take_at_most_half_the_budget():
+    text = long_page().to_text(200)
+    headings = text.split("HEADINGS:\n")[1].split("\nCTAs:")[0]
+
+    assert estimate_tokens(headings) <= 100
+    assert "H1: Main headline" in headings
+
+
+def test_larger_budget_adds_summary():
+    page = long_page()
+
+    assert "SUMMARY:" not in page.to_text(150)
+    assert "SUMMARY:" in page.to_text(1500)
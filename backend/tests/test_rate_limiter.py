@@ -0,0 +1,116 @@
+"""Tests for the process-wide Gemini rate limiter"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    RATE_LIMITED,
+    UNAVAILABLE,
+    CircuitOpenError,
+    GeminiRateLimiter,
+    classify_error,
+)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Retries wait via time.sleep; tests only check how often they happen"""
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=time.monotonic, sleep=lambda s: None))
+
+
+def test_classify_error():
+    assert classify_error(FakeAPIError("boom", status_code=429)) == RATE_LIMITED
+    assert classify_error(FakeAPIError("boom", status_code=503)) == UNAVAILABLE
+    assert classify_error(Exception("429 Resource exhausted")) == RATE_LIMITED
+    assert classify_error(Exception("Deadline Exceeded")) == UNAVAILABLE
+    assert classify_error(ValueError("invalid JSON")) is None
+
+
+def test_request_bucket_blocks_until_refilled():
+    limiter = GeminiRateLimiter(rpm=60)
+    limiter._requests.level = 0
+
+    waited = limiter.acquire()
+
+    # 60 requests per minute refill one request per second
+    assert 0.8 < waited < 2
+
+
+def test_token_reservation_is_settled_with_actual_usage():
+    limiter = GeminiRateLimiter(tpm=1000)
+    limiter.acquire(estimated_tokens=300)
+    limiter.record_success(estimated_tokens=300, actual_tokens=500)
+
+    assert limiter._tokens.level == pytest.approx(500, abs=5)
+
+
+def test_call_retries_rate_limits_and_halves_rate():
+    limiter = GeminiRateLimiter(max_retries=3, backoff_base=0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeAPIError("quota", status_code=429)
+        return "ok"
+
+    assert limiter.call(flaky) == "ok"
+    assert len(attempts) == 3
+    # Halved twice, then recovered additively by the success
+    assert limiter._rate_factor == pytest.approx(0.3)
+
+
+def test_call_raises_non_retryable_errors_immediately():
+    limiter = GeminiRateLimiter()
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(broken)
+    assert len(attempts) == 1
+
+
+def test_circuit_opens_fails_fast_and_closes_after_trial():
+    limiter = GeminiRateLimiter(max_retries=0, failure_threshold=2, open_seconds=0.2)
+
+    def unavailable():
+        raise FakeAPIError("overloaded", status_code=503)
+
+    for _ in range(2):
+        with pytest.raises(FakeAPIError):
+            limiter.call(unavailable)
+    assert limiter.snapshot()["circuit"] == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        limiter.call(lambda: "never called")
+
+    time.sleep(0.25)
+    assert limiter.call(lambda: "ok") == "ok"
+    assert limiter.snapshot()["circuit"] == CLOSED
+
+
+def test_failed_trial_reopens_circuit():
+    limiter = GeminiRateLimiter(max_retries=0, failure_threshold=1, open_seconds=0.1)
+    with pytest.raises(FakeAPIError):
+        limiter.call(lambda: (_ for _ in ()).throw(FakeAPIError("down", status_code=500)))
+
+    time.sleep(0.15)
+    limiter.acquire()
+    assert limiter._state == HALF_OPEN
+    limiter.record_failure(UNAVAILABLE)
+    assert limiter._state == OPEN
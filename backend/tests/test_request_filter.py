@@ -0,0 +1,123 @@
+"""Tests for the scrape request policy (resource types, trackers, site domains)"""
+
+import asyncio
+
+import pytest
+
+from tools.request_filter import RequestPolicy, install_request_filter, registrable_domain
+
+
+SITE = frozenset({"example.com"})
+
+
+@pytest.mark.parametrize("host, domain", [
+    ("info.hubspot.com", "hubspot.com"),
+    ("example.com", "example.com"),
+    ("shop.example.co.uk", "example.co.uk"),
+    ("WWW.Example.COM.", "example.com"),
+])
+def test_registrable_domain(host, domain):
+    assert registrable_domain(host) == domain
+
+
+@pytest.mark.parametrize("resource_type, url, reason", [
+    ("script", "https://www.googletagmanager.com/gtm.js", "tracker"),
+    ("xhr", "https://region1.google-analytics.com/g/collect", "tracker"),
+    ("script", "https://example.com/app.js", None),
+    ("script", "https://cdn.example.com/app.js", None),
+    ("stylesheet", "https://fonts.googleapis.com/css", None),
+    ("document", "https://example.com/", None),
+])
+def test_default_policy(resource_type, url, reason):
+    assert RequestPolicy().block_reason(resource_type, url, SITE) == reason
+
+
+@pytest.mark.parametrize("resource_type", ["image", "media", "font"])
+def test_blocked_types_apply_to_first_party(resource_type):
+    assert RequestPolicy().block_reason(resource_type, "https://cdn.example.com/file", SITE) == "type"
+
+
+def test_first_party_tracker_domain_is_kept():
+    site = frozenset({"hubspot.com"})
+
+    assert RequestPolicy().block_reason("script", "https://js.hubspot.com/forms.js", site) is None
+    assert RequestPolicy().block_reason("script", "https://js.hubspot.com/forms.js") == "tracker"
+
+
+def test_allowed_domains_win_over_every_rule():
+    policy = RequestPolicy(allowed_domains={"hotjar.com", "img.example.org"})
+
+    assert policy.block_reason("script", "https://static.hotjar.com/c/hotjar.js") is None
+    assert policy.block_reason("image", "https://img.example.org/hero.png") is None
+
+
+def test_extra_domains_and_tracker_switch():
+    policy = RequestPolicy(blocked_domains={"chat.example.net"}, block_trackers=False)
+
+    assert policy.block_reason("script", "https://chat.example.net/widget.js") == "domain"
+    assert policy.block_reason("script", "https://www.googletagmanager.com/gtm.js") is None
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("SCRAPE_BLOCK_TYPES", "Image, stylesheet")
+    monkeypatch.setenv("SCRAPE_BLOCK_TRACKERS", "false")
+    policy = RequestPolicy.from_env()
+
+    assert policy.blocked_types == {"image", "stylesheet"}
+    assert not policy.block_trackers
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type, frame=None, navigation=False):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = frame
+        self._navigation = navigation
+
+    def is_navigation_request(self):
+        return self._navigation
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self, error_code):
+        self.outcome = "aborted"
+
+
+class FakePage:
+    main_frame = object()
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_redirected_landing_page_domain_is_first_party():
+    async def scrape():
+        page = FakePage()
+        stats = await install_request_filter(page, RequestPolicy(), url="https://go.example.com/lp")
+        routes = [
+            FakeRoute(FakeRequest("https://pages.hubspot.com/lp", "document", page.main_frame, navigation=True)),
+            FakeRoute(FakeRequest("https://js.hubspot.com/forms.js", "script")),
+            FakeRoute(FakeRequest("https://www.google-analytics.com/analytics.js", "script")),
+            FakeRoute(FakeRequest("https://go.example.com/hero.png", "image")),
+        ]
+        for route in routes:
+            await page.handler(route)
+        return stats, [route.outcome for route in routes]
+
+    stats, outcomes = asyncio.run(scrape())
+
+    assert outcomes == ["continued", "continued", "aborted", "aborted"]
+    assert stats.to_dict() == {
+        "allowed": 2,
+        "blocked": 2,
+        "blocked_by_reason": {"tracker": 1, "type": 1},
+        "blocked_by_type": {"script": 1, "image": 1},
+        "bytes_saved_estimate": 120_000,
+    }
@@ -0,0 +1,76 @@
+"""Tests for the crew run pool's admission control and queue positions"""
+
+import threading
+
+import pytest
+
+from crew.run_pool import CrewRunPool, QueueFullError
+
+
+def blocking_run():
+    """Run that signals when it started and finishes once released"""
+    started, release = threading.Event(), threading.Event()
+
+    def run():
+        started.set()
+        assert release.wait(5)
+        return "done"
+
+    return run, started, release
+
+
+def recorder():
+    positions = []
+    return positions, positions.append
+
+
+def test_full_pool_rejects_with_retry_hint():
+    pool = CrewRunPool(max_workers=1, max_queue=1)
+    run, started, release = blocking_run()
+    pool.submit(run)
+    assert started.wait(5)
+    pool.submit(lambda: "queued")
+
+    with pytest.raises(QueueFullError) as rejected:
+        pool.submit(lambda: "rejected")
+
+    # One run ahead in the queue: two waves of the 60 s starting estimate
+    assert rejected.value.retry_after == 120
+    release.set()
+
+
+def test_waiting_tickets_get_their_positions():
+    pool = CrewRunPool(max_workers=1, max_queue=2)
+    run, started, release = blocking_run()
+    first = pool.submit(run)
+    assert started.wait(5)
+
+    second_positions, on_second = recorder()
+    third_positions, on_third = recorder()
+    second = pool.submit(lambda: "second", on_position=on_second)
+    third = pool.submit(lambda: "third", on_position=on_third)
+    assert second_positions == [1]
+    assert third_positions == [2]
+
+    release.set()
+    assert (first.result(5), second.result(5), third.result(5)) == ("done", "second", "third")
+    assert second_positions == [1, 0]
+    assert third_positions == [2, 1, 0]
+
+
+def test_free_worker_starts_without_queue_position():
+    pool = CrewRunPool(max_workers=2, max_queue=0)
+    positions, on_position = recorder()
+
+    assert pool.submit(lambda: "ran", on_position=on_position).result(5) == "ran"
+    assert positions == [0]
+
+
+def test_run_errors_reach_the_future():
+    pool = CrewRunPool(max_workers=1, max_queue=0)
+
+    def fails():
+        raise RuntimeError("crew failed")
+
+    with pytest.raises(RuntimeError, match="crew failed"):
+        pool.submit(fails).result(5)
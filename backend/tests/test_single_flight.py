@@ -0,0 +1,73 @@
+"""Tests for single-flight coalescing of identical analyses"""
+
+import pytest
+
+pytest.importorskip("requests")  # landing_page_cache, for URL normalization
+
+from api.single_flight import SingleFlight, analysis_key
+from utils.events import EventChannel
+
+
+def key(**overrides):
+    inputs = {
+        "image_bytes": b"image",
+        "landing_page_url": "https://example.com/landing",
+        "brand_guidelines": None,
+        "target_audience": None,
+        "campaign_goal": None,
+        "ad_text": None,
+        "mode": "full",
+        **overrides,
+    }
+    return analysis_key(**inputs)
+
+
+def test_key_ignores_tracking_parameters_but_not_inputs():
+    assert key() == key(landing_page_url="https://example.com/landing?utm_source=linkedin")
+    assert key() != key(image_bytes=b"other image")
+    assert key() != key(mode="fast")
+    assert key() != key(force_refresh=True)
+
+
+def test_identical_requests_share_one_run():
+    flights = SingleFlight()
+    run, leader = flights.join("k")
+    same, follower_leads = flights.join("k")
+
+    assert leader and not follower_leads
+    assert same is run
+
+    flights.done(run)
+    _, leads_again = flights.join("k")
+    assert leads_again
+
+
+def test_late_subscriber_gets_history_and_result():
+    run, _ = SingleFlight().join("k")
+    early, late = EventChannel(), EventChannel()
+    results = []
+
+    run.attach(early, on_done=lambda r: results.append(("early", r.result)))
+    run.source.emit("log", "first")
+    run.attach(late, on_done=lambda r: results.append(("late", r.result)))
+    run.source.emit("log", "second")
+    run.finish(result="report")
+
+    for channel in (early, late):
+        assert [e["data"] for e in channel.drain()] == ["first", "second"]
+        assert channel.closed
+    assert results == [("early", "report"), ("late", "report")]
+
+
+def test_attach_after_finish_delivers_immediately():
+    run, _ = SingleFlight().join("k")
+    run.mark_started()
+    run.finish(error="boom")
+
+    channel = EventChannel()
+    started, errors = [], []
+    run.attach(channel, on_start=lambda: started.append(True), on_done=lambda r: errors.append(r.error))
+
+    assert started == [True]
+    assert errors == ["boom"]
+    assert channel.closed
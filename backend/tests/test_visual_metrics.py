@@ -0,0 +1,101 @@
+"""Tests for the deterministic visual metrics on synthetic images"""
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from tools.visual_metrics import (
+    classify_format,
+    compute_visual_metrics,
+    compute_visual_metrics_for_source,
+    contrast_matrix,
+    format_visual_metrics,
+)
+
+
+def png(image):
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def two_color_split(size=(200, 200)):
+    """Left half black, right half white"""
+    array = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    array[:, size[0] // 2:] = 255
+    return png(Image.fromarray(array))
+
+
+def test_solid_fill_has_one_color_and_no_edges():
+    metrics = compute_visual_metrics(png(Image.new("RGB", (120, 120), (255, 0, 0))))
+
+    assert metrics["palette"] == [{"hex": "#FF0000", "share": 1.0}]
+    assert metrics["primary_contrast"] == 1.0
+    assert metrics["max_contrast"]["ratio"] == 1.0
+    assert not metrics["max_contrast"]["passes_aa_large"]
+    assert metrics["edge_density"] == 0.0
+    assert metrics["text_area_estimate"] == 0.0
+
+
+def test_two_color_split_has_maximum_contrast():
+    metrics = compute_visual_metrics(two_color_split())
+
+    assert sorted(c["hex"] for c in metrics["palette"]) == ["#000000", "#FFFFFF"]
+    assert [c["share"] for c in metrics["palette"]] == [0.5, 0.5]
+    assert metrics["primary_contrast"] == 21.0
+    assert metrics["max_contrast"]["passes_aa"]
+    assert sorted(metrics["max_contrast"]["colors"]) == ["#000000", "#FFFFFF"]
+
+
+def test_single_boundary_is_not_text():
+    metrics = compute_visual_metrics(two_color_split())
+
+    assert 0 < metrics["edge_density"] < 0.02
+    assert metrics["text_area_estimate"] < 0.05
+
+
+def test_stripes_look_like_text():
+    array = np.zeros((128, 128, 3), dtype=np.uint8)
+    array[:, ::2] = 255
+    metrics = compute_visual_metrics(png(Image.fromarray(array)))
+
+    assert metrics["text_area_estimate"] == 1.0
+
+
+def test_palette_is_deterministic():
+    data = png(Image.fromarray(np.random.default_rng(0).integers(0, 255, (64, 64, 3), dtype=np.uint8)))
+
+    assert compute_visual_metrics(data) == compute_visual_metrics(data)
+
+
+@pytest.mark.parametrize("width, height, label", [
+    (1080, 1080, "1:1 (square)"),
+    (1200, 628, "1.91:1 (landscape)"),
+    (1080, 1350, "4:5 (vertical)"),
+    (1000, 300, "3.33:1 (landscape)"),
+])
+def test_classify_format(width, height, label):
+    assert classify_format(width, height) == label
+
+
+def test_contrast_matrix_matches_wcag():
+    contrast = contrast_matrix(np.array([[0, 0, 0], [255, 255, 255], [118, 118, 118]]))
+
+    assert contrast[0, 1] == pytest.approx(21.0)
+    assert contrast[1, 2] == pytest.approx(4.54, abs=0.01)
+
+
+def test_undecodable_and_remote_sources_have_no_metrics():
+    assert compute_visual_metrics(b"not an image") is None
+    assert compute_visual_metrics_for_source("https://example.com/ad.png") is None
+
+
+def test_local_file_source(tmp_path):
+    path = tmp_path / "ad.png"
+    path.write_bytes(two_color_split((1200, 628)))
+    metrics = compute_visual_metrics_for_source(str(path))
+
+    assert metrics["format"] == "1.91:1 (landscape)"
+    assert "1200x628 px" in format_visual_metrics(metrics)
@@ -82,6 +82,9 @@ class ApiClient {
       formData.append("target_audience", request.target_audience);
     }
 
+    // The UI displays the report as markdown, rendered server-side
+    formData.append("report_format", "markdown");
+
     fetch(`${API_URL}/api/v1/analyze/stream`, {
       method: "POST",
       body: formData,  // Send FormData directly (no Content-Type header needed)
@@ -114,13 +117,16 @@ class ApiClient {
 
                 if (event.type === "log") {
                   onLog(event.data);
+                } else if (event.type === "logs") {
+                  // Batched frame: several log lines coalesced by the server
+                  event.data.forEach((log: string) => onLog(log));
                 } else if (event.type === "result") {
                   onResult(event.data);
                 } else if (event.type === "error") {
                   onError(event.data);
                 }
               } catch (e) {
-                // Ignore parse errors for heartbeat or malformed data
+                // Ignore malformed data (heartbeats are SSE comments and never reach here)
               }
             }
           }